@@ -0,0 +1,186 @@
+""" Headless benchmark of the stereo matching, reprojection and PLY export hot paths.
+
+    python benchmark.py -o benchmark.json
+    python benchmark.py --scales 0.5 1 2 --disparities 64 128 --repeat 5 --workers 4
+
+Runs on the bundled ambush_5 pair and on copies of it scaled by each --scales factor, for each disparity range
+(given at the original size and scaled with the images). Every case is run --repeat times; the results are written as
+JSON, one record per case with its parameters and wall times, so runs on different machines or commits can be compared.
+SAD searches both signs of the shift, twice the candidates of SGBM for the same range: compare them per candidate.
+The importMain case times the imports of the GUI (main.py) in a fresh interpreter, against its import budget. """
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from rekon import InputError, computeDepthMapSAD, computeDepthMapSGBM, loadQ, oDisparityCache, oImagePairCache, reprojectPointCloud, writePLY
+
+aCases = ["sgbm", "sad", "sadWholePixel", "reprojectImageTo3D", "reprojectPointCloud", "writePLY", "importMain"]
+
+
+def getScaledPair(sLeftPath, sRightPath, nScale, sFolder):
+    """ Write the image pair scaled by nScale to sFolder. Returns the paths and the BGR images. """
+    aPaths = []
+    aImgs = []
+    for sPath in (sLeftPath, sRightPath):
+        oImg = cv2.imread(sPath)
+        if oImg is None:
+            raise InputError(f"Image couldn't be read: {sPath}")
+        if nScale != 1:
+            oImg = cv2.resize(oImg, None, fx=nScale, fy=nScale, interpolation=cv2.INTER_AREA if nScale < 1 else cv2.INTER_CUBIC)
+        sScaledPath = os.path.join(sFolder, f"{nScale:g}_" + os.path.basename(sPath).rsplit(".", 1)[0] + ".png")
+        cv2.imwrite(sScaledPath, oImg)
+        aPaths.append(sScaledPath)
+        aImgs.append(oImg)
+    return aPaths + aImgs
+
+def timeCase(fnCase, nRepeat, fnSetup=None):
+    """ Wall times of nRepeat calls of fnCase(), fnSetup() being called untimed before each one. Returns [aSeconds, last result]. """
+    aSeconds = []
+    oResult = None
+    for nRun in range(nRepeat):
+        if fnSetup is not None:
+            fnSetup()
+        nStart = time.perf_counter()
+        oResult = fnCase()
+        aSeconds.append(time.perf_counter() - nStart)
+    return [aSeconds, oResult]
+
+def timeImport(nRepeat):
+    """ Seconds the imports of main.py take in a fresh interpreter each time, as measured by main.py itself.
+    Returns [aSeconds, nImportBudget]. """
+    aSeconds = []
+    nBudget = None
+    for nRun in range(nRepeat):
+        oResult = subprocess.run([sys.executable, "-c", "import main; print(main.nImportSeconds, main.nImportBudget)"],
+                                 cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+        if oResult.returncode != 0:
+            raise InputError("main.py couldn't be imported: " + oResult.stderr.strip().splitlines()[-1])
+        nSeconds, nBudget = map(float, oResult.stdout.split()[-2:])
+        aSeconds.append(nSeconds)
+    return [aSeconds, nBudget]
+
+def clearCaches():
+    """ Drop the decoded images and depth maps, so every run matches from the files as a first run would """
+    oImagePairCache.clear()
+    oDisparityCache.clear()
+
+def runBenchmark(sStereoParams, sLeftPath, sRightPath, aScales=(0.5, 1, 2), aDisparities=(64, 128), nRepeat=3, nWorkers=1, aSelectedCases=aCases):
+    """ Run the selected cases for every scale and disparity range. Returns the list of result records. """
+    Q = loadQ(sStereoParams)
+    aResults = []
+
+    def addResult(sCase, aSeconds, **dParams):
+        dResult = dict(case=sCase, **dParams, repeat=len(aSeconds), seconds=aSeconds, best=min(aSeconds), median=statistics.median(aSeconds))
+        aResults.append(dResult)
+        print(f"{sCase:>20} {dParams['width']}x{dParams['height']} disparities {dParams.get('numDisparities', '-'):>4} "
+              f"candidates {dParams.get('candidates', '-'):>4}: "
+              f"best {dResult['best'] * 1000:9.1f} ms, median {dResult['median'] * 1000:9.1f} ms")
+
+    if "importMain" in aSelectedCases:
+        aSeconds, nBudget = timeImport(nRepeat)
+        nMedian = statistics.median(aSeconds)
+        aResults.append(dict(case="importMain", repeat=nRepeat, seconds=aSeconds, best=min(aSeconds), median=nMedian,
+                             budget=nBudget, withinBudget=nMedian <= nBudget))
+        print(f"{'importMain':>20}: best {min(aSeconds) * 1000:9.1f} ms, median {nMedian * 1000:9.1f} ms, "
+              f"budget {nBudget * 1000:.0f} ms{'' if nMedian <= nBudget else ' EXCEEDED'}")
+
+    if not set(aSelectedCases) - {"importMain"}:
+        return aResults
+
+    with tempfile.TemporaryDirectory() as sFolder:
+        for nScale in aScales:
+            sScaledLeft, sScaledRight, oLeftImg, oRightImg = getScaledPair(sLeftPath, sRightPath, nScale, sFolder)
+            nHeight, nWidth = oLeftImg.shape[:2]
+            dSize = dict(scale=nScale, width=nWidth, height=nHeight)
+
+            for nDisparities in aDisparities:
+                # SGBM needs a multiple of 16 and searches nNumDisparities candidates. SAD covers the same disparities with
+                # the shifts -S .. S - 1 (S = nNumDisparities), twice as many candidates, recorded as "candidates"
+                nNumDisparities = max(16, int(np.ceil(nDisparities * nScale / 16)) * 16)
+
+                aDisparity = None
+                if "sgbm" in aSelectedCases:
+                    aSeconds, (aDisparity, _) = timeCase(lambda: computeDepthMapSGBM(sStereoParams, sScaledLeft, sScaledRight, nNumDisparities=nNumDisparities), nRepeat, clearCaches)
+                    addResult("sgbm", aSeconds, **dSize, numDisparities=nNumDisparities, candidates=nNumDisparities)
+                if "sad" in aSelectedCases:
+                    aSeconds, aSADDisparity = timeCase(lambda: computeDepthMapSAD(oLeftImg, oRightImg, 5, nNumDisparities, nWorkers), nRepeat)
+                    addResult("sad", aSeconds, **dSize, numDisparities=nNumDisparities, candidates=2 * nNumDisparities, blockSize=5, workers=nWorkers)
+                    if aDisparity is None:
+                        aDisparity = aSADDisparity
+                if "sadWholePixel" in aSelectedCases:
+                    # The same search without the sub-pixel refinement
+                    aSeconds, _ = timeCase(lambda: computeDepthMapSAD(oLeftImg, oRightImg, 5, nNumDisparities, nWorkers, bSubpixel=False), nRepeat)
+                    addResult("sadWholePixel", aSeconds, **dSize, numDisparities=nNumDisparities, candidates=2 * nNumDisparities, blockSize=5, workers=nWorkers)
+
+                if aDisparity is None:
+                    aDisparity, _ = computeDepthMapSGBM(sStereoParams, sScaledLeft, sScaledRight, nNumDisparities=nNumDisparities)
+                aColors = oLeftImg[..., ::-1]
+
+                if "reprojectImageTo3D" in aSelectedCases:
+                    # The dense path: 3D point of every pixel, then the valid ones selected with a mask
+                    def reprojectDense():
+                        aPoints = cv2.reprojectImageTo3D(aDisparity, Q)
+                        aMask = aDisparity > aDisparity.min()
+                        return [aPoints[aMask], aColors[aMask]]
+                    aSeconds, (aPoints, _) = timeCase(reprojectDense, nRepeat)
+                    addResult("reprojectImageTo3D", aSeconds, **dSize, numDisparities=nNumDisparities, points=len(aPoints))
+
+                aCloud = reprojectPointCloud(aDisparity, Q, aColors)
+                if "reprojectPointCloud" in aSelectedCases:
+                    aSeconds, aCloud = timeCase(lambda: reprojectPointCloud(aDisparity, Q, aColors), nRepeat)
+                    addResult("reprojectPointCloud", aSeconds, **dSize, numDisparities=nNumDisparities, points=len(aCloud))
+
+                if "writePLY" in aSelectedCases:
+                    sPLYPath = os.path.join(sFolder, "benchmark.ply")
+                    aSeconds, _ = timeCase(lambda: writePLY(sPLYPath, aCloud, bOpenViewer=False), nRepeat)
+                    addResult("writePLY", aSeconds, **dSize, numDisparities=nNumDisparities, points=len(aCloud), bytes=os.path.getsize(sPLYPath))
+
+    return aResults
+
+def getEnvironment():
+    """ Versions and hardware the results were measured with """
+    return dict(python=platform.python_version(), numpy=np.__version__, opencv=cv2.__version__, platform=platform.platform(),
+                processor=platform.processor() or platform.machine(), cpus=os.cpu_count(), openCVThreads=cv2.getNumThreads())
+
+def createParser():
+    oParser = argparse.ArgumentParser(description="Rekon - benchmark of the disparity, reprojection and PLY export hot paths.")
+    oParser.add_argument("--left", default="ambush_5_left.jpg", help="left image (default: %(default)s)")
+    oParser.add_argument("--right", default="ambush_5_right.jpg", help="right image (default: %(default)s)")
+    oParser.add_argument("--stereo-params", default="stereoCamParams.yml", help="stereo parameters file, for the Q matrix (default: %(default)s)")
+    oParser.add_argument("--scales", type=float, nargs="+", default=[0.5, 1, 2], help="image scales (default: %(default)s)")
+    oParser.add_argument("--disparities", type=int, nargs="+", default=[64, 128], help="disparity ranges at scale 1 (default: %(default)s)")
+    oParser.add_argument("--repeat", type=int, default=3, help="runs of every case (default: %(default)s)")
+    oParser.add_argument("--workers", type=int, default=1, help="SAD worker processes (default: %(default)s)")
+    oParser.add_argument("--cases", choices=aCases, nargs="+", default=aCases, help="cases to run (default: all)")
+    oParser.add_argument("-o", "--output", default="benchmark.json", help="JSON results file (default: %(default)s)")
+    return oParser
+
+def main(aArgv=None):
+    oArgs = createParser().parse_args(aArgv)
+
+    nStart = time.time()
+    try:
+        aResults = runBenchmark(oArgs.stereo_params, oArgs.left, oArgs.right, oArgs.scales, oArgs.disparities, oArgs.repeat, oArgs.workers, oArgs.cases)
+    except InputError as oError:
+        print("Error: ", oError, file=sys.stderr)
+        return 1
+    dReport = dict(started=time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(nStart)), seconds=time.time() - nStart,
+                   environment=getEnvironment(), results=aResults)
+
+    with open(oArgs.output, "w") as oFile:
+        json.dump(dReport, oFile, indent=2)
+    print("Results written to", oArgs.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
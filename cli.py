@@ -0,0 +1,224 @@
+""" Headless command line entry point: calibration and reconstruction without the Qt stack.
+
+    python cli.py calibrate-camera left/ -o leftCamParams.yml
+    python cli.py calibrate-stereo left/ right/ -o stereoCamParams.yml
+    python cli.py reconstruct left.jpg right.jpg --algorithm sad -o reconstructed.ply
+    python cli.py batch left/ right/ -o clouds/
+    python cli.py sequence left.avi right.avi --algorithm sad -o clouds/
+    python cli.py --config job.json reconstruct
+
+A config file is a JSON object whose keys are the option names with underscores (e.g. "square_size",
+"num_disparities", "left"), it sets the defaults of the command; command line arguments override it. """
+import argparse
+import json
+import os
+import sys
+
+from rekon import InputError, RunReport, aSADChannels, calibrateCamera, calibrateStereo, reconstructBatch, reconstructSAD, reconstructSequence, reconstructSGBM, reconstructTiled, saveCameraCoef, saveStereoCoef
+
+
+def runCameraCalibr(oArgs, fnProgress=None):
+    """ Single camera calibration of one image folder """
+    retValue = calibrateCamera(oArgs.folder, oArgs.square_size, oArgs.chessboard_w-1, oArgs.chessboard_h-1, fnProgress=fnProgress)
+    if (len(retValue) == 1):
+        raise InputError("Camera calibration failed. Make sure that the chessboard pattern is visible in at least 15 photos.")
+
+    bSuccess, nRMS, K, D, aRotation, aTranslation = retValue
+    saveCameraCoef(K, D, nRMS, oArgs.output)
+    print("RMS: ", nRMS)
+
+def runStereoCalibr(oArgs, fnProgress=None):
+    """ Stereo calibration of a pair of image folders """
+    aCoefs = calibrateStereo(oArgs.left_params, oArgs.right_params, oArgs.left, oArgs.right, oArgs.square_size, oArgs.chessboard_w-1, oArgs.chessboard_h-1, fnProgress)
+    saveStereoCoef(*aCoefs, oArgs.output)
+
+def getMatcherParams(oArgs):
+    """ Keyword arguments of the stereo matching function of the selected algorithm """
+    if (oArgs.algorithm == "sgbm"):
+        return dict(nWindowSize=oArgs.block_size, nMinDisparity=oArgs.min_disparity, nNumDisparities=oArgs.num_disparities,
+                    nDisp12MaxDiff=oArgs.disp12_max_diff, nUniquenessRatio=oArgs.uniqueness_ratio, nSpeckleWindowSize=oArgs.speckle_window_size,
+                    nSpeckleRange=oArgs.speckle_range, nPreFilterCap=oArgs.pre_filter_cap, nPyramidLevels=oArgs.pyramid_levels)
+    return dict(nBlockSize=oArgs.block_size, nSearchBlockSize=oArgs.search_block_size, nWorkers=oArgs.workers, sChannels=oArgs.channels,
+                nPyramidLevels=oArgs.pyramid_levels, bSubpixel=not oArgs.whole_pixel)
+
+def getCloudFilter(oArgs):
+    """ Keyword arguments of filterPointCloud, None if the point clouds are written unfiltered """
+    dCloudFilter = dict(nMinDepth=oArgs.min_depth, nMaxDepth=oArgs.max_depth, nOutlierStdRatio=oArgs.outlier_std_ratio,
+                        nOutlierRadius=oArgs.outlier_radius, nVoxelSize=oArgs.voxel_size, nMaxPoints=oArgs.max_points)
+    if all(dCloudFilter[sName] is None for sName in ("nMinDepth", "nMaxDepth", "nOutlierStdRatio", "nVoxelSize", "nMaxPoints")):
+        return None
+    return dCloudFilter
+
+def runReconstr(oArgs, fnProgress=None):
+    """ Depth map and point cloud of an image pair """
+    if (oArgs.memory_budget):
+        if (oArgs.rectify):
+            raise InputError("Tiled reconstruction needs rectified images, --rectify isn't supported with --memory-budget.")
+        if getCloudFilter(oArgs) is not None:
+            raise InputError("Tiled reconstruction writes the point cloud strip by strip, it can't be filtered with --memory-budget.")
+        reconstructTiled(oArgs.stereo_params, oArgs.left, oArgs.right, oArgs.q, oArgs.output, oArgs.algorithm, getMatcherParams(oArgs),
+                         int(oArgs.memory_budget * (1 << 20)), fnProgress)
+    elif (oArgs.algorithm == "sgbm"):
+        reconstructSGBM(oArgs.stereo_params, oArgs.left, oArgs.right, oArgs.q, oArgs.output,
+                        oArgs.block_size, oArgs.min_disparity, oArgs.num_disparities, oArgs.disp12_max_diff, oArgs.uniqueness_ratio,
+                        oArgs.speckle_window_size, oArgs.speckle_range, oArgs.pre_filter_cap, oArgs.pyramid_levels,
+                        bRectify=oArgs.rectify, bOpenViewer=oArgs.open_viewer, fnProgress=fnProgress, sViewer=oArgs.viewer,
+                        dCloudFilter=getCloudFilter(oArgs))
+    else:
+        reconstructSAD(oArgs.stereo_params, oArgs.left, oArgs.right, oArgs.q, oArgs.output,
+                       oArgs.block_size, oArgs.search_block_size, oArgs.workers, oArgs.channels, oArgs.pyramid_levels,
+                       not oArgs.whole_pixel, bRectify=oArgs.rectify, bOpenViewer=oArgs.open_viewer, fnProgress=fnProgress, sViewer=oArgs.viewer,
+                        dCloudFilter=getCloudFilter(oArgs))
+
+def runBatchReconstr(oArgs, fnProgress=None):
+    """ Point clouds of every image pair of a left and a right folder """
+    reconstructBatch(oArgs.stereo_params, oArgs.left, oArgs.right, oArgs.output, oArgs.algorithm, getMatcherParams(oArgs),
+                     oArgs.q, bRectify=oArgs.rectify, nQueueSize=oArgs.queue_size, fnProgress=fnProgress, dCloudFilter=getCloudFilter(oArgs))
+
+def runSequenceReconstr(oArgs, fnProgress=None):
+    """ Depth maps, and point clouds if an output folder is given, of every frame of a stereo video """
+    reconstructSequence(oArgs.stereo_params, oArgs.left, oArgs.right, oArgs.output, oArgs.algorithm, getMatcherParams(oArgs),
+                        oArgs.q, bRectify=oArgs.rectify, fnProgress=fnProgress, dCloudFilter=getCloudFilter(oArgs))
+
+def getReportPath(oArgs):
+    """ Run report path: --report, or next to the output (<output>.report.json, report.json in an output folder) """
+    if (oArgs.report):
+        return oArgs.report
+    if oArgs.command in ("batch", "sequence"):
+        return os.path.join(oArgs.output, "report.json") if oArgs.output else "sequence.report.json"
+    return os.path.splitext(oArgs.output)[0] + ".report.json"
+
+def createParser():
+    oParser = argparse.ArgumentParser(description="Rekon - stereo calibration and 3D reconstruction, headless.")
+    oParser.add_argument("--config", help="JSON file with default values for the command options")
+    oCommands = oParser.add_subparsers(dest="command", required=True)
+
+    def addReportArgs(oCommand):
+        oCommand.add_argument("--report", default=None, help="run report file, with the time and memory used by each stage (default: next to the output)")
+        oCommand.add_argument("--no-report", action="store_true", help="don't write the run report")
+
+    def addChessboardArgs(oCommand):
+        oCommand.add_argument("--square-size", type=float, default=0.025, help="size of one chessboard square (default: %(default)s)")
+        oCommand.add_argument("--chessboard-w", type=int, default=9, help="number of squares along the chessboard width (default: %(default)s)")
+        oCommand.add_argument("--chessboard-h", type=int, default=6, help="number of squares along the chessboard height (default: %(default)s)")
+        addReportArgs(oCommand)
+
+    oCommand = oCommands.add_parser("calibrate-camera", help="single camera calibration")
+    oCommand.add_argument("folder", nargs="?", help="folder with the chessboard images")
+    addChessboardArgs(oCommand)
+    oCommand.add_argument("-o", "--output", default="leftCamParams.yml", help="camera parameters file (default: %(default)s)")
+    oCommand.set_defaults(fnRun=runCameraCalibr, aRequired=["folder"])
+
+    oCommand = oCommands.add_parser("calibrate-stereo", help="stereo calibration")
+    oCommand.add_argument("left", nargs="?", help="folder with the left chessboard images")
+    oCommand.add_argument("right", nargs="?", help="folder with the right chessboard images")
+    addChessboardArgs(oCommand)
+    oCommand.add_argument("--left-params", default="leftCamParams.yml", help="left camera parameters file (default: %(default)s)")
+    oCommand.add_argument("--right-params", default="rightCamParams.yml", help="right camera parameters file (default: %(default)s)")
+    oCommand.add_argument("-o", "--output", default="stereoCamParams.yml", help="stereo parameters file (default: %(default)s)")
+    oCommand.set_defaults(fnRun=runStereoCalibr, aRequired=["left", "right"])
+
+    def addMatcherArgs(oCommand):
+        oCommand.add_argument("--algorithm", choices=["sgbm", "sad"], default="sgbm", help="stereo matching algorithm (default: %(default)s)")
+        oCommand.add_argument("--stereo-params", default="stereoCamParams.yml", help="stereo parameters file (default: %(default)s)")
+        oCommand.add_argument("--q", default="", help="custom Q matrix file")
+        oCommand.add_argument("--rectify", action="store_true", help="undistort and rectify the images before matching")
+        oCommand.add_argument("--block-size", type=int, default=None, help="block size (default: 3 for SGBM, 5 for SAD)")
+        oCommand.add_argument("--pyramid-levels", type=int, default=0, help="coarse-to-fine search from the images downscaled this many times by 2 (default: %(default)s, full search)")
+        # SGBM
+        oCommand.add_argument("--min-disparity", type=int, default=-1)
+        oCommand.add_argument("--num-disparities", type=int, default=80)
+        oCommand.add_argument("--disp12-max-diff", type=int, default=12)
+        oCommand.add_argument("--uniqueness-ratio", type=int, default=10)
+        oCommand.add_argument("--speckle-window-size", type=int, default=150)
+        oCommand.add_argument("--speckle-range", type=int, default=2)
+        oCommand.add_argument("--pre-filter-cap", type=int, default=63)
+        # SAD
+        oCommand.add_argument("--search-block-size", type=int, default=56)
+        oCommand.add_argument("--workers", type=int, default=1, help="SAD worker processes (default: %(default)s)")
+        oCommand.add_argument("--channels", choices=aSADChannels, default="gray", help="image channels SAD matches on (default: %(default)s)")
+        oCommand.add_argument("--whole-pixel", action="store_true", help="SAD disparities in whole pixels, without the sub-pixel refinement")
+        # Point cloud filtering
+        oCommand.add_argument("--min-depth", type=float, default=None, help="drop the points closer than this (|z|, in the calibration units)")
+        oCommand.add_argument("--max-depth", type=float, default=None, help="drop the points farther than this")
+        oCommand.add_argument("--outlier-std-ratio", type=float, default=None,
+                              help="drop the points with fewer neighbours than the mean minus this many standard deviations (2 is a good start)")
+        oCommand.add_argument("--outlier-radius", type=float, default=3, help="neighbourhood of the outlier removal, in pixels (default: %(default)s)")
+        oCommand.add_argument("--voxel-size", type=float, default=None, help="merge the points of each voxel of this size, averaging their colors")
+        oCommand.add_argument("--max-points", type=int, default=None, help="downsample the point clouds to at most this many points")
+        addReportArgs(oCommand)
+
+    oCommand = oCommands.add_parser("reconstruct", help="depth map and PLY point cloud of an image pair")
+    oCommand.add_argument("left", nargs="?", help="left image")
+    oCommand.add_argument("right", nargs="?", help="right image")
+    addMatcherArgs(oCommand)
+    oCommand.add_argument("-o", "--output", default="reconstructed.ply", help="PLY file (default: %(default)s)")
+    oCommand.add_argument("--open-viewer", action="store_true", help="open the PLY file in MeshLab once written")
+    oCommand.add_argument("--viewer", default=None, metavar="PATH",
+                          help="executable --open-viewer starts (default: $REKON_MESHLAB, else MeshLab)")
+    oCommand.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                          help="match the images in strips using about this much memory, for images too big to process at once (.npy images are memory mapped)")
+    oCommand.set_defaults(fnRun=runReconstr, aRequired=["left", "right"])
+
+    oCommand = oCommands.add_parser("batch", help="PLY point clouds of every image pair of a left and a right folder")
+    oCommand.add_argument("left", nargs="?", help="folder with the left images")
+    oCommand.add_argument("right", nargs="?", help="folder with the right images, paired with the left ones by sorted file name")
+    addMatcherArgs(oCommand)
+    oCommand.add_argument("-o", "--output", default="reconstructed", help="folder of the PLY files (default: %(default)s)")
+    oCommand.add_argument("--queue-size", type=int, default=4, help="image pairs buffered between pipeline stages (default: %(default)s)")
+    oCommand.set_defaults(fnRun=runBatchReconstr, aRequired=["left", "right"])
+
+    oCommand = oCommands.add_parser("sequence", help="depth maps of a stereo video, each frame matched from the disparity of the previous one")
+    oCommand.add_argument("left", nargs="?", help="left video file, or folder with the left frames")
+    oCommand.add_argument("right", nargs="?", help="right video file, or folder with the right frames paired with the left ones by sorted file name")
+    addMatcherArgs(oCommand)
+    oCommand.add_argument("-o", "--output", default=None, help="folder of the PLY files of the frames (default: none, only the frame rate is reported)")
+    oCommand.set_defaults(fnRun=runSequenceReconstr, aRequired=["left", "right"])
+
+    return oParser, oCommands
+
+def parseArgs(aArgv):
+    """ Parse the command line, the defaults of the command being taken from the --config file if given """
+    oParser, oCommands = createParser()
+    oArgs = oParser.parse_args(aArgv)
+
+    if (oArgs.config):
+        with open(oArgs.config) as oFile:
+            dConfig = json.load(oFile)
+        oCommands.choices[oArgs.command].set_defaults(**dConfig)
+        oArgs = oParser.parse_args(aArgv)
+
+    for sName in oArgs.aRequired:
+        if getattr(oArgs, sName) is None:
+            oParser.error(f"{oArgs.command}: '{sName}' is required (argument or config file)")
+    if (oArgs.command in ("reconstruct", "batch", "sequence") and oArgs.block_size is None):
+        oArgs.block_size = 3 if oArgs.algorithm == "sgbm" else 5
+    return oArgs
+
+def main(aArgv=None):
+    oArgs = parseArgs(aArgv)
+    if (oArgs.no_report):
+        oReport = None
+    else:
+        dParams = {sName: oValue for sName, oValue in vars(oArgs).items() if sName not in ("fnRun", "aRequired")}
+        oReport = RunReport(oArgs.command, dParams).start()
+
+    sStatus = "failed"
+    oFailure = None
+    try:
+        oArgs.fnRun(oArgs, oReport.reportProgress if oReport else None)
+        sStatus = "succeeded"
+    except InputError as oError:
+        print("Error: ", oError, file=sys.stderr)
+        oFailure = oError
+        return 1
+    finally:
+        if oReport is not None:
+            oReport.finish(sStatus, oFailure)
+            oReport.save(getReportPath(oArgs))
+            print(oReport.getSummary())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
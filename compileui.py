@@ -0,0 +1,41 @@
+""" Generate the Python modules of the Qt Designer screens into ui/, main.py builds the screens from them instead of
+parsing the .ui files at start up.
+
+    python compileui.py
+    python compileui.py "Rekon - Welcome.ui"
+
+Run it again after editing a .ui file: until then main.py detects that the module is out of date and loads the .ui
+file itself, as before. """
+import glob
+import io
+import os
+import sys
+
+from PyQt5.uic import compileUi
+
+from ui import getUIHash, getUIModuleName
+
+sUIFolder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui")
+
+def compileUIFile(sUIPath):
+    """ Write the module of a .ui file to ui/, with the hash of the file it was generated from. Returns its path. """
+    oCode = io.StringIO()
+    with open(sUIPath) as oFile:
+        compileUi(oFile, oCode)
+
+    sModulePath = os.path.join(sUIFolder, getUIModuleName(sUIPath) + ".py")
+    with open(sModulePath, "w") as oFile:
+        oFile.write(f"# Generated from '{os.path.basename(sUIPath)}' by compileui.py, edit the .ui file and run it again\n")
+        oFile.write(f"sUIHash = \"{getUIHash(sUIPath)}\"\n")
+        oFile.write(oCode.getvalue())
+    return sModulePath
+
+def main(aArgv=None):
+    aUIPaths = (sys.argv[1:] if aArgv is None else aArgv) or sorted(glob.glob("Rekon - *.ui"))
+    for sUIPath in aUIPaths:
+        print(sUIPath, "->", compileUIFile(sUIPath))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,153 +1,339 @@
+import time
+
+nImportStart = time.perf_counter()
+
 from enum import Flag
 import os
-import subprocess
 import sys
 from os import path
 
 import cv2
-import matplotlib.pyplot as plt
 import numpy as np
-import PIL.ExifTags
-import PIL.Image
 from PyQt5 import QtGui, QtWidgets
-from PyQt5.QtWidgets import QApplication, QDialog, QFileDialog, QMessageBox
-from PyQt5.uic import loadUi
-from tqdm import *
-
-terminationCriteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
-
-#################################################################
-### Methods for writing/reading calibration files ###
-def saveCameraCoef(K, D, rms, sPath):
-    """ Save camera matrix and the distortion coefficients to given path - yml file """
-
-    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_WRITE)
-
-    oFile.write("K", K)
-    oFile.write("D", D)
-    oFile.write("RMS", rms)
-
-    oFile.release()
-
-
-def saveStereoCoef(K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q, sPath):
-    """ Save the stereo coefficients to given path/file """
-
-    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_WRITE)
-    oFile.write("K1", K1)
-    oFile.write("D1", D1)
-    oFile.write("K2", K2)
-    oFile.write("D2", D2)
-    oFile.write("R", R)
-    oFile.write("T", T)
-    oFile.write("E", E)
-    oFile.write("F", F)
-    oFile.write("R1", R1)
-    oFile.write("R2", R2)
-    oFile.write("P1", P1)
-    oFile.write("P2", P2)
-    oFile.write("Q", Q)
-    oFile.release()
-
-
-def loadCameraCoef(sPath):
-    """ Loads camera matrix and distortion coefficients for single camera calibration """
-
-    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_READ)
-
-    #specify node and type of object 
-    K = oFile.getNode("K").mat()
-    D = oFile.getNode("D").mat()
-
-    oFile.release()
-    return [K, D]
-
-def loadQ(sPath):
-    """ Loads camera matrix and distortion coefficients for single camera calibration """
-
-    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_READ)
-
-    #specify node and type of object 
-    Q = oFile.getNode("Q").mat()
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QAbstractButton, QApplication, QComboBox, QDialog, QDoubleSpinBox, QFileDialog, QHBoxLayout, QLabel, QLineEdit,
+                             QMessageBox, QProgressBar, QPushButton, QSpinBox, QWidget)
 
-    oFile.release()
-    return Q
+import ui
+from rekon import *
 
+# Seconds the imports of this module may take, for the welcome screen to show up quickly. matplotlib and PyQt5.uic are
+# only imported when they're used; a warning is printed at start up beyond it, benchmark.py measures it too.
+nImportBudget = 0.5
+nImportSeconds = time.perf_counter() - nImportStart
 
-def loadStereoCoef(sPath):
-    """ Loads coefficients for stereo calibration"""
+############################################################################
+### Screen registry ###
+def loadScreenUi(sUIPath, oScreen):
+    """ Create the widgets of a screen from the module generated from its .ui file (see compileui.py), or from the
+    .ui file itself while the module is missing or out of date """
+    oModule = ui.loadUIModule(sUIPath)
+    if oModule is None:
+        from PyQt5.uic import loadUi
+        loadUi(sUIPath, oScreen)
+        return
+    oUi = oModule.Ui_Dialog()
+    oUi.setupUi(oScreen)
+    vars(oScreen).update(vars(oUi))  # The widgets as attributes of the screen, as loadUi sets them
+
+# Screen class -> [screen, saved widget states, saved attributes]. Each screen is built once (parsing its .ui file) and
+# reset to the state it was built in whenever it's shown again, so the stacked widget holds one screen of each class.
+dScreens = {}
+
+# Widget properties saved once a screen is built and restored when it's shown again: [widget class, getter, setter]
+aScreenProperties = [(QWidget, "styleSheet", "setStyleSheet"), (QLabel, "text", "setText"), (QLineEdit, "text", "setText"),
+                     (QAbstractButton, "isChecked", "setChecked"), (QSpinBox, "value", "setValue"), (QDoubleSpinBox, "value", "setValue"),
+                     (QComboBox, "currentIndex", "setCurrentIndex")]
+
+def saveScreenState(oScreen):
+    """ Visibility, enabled state, property values and label pixmaps of the widgets of a screen, Qt's internal widgets
+    (the line edit of a spin box...) aside. Returns [aWidgetStates, dAttributes]. """
+    aWidgetStates = []
+    for oWidget in oScreen.findChildren(QWidget):
+        if oWidget.objectName().startswith("qt_"):
+            continue
+        aValues = [(sGetter, sSetter, getattr(oWidget, sGetter)()) for cWidget, sGetter, sSetter in aScreenProperties if isinstance(oWidget, cWidget)]
+        oPixmap = oWidget.pixmap() if isinstance(oWidget, QLabel) else None
+        aWidgetStates.append((oWidget, oWidget.isHidden(), oWidget.isEnabledTo(oScreen), aValues, oPixmap and QtGui.QPixmap(oPixmap)))
+    return [aWidgetStates, dict(vars(oScreen))]
+
+def resetScreen(oScreen, aWidgetStates, dAttributes):
+    """ Put a screen back in the state saved by saveScreenState. The attributes set since then (chosen files...) are
+    dropped, except the widgets created since (the progress panel), which are hidden instead. """
+    for oTimer in oScreen.findChildren(QTimer):
+        oTimer.stop()
+
+    aSavedWidgets = set()
+    for oWidget, bHidden, bEnabled, aValues, oPixmap in aWidgetStates:
+        if isinstance(oWidget, QLabel):
+            # Thumbnails and previews shown since, or the pixmap of the .ui file
+            oCurrentPixmap = oWidget.pixmap()
+            if oPixmap is None and oCurrentPixmap is not None:
+                oWidget.clear()
+            elif oPixmap is not None and (oCurrentPixmap is None or oCurrentPixmap.cacheKey() != oPixmap.cacheKey()):
+                oWidget.setPixmap(oPixmap)
+        # Only the changed values (setting a style sheet polishes the widget again), without signals so their handlers don't run
+        bBlocked = oWidget.blockSignals(True)
+        for sGetter, sSetter, oValue in aValues:
+            if getattr(oWidget, sGetter)() != oValue:
+                getattr(oWidget, sSetter)(oValue)
+        oWidget.blockSignals(bBlocked)
+        oWidget.setHidden(bHidden)
+        oWidget.setEnabled(bEnabled)
+        aSavedWidgets.add(oWidget)
+    for oWidget in oScreen.findChildren(QWidget, options=Qt.FindDirectChildrenOnly):
+        if oWidget not in aSavedWidgets:
+            oWidget.hide()
+
+    for sName, oValue in list(vars(oScreen).items()):
+        if sName not in dAttributes and not isinstance(oValue, QWidget):
+            delattr(oScreen, sName)
+    vars(oScreen).update(dAttributes)
+
+def getRunningJobs(oScreen):
+    """ Background jobs of a screen still running """
+    return [oValue for oValue in vars(oScreen).values() if isinstance(oValue, BackgroundJob) and oValue.isRunning()]
+
+def freeScreen(oScreen):
+    """ Delete a screen dropped from the registry, once its background jobs are cancelled and over """
+    aJobs = getRunningJobs(oScreen)
+    if (aJobs):
+        for oJob in aJobs:
+            oJob.cancel()
+        aJobs[0].finished.connect(lambda: freeScreen(oScreen))
+        return
+    oScreen.deleteLater()
+
+def showScreen(cScreen, **dArgs):
+    """ Show the screen of class cScreen, built with the constructor arguments dArgs the first time. The next times it's
+    reset to the state it was built in and dArgs are set as its attributes, the screens storing their constructor
+    arguments under the same names. A screen still running a background job is evicted and built anew instead. """
+    if cScreen in dScreens and getRunningJobs(dScreens[cScreen][0]):
+        oScreen = dScreens.pop(cScreen)[0]
+        widget.removeWidget(oScreen)
+        freeScreen(oScreen)
+
+    if cScreen in dScreens:
+        oScreen, aWidgetStates, dAttributes = dScreens[cScreen]
+        resetScreen(oScreen, aWidgetStates, dAttributes)
+        for sName, oValue in dArgs.items():
+            setattr(oScreen, sName, oValue)
+    else:
+        oScreen = cScreen(**dArgs)
+        dScreens[cScreen] = [oScreen] + saveScreenState(oScreen)
+        widget.addWidget(oScreen)
+    widget.setCurrentWidget(oScreen)
+    return oScreen
 
-    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_READ)
+def navToWelcome(): 
+    """ Navigate to previous widget - Welcome Sceen """
+    showScreen(WelcomeScreen)
 
-    K1 = oFile.getNode("K1").mat()
-    D1 = oFile.getNode("D1").mat()
-    K2 = oFile.getNode("K2").mat()
-    D2 = oFile.getNode("D2").mat()
-    R = oFile.getNode("R").mat()
-    T = oFile.getNode("T").mat()
-    E = oFile.getNode("E").mat()
-    F = oFile.getNode("F").mat()
-    R1 = oFile.getNode("R1").mat()
-    R2 = oFile.getNode("R2").mat()
-    P1 = oFile.getNode("P1").mat()
-    P2 = oFile.getNode("P2").mat()
-    Q = oFile.getNode("Q").mat()
+############################################################################
+### Background jobs ###
+class BackgroundJob(QThread):
+    """ Run fnJob(fnProgress) on a worker thread. fnProgress(nDone, nTotal, sStage) streams the progress
+    and per-stage timings back to the GUI thread and raises JobCancelled once cancel() was called.
+    With oReport (a RunReport), the stages are also recorded in it and it's saved to sReportPath once the job ends. """
+    progressed = pyqtSignal(int, int, str)
+    stageTimed = pyqtSignal(str, float)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, fnJob, oReport=None, sReportPath=None):
+        super(BackgroundJob, self).__init__()
+        self.fnJob = fnJob
+        self.oReport = oReport
+        self.sReportPath = sReportPath
+        self.bCancelled = False
+        self.sStage = None
+        self.nStageStart = None
+
+    def cancel(self):
+        """ Stop the job at its next progress report (next image, row band or candidate disparity) """
+        self.bCancelled = True
+
+    def reportProgress(self, nDone, nTotal, sStage):
+        if self.bCancelled:
+            raise JobCancelled()
+        if sStage != self.sStage:
+            self.finishStage()
+            self.sStage = sStage
+            self.nStageStart = time.perf_counter()
+        self.progressed.emit(nDone, nTotal, sStage)
+
+    def finishStage(self):
+        if self.sStage is not None:
+            self.stageTimed.emit(self.sStage, time.perf_counter() - self.nStageStart)
+            self.sStage = None
+
+    def finishReport(self, sStatus, oError=None):
+        if self.oReport is not None:
+            self.oReport.finish(sStatus, oError)
+            if (self.sReportPath):
+                self.oReport.save(self.sReportPath)
+            print(self.oReport.getSummary())
+
+    def run(self):
+        fnProgress = self.reportProgress
+        if self.oReport is not None:
+            self.oReport.fnProgress = self.reportProgress
+            fnProgress = self.oReport.start().reportProgress
+        try:
+            oResult = self.fnJob(fnProgress)
+            self.finishStage()
+        except Exception as oError:
+            self.finishReport("cancelled" if isinstance(oError, JobCancelled) else "failed", oError)
+            self.failed.emit(oError)
+            return
+        if self.bCancelled:
+            # Cancelled during the last stage, after its last progress report: the result is dropped all the same
+            oError = JobCancelled()
+            self.finishReport("cancelled", oError)
+            self.failed.emit(oError)
+            return
+        self.finishReport("succeeded")
+        self.succeeded.emit(oResult)
+
+class ProgressPanel(QWidget):
+    """ Progress bar, stage timings and cancel button of the background job of a screen.
+    Once a job with a run report ends, the panel shows its total time and a button opening the stage summary. """
+    def __init__(self, oParent):
+        super(ProgressPanel, self).__init__(oParent)
+        self.setGeometry(100, 745, 800, 45)
+        self.setFont(QtGui.QFont("Century Gothic", 10))
+
+        self.oProgressBar = QProgressBar()
+        self.sStageLabel = QLabel()
+        self.oCancelBtn = QPushButton("Cancel")
+
+        oLayout = QHBoxLayout(self)
+        oLayout.addWidget(self.oProgressBar, 2)
+        oLayout.addWidget(self.sStageLabel, 3)
+        oLayout.addWidget(self.oCancelBtn)
+        self.hide()
+
+    def start(self, oJob):
+        """ Follow the progress of oJob until it ends """
+        self.oJob = oJob
+        self.aStageTimings = []
+        self.oProgressBar.setRange(0, 0)
+        self.sStageLabel.setText("Starting...")
+        if self.oCancelBtn.receivers(self.oCancelBtn.clicked) > 0:
+            self.oCancelBtn.clicked.disconnect()  # Summary button of the previous job
+        self.oCancelBtn.setText("Cancel")
+        self.oCancelBtn.setEnabled(True)
+        self.oCancelBtn.clicked.connect(oJob.cancel)
+        self.oCancelBtn.clicked.connect(lambda: self.oCancelBtn.setEnabled(False))
+        oJob.progressed.connect(self.showProgress)
+        oJob.stageTimed.connect(self.addStageTiming)
+        oJob.finished.connect(self.stop)
+        self.show()
+
+    def stop(self):
+        self.oCancelBtn.clicked.disconnect()
+        oReport = self.oJob.oReport
+        if oReport is None or oReport.dReport["status"] != "succeeded":
+            self.hide()
+            return
 
-    oFile.release()
-    return [K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q]
+        dReport = oReport.dReport
+        self.oProgressBar.setRange(0, 1)
+        self.oProgressBar.setValue(1)
+        self.sStageLabel.setText(f"Done in {dReport['seconds']:.2f} s (CPU {dReport['cpuSeconds']:.2f} s)")
+        self.oCancelBtn.setText("Summary")
+        self.oCancelBtn.setEnabled(True)
+        self.oCancelBtn.clicked.connect(lambda: self.showSummary(oReport))
+
+    def showSummary(self, oReport):
+        """ Pop-up with the time and memory used by each stage of the last job """
+        oMessageBox = QMessageBox()
+        oMessageBox.setWindowTitle("Run report")
+        oMessageBox.setText(oReport.getSummary())
+        if (self.oJob.sReportPath):
+            oMessageBox.setInformativeText("Saved to " + os.path.abspath(self.oJob.sReportPath))
+        oMessageBox.setIcon(QMessageBox.Information)
+        oMessageBox.exec_()
+        self.hide()
+
+    def showProgress(self, nDone, nTotal, sStage):
+        self.oProgressBar.setRange(0, nTotal)
+        self.oProgressBar.setValue(nDone)
+        self.sStageLabel.setText(" | ".join([sStage] + self.aStageTimings[-2:]))
+
+    def addStageTiming(self, sStage, nSeconds):
+        self.aStageTimings.append(f"{sStage}: {nSeconds:.2f} s")
+        print(f"{sStage}: {nSeconds:.2f} s")
+
+def runInBackground(oScreen, oStartBtn, fnJob, fnSucceeded, fnFailed, oReport=None, sReportPath=None):
+    """ Run fnJob(fnProgress) on a worker thread while oScreen shows its progress, so the window stays responsive.
+    oStartBtn is disabled until the job ends. fnSucceeded(result) or fnFailed(error) are then called on the GUI thread,
+    nothing is called if the user cancelled the job. The stages are recorded in oReport, saved to sReportPath. """
+    if getattr(oScreen, 'oJob', None) is not None and oScreen.oJob.isRunning():
+        return
+    if getattr(oScreen, 'oProgressPanel', None) is None:
+        oScreen.oProgressPanel = ProgressPanel(oScreen)
+
+    oJob = BackgroundJob(fnJob, oReport, sReportPath)
+    oJob.succeeded.connect(fnSucceeded)
+    oJob.failed.connect(lambda oError: print("Cancelled") if isinstance(oError, JobCancelled) else fnFailed(oError))
+    oJob.finished.connect(lambda: oStartBtn.setEnabled(True))
+    oScreen.oJob = oJob
+
+    oStartBtn.setEnabled(False)
+    oScreen.oProgressPanel.start(oJob)
+    oJob.start()
 
 ############################################################################
-### Methods for writing/opening PLY files with MeshLab ###
-def openMeshLab(sPath):
-    """ Open Mesh Lab with given file path"""
-    subprocess.Popen(['C:\Program Files\VCG\MeshLab\meshlab.exe', sPath])
-    ##TODO error handling
-    # try:
-    #     ret_code = subprocess.check_call(['ls', '-w'], stdout=subprocess.PIPE, 
-    #     stderr=subprocess.PIPE)
-    # except subprocess.CalledProcessError as e:
-    #     ret_code = e.returncode
-    #     print('An error occurred.  Error code:', ret_code)
-
-
-
-def writePLY(sPath, aVertices, aColors):
-    aColors = aColors.reshape(-1,3)
-    aVertices = np.hstack([aVertices.reshape(-1,3), aColors])
-
-    sPLYHeader = '''ply
-        format ascii 1.0
-        element vertex %(nVertices)d
-        property float x
-        property float y
-        property float z
-        property uchar red
-        property uchar green
-        property uchar blue
-        end_header
-        '''
-    with open(sPath, 'w') as oFile:
-        oFile.write(sPLYHeader %dict(nVertices=len(aVertices)))
-        np.savetxt(oFile, aVertices, '%f %f %f %d %d %d')
-        while True:
-            if os.access(sPath, os.R_OK):
-                openMeshLab(sPath)
-                break
- 
-############################################################################
-
-def navToWelcome(): 
-    """ Navigate to previous widget - Welcome Sceen """
-    oWelcomeScreen = WelcomeScreen()
-    widget.addWidget(oWelcomeScreen)
-    widget.setCurrentIndex(widget.currentIndex()+1)
+### Image thumbnails ###
+# Thumbnails of the images chosen on the parameter screens, by file identity and size
+oThumbnailCache = LRUCache(nMaxItems=8)
+# OpenCV decoding modes by downscaling factor, JPEG images are decoded from the DCT coefficients needed at that size only
+dReducedReadModes = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+def loadThumbnail(sPath, nWidth, nHeight):
+    """ Image scaled down to fit nWidth x nHeight, as a QPixmap; None if it can't be read. It's decoded at the lowest
+    resolution (1/1 to 1/8) still covering that size, instead of in full on every repaint as a style sheet image is. """
+    tKey = (getFileKey(sPath), nWidth, nHeight)
+    oPixmap = oThumbnailCache.get(tKey)
+    if oPixmap is not None:
+        return oPixmap
+
+    oImageSize = QtGui.QImageReader(sPath).size()  # From the header, without decoding the image
+    nFactor = 1
+    if oImageSize.isValid():
+        nScale = min(nWidth / oImageSize.width(), nHeight / oImageSize.height())
+        while nFactor < 8 and nFactor * 2 * nScale <= 1:
+            nFactor *= 2
+    oImg = cv2.imread(sPath, dReducedReadModes[nFactor])
+    if oImg is None:
+        return None
+
+    nScale = min(nWidth / oImg.shape[1], nHeight / oImg.shape[0])
+    if nScale < 1:
+        oImg = cv2.resize(oImg, None, fx=nScale, fy=nScale, interpolation=cv2.INTER_AREA)
+    oImg = cv2.cvtColor(oImg, cv2.COLOR_BGR2RGB)
+    oImage = QtGui.QImage(oImg.data, oImg.shape[1], oImg.shape[0], oImg.strides[0], QtGui.QImage.Format_RGB888)
+    oPixmap = QtGui.QPixmap.fromImage(oImage)  # Copies the pixels
+    oThumbnailCache.put(tKey, oPixmap)
+    return oPixmap
+
+def showThumbnail(oLabel, sPath):
+    """ Show the thumbnail of an image in a label, fitted to its size. The label is cleared if there is no image. """
+    oSize = oLabel.contentsRect().size()
+    oPixmap = loadThumbnail(sPath, oSize.width(), oSize.height()) if sPath else None
+    if oPixmap is None:
+        oLabel.clear()
+        return
+    oLabel.setAlignment(Qt.AlignCenter)
+    oLabel.setPixmap(oPixmap)
 
 ############################################################################
 ## GUI Screens ###
 class WelcomeScreen(QDialog):
     def __init__(self):
         super(WelcomeScreen, self).__init__()
-        loadUi("Rekon - Welcome.ui",self)
+        loadScreenUi("Rekon - Welcome.ui", self)
 
         self.oCameraCalibrBtn.clicked.connect(self.navToCameraCalibr)
         self.oStereoCalibrBtn.clicked.connect(self.navToStereoCalibr)
@@ -155,27 +341,21 @@ class WelcomeScreen(QDialog):
 
     def navToCameraCalibr(self):
         """ Navigate to Single Camera Calibration """
-        oCameraCalibr = CameraCalibr()
-        widget.addWidget(oCameraCalibr)
-        widget.setCurrentIndex(widget.currentIndex()+1)
+        showScreen(CameraCalibr)
 
     def navToStereoCalibr(self):
         """ Navigate to Stereo Camera Calibration """
-        oStereoCalibr = StereoCalibr()
-        widget.addWidget(oStereoCalibr)
-        widget.setCurrentIndex(widget.currentIndex()+1)
+        showScreen(StereoCalibr)
 
     def navToStereoReconstr(self):
         """ Navigate to 3D Stereo Reconstruction """
-        oStereoReconstr = StereoReconstr()
-        widget.addWidget(oStereoReconstr)
-        widget.setCurrentIndex(widget.currentIndex()+1)
+        showScreen(StereoReconstr)
 
 ############################################################################
 class CameraCalibr(QDialog):
     def __init__(self):
         super(CameraCalibr, self).__init__()
-        loadUi("Rekon - Camera Calibration.ui",self)
+        loadScreenUi("Rekon - Camera Calibration.ui", self)
 
         self.oLeftCamBtn.clicked.connect(lambda: self.displayFolderPath("left"))
         self.oRightCamBtn.clicked.connect(lambda: self.displayFolderPath("right"))
@@ -232,13 +412,38 @@ class CameraCalibr(QDialog):
 
     def proceedWithCameraCalibr(self):
         """ Apply single camera calibration on each camera (left and right) using user input parameters.
-        Save coefficients to yml files (default: leftCamParams.yml and rightCamParams.yml). Display the root mean square (RMS) re-projection error for each camera."""
-        ##TODO loading screens 
-
+        Calibration runs in the background, the coefficients are saved once it's done (saveCameraCalibr). """
+
+        def calibrate(fnProgress):
+            retValueL = calibrateCamera(self.sLeftFolderPath, self.nSquareSize, self.nChessboardW-1, self.nChessboardH-1, sDrawFolder="draw",
+                                        fnProgress=lambda nDone, nTotal, sStage: fnProgress(nDone, nTotal, "Left camera - " + sStage))
+            if (len(retValueL) == 1):
+                return [retValueL, None]
+            retValueR = calibrateCamera(self.sRightFolderPath, self.nSquareSize, self.nChessboardW-1, self.nChessboardH-1, sDrawFolder="draw",
+                                        fnProgress=lambda nDone, nTotal, sStage: fnProgress(nDone, nTotal, "Right camera - " + sStage))
+            return [retValueL, retValueR]
+
+        oReport = RunReport("calibrate-camera", dict(left=self.sLeftFolderPath, right=self.sRightFolderPath, square_size=self.nSquareSize,
+                                                     chessboard_w=self.nChessboardW, chessboard_h=self.nChessboardH))
+        runInBackground(self, self.oProcessBtn, calibrate, self.saveCameraCalibr, self.showCalibrError, oReport, "camParams.report.json")
+
+    def showCalibrError(self, oError):
+        """ Error pop-up for an unexpected error during calibration """
+        print("An error occured in single camera calibration: ", oError)
+        oMessageBox = QMessageBox()
+        oMessageBox.setWindowTitle("Error")
+        oMessageBox.setText("An error ocurred during camera calibration. Please try again.")
+        oMessageBox.setIcon(QMessageBox.Critical)
+        oMessageBox.setStandardButtons(QMessageBox.Ok)
+        oMessageBox.setDefaultButton(QMessageBox.Ok)
+        oMessageBox.exec_()
+
+    def saveCameraCalibr(self, aRetValues):
+        """ Save coefficients to yml files (default: leftCamParams.yml and rightCamParams.yml). Display the root mean square (RMS) re-projection error for each camera."""
+        retValueL, retValueR = aRetValues
 
-        retValueL = self.singleCalibration(self.sLeftFolderPath, self.nSquareSize, self.nChessboardW-1, self.nChessboardH-1)
         if (len(retValueL) > 1 ):
-            nRMS, K, D, aRotation, aTranslation  = retValueL
+            bSuccessL, nRMS, K, D, aRotation, aTranslation  = retValueL
             aLeftPath = QFileDialog.getSaveFileName(self, 'Save File', "leftCamParams.yml", "YML Files (*.yml)")
             #Write params to file
             if (aLeftPath[0]):
@@ -257,7 +462,6 @@ class CameraCalibr(QDialog):
             return            
 
 
-        retValueR = self.singleCalibration(self.sRightFolderPath, self.nSquareSize, self.nChessboardW-1, self.nChessboardH-1)
         if (len(retValueR) > 1 ):
             bSuccessR, nRMS, K, D, aRotation, aTranslation = retValueR
             aRightPath = QFileDialog.getSaveFileName(self, 'Save File', "rightCamParams.yml", "YML Files (*.yml)")
@@ -289,65 +493,12 @@ class CameraCalibr(QDialog):
             oMessageBox.buttonClicked.connect(navToWelcome)
             oMessageBox.exec_()
 
-
-
-    def singleCalibration(self, sFolderPath, nSquareSize=0.025, nChessboardW=8, nChessboardH=5):
-        """ Single camera calibration using chessboard pattern. Compute RMS, camera matrix, distortion coefficients, rotation and translation vectors. """
-        # Array of object 3D points - intersection of squares in the chessboard
-        # (0,0,0), (1,0,0), ... etc
-        aObjectPoints = np.zeros((nChessboardH*nChessboardW, 3), np.float32)
-        aObjectPoints[:, :2] = np.mgrid[0:nChessboardW, 0:nChessboardH].T.reshape(-1, 2)
-
-        aObjectPoints = aObjectPoints * nSquareSize  # Real world coordinates using the nChessboard & nChessboardH of one square
-
-        aSpacePoints = []  # 3D points
-        aImagePoints = []  # 2D points
-
-        aPaths = os.listdir(sFolderPath)
-        nImages = 0
-
-        try:
-            for sImageName in tqdm(aPaths):
-                oImg = cv2.imread(os.path.join(sFolderPath, sImageName))
-                oBGImg = cv2.cvtColor(oImg, cv2.COLOR_BGR2GRAY)
-                
-                # cv2.CALIB_USE_INTRINSIC_GUESS
-                bFound, aCorners = cv2.findChessboardCorners(oBGImg, (nChessboardW, nChessboardH), flags=cv2.CALIB_CB_ADAPTIVE_THRESH)
-
-                # If found, add object points, image points (after refining them)
-                if bFound:
-                    aSpacePoints.append(aObjectPoints)
-
-                    aCornersAcc = cv2.cornerSubPix(oBGImg, aCorners, (11, 11), (-1, -1), terminationCriteria)
-                    aImagePoints.append(aCornersAcc)
-
-                    print(f"Chessboard found in {sImageName}!")
-                    nImages+=1
-
-                    # Draw chessboard corners
-                    oImg = cv2.drawChessboardCorners(oImg, (nChessboardW, nChessboardH), aCornersAcc, bFound)
-                    cv2.imwrite("draw/" + sImageName, oImg)
-                    # cv2.imshow(sImageName, oImg)
-                    # cv2.waitKey()
-                else:
-                    print(f"Chessboard couldn't be detected in  {sImageName}!")
-
-            if (nImages > 15):
-                nRMS, aCameraMatrix, aDistorsionCoef, aRotation, aTranslation = cv2.calibrateCamera(aSpacePoints, aImagePoints, oBGImg.shape[::-1], None, None)
-                return [True, nRMS, aCameraMatrix, aDistorsionCoef, aRotation, aTranslation]
-            else:
-                return [False]
-        except:
-            print("An error occured in single camera calibration")
-            return [False]
-                
-
 ############################################################################
 
 class StereoCalibr(QDialog):
     def __init__(self):
         super(StereoCalibr, self).__init__()
-        loadUi("Rekon - Stereo Calibration.ui",self)
+        loadScreenUi("Rekon - Stereo Calibration.ui", self)
         
         self.oLeftCamBtn.clicked.connect(lambda: self.displayFolderPath("left"))
         self.oRightCamBtn.clicked.connect(lambda: self.displayFolderPath("right"))
@@ -461,162 +612,61 @@ class StereoCalibr(QDialog):
             self.stereoCalibration(self.sLeftFilePath, self.sRightFilePath, self.sLeftFolderPath, self.sRightFolderPath, self.nSquareSize, self.nChessboardW-1, self.nChessboardH-1)
 
     def stereoCalibration(self, sLeftFile, sRightFile, sLeftFolderPath, sRightFolderPath, nSquareSize=0.025, nChessboardW=9, nChessboardH=6):
-        """ Stereo camera calibration using chessboard pattern. """
-        # Array of object 3D points - intersection of squares in the chessboard
-        # (0,0,0), (1,0,0), ... etc
-        aObjectPoints = np.zeros((nChessboardH * nChessboardW, 3), np.float32)
-        aObjectPoints[:, :2] = np.mgrid[0 : nChessboardW, 0 : nChessboardH].T.reshape(-1, 2)
-
-        aObjectPoints = aObjectPoints * nSquareSize  # Real world coordinates using the nChessboard & nChessboardH of one square
-
-        aSpacePoints = []  # 3D points in real world space
-        aLeftPoints = []  # 2D points in left image plane.
-        aRightPoints = []  # 2D points in right image plane.
-
-
-        # Get images from folders
-        aLeftImgs = os.listdir(sLeftFolderPath);
-        aRightImgs = os.listdir(sRightFolderPath);
-
+        """ Stereo camera calibration using chessboard pattern. Calibration runs in the background, the coefficients are saved once it's done (saveStereoCalibr). """
+        runInBackground(self, self.oProcessBtn,
+                        lambda fnProgress: calibrateStereo(sLeftFile, sRightFile, sLeftFolderPath, sRightFolderPath, nSquareSize, nChessboardW, nChessboardH, fnProgress),
+                        self.saveStereoCalibr, self.showStereoCalibrError,
+                        RunReport("calibrate-stereo", dict(left_params=sLeftFile, right_params=sRightFile, left=sLeftFolderPath, right=sRightFolderPath,
+                                                           square_size=nSquareSize, chessboard_w=nChessboardW, chessboard_h=nChessboardH)),
+                        "stereoCamParams.report.json")
+
+    def saveStereoCalibr(self, aCoefs):
+        """ Save the stereo coefficients, default: stereoCamParams.yml """
+        K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q = aCoefs
+
+        aPath = QFileDialog.getSaveFileName(self, 'Save File', "stereoCamParams.yml", "YML Files (*.yml)")
+        if (aPath[0]):
+            saveStereoCoef(K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q, aPath[0])
+
+            ##Success message and navigate back home
+            oMessageBox = QMessageBox()
+            oMessageBox.setWindowTitle("Stereo Calibration Complete")
+            oMessageBox.setText("Camera configuration files have been successfully written.")
+            oMessageBox.setIcon(QMessageBox.Information)
+            oMessageBox.setStandardButtons(QMessageBox.Ok)
+            oMessageBox.setDefaultButton(QMessageBox.Ok)
+            oMessageBox.buttonClicked.connect(navToWelcome)
+            oMessageBox.exec_()
 
-        if len(aLeftImgs) != len(aRightImgs):
-            print("The number of left images doesn't match the number of right images. Images can't be paired.")
-            print("Left images count: ", len(aLeftImgs))
-            print("Right images count: ", len(aRightImgs))
+    def showStereoCalibrError(self, oError):
+        """ Error pop-up for a failed stereo calibration """
+        if isinstance(oError, InputError):
             # Error pop-up
             oMessageBox = QMessageBox()
             oMessageBox.setWindowTitle("Error")
-            oMessageBox.setText("The number of left files doesn't match the number of right files. Images can't be paired.")
+            oMessageBox.setText(str(oError))
             oMessageBox.setIcon(QMessageBox.Critical)
             oMessageBox.buttonClicked.connect(navToWelcome)
             oMessageBox.exec_()
             return
 
-        # Pair the images for single loop handling
-        aPairedImages = zip(aLeftImgs, aRightImgs)  
+        print("An error occured in stereo camera calibration: ", oError)
+        ##Error message
+        oMessageBox = QMessageBox()
+        oMessageBox.setWindowTitle("Error")
+        oMessageBox.setText("An error ocurred during stereo camera calibration. Please try again and make sure that the chessboard pattern is visible in at least 15 image pairs.")
+        oMessageBox.setIcon(QMessageBox.Critical)
+        oMessageBox.setStandardButtons(QMessageBox.Ok)
+        oMessageBox.setDefaultButton(QMessageBox.Ok)
+        oMessageBox.exec_()
 
-        # Iterate through the pairs and find chessboard corners. Add points to corresponding arrays
-        # If openCV can't find the corners, discard the pair.
-        nImages = 0
-        try:
-            for sLeftImg, sRightImg in aPairedImages:
-                # Find chessboard corners in each image
-
-                # Left
-                oLeftImg = cv2.imread(os.path.join(sLeftFolderPath, sLeftImg))
-                oBWLeftImg = cv2.cvtColor(oLeftImg, cv2.COLOR_BGR2GRAY)
-
-                # cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_FILTER_QUADS
-                # cv2.CALIB_USE_INTRINSIC_GUESS
-                bFoundL, aCornersL = cv2.findChessboardCorners(oBWLeftImg, (nChessboardW, nChessboardH), flags=cv2.CALIB_CB_ADAPTIVE_THRESH)
-
-                # Right 
-                oRightImg = cv2.imread(os.path.join(sRightFolderPath, sRightImg))
-                oBWRightImg = cv2.cvtColor(oRightImg, cv2.COLOR_BGR2GRAY)
-
-                ##TODO check shape
-
-                # cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_FILTER_QUADS
-                # cv2.CALIB_USE_INTRINSIC_GUESS
-                bFoundR, aCornersR = cv2.findChessboardCorners(oBWRightImg, (nChessboardW, nChessboardH), flags=cv2.CALIB_CB_ADAPTIVE_THRESH)
-
-                if bFoundL and bFoundR: # Chessboard found in both images
-                    nImages +=1
-                    # 3D points
-                    aSpacePoints.append(aObjectPoints)
-                    
-                    # Right 2D points
-                    aCornersRAcc = cv2.cornerSubPix(oBWRightImg, aCornersR, (11, 11), (-1, -1), terminationCriteria)
-                    aRightPoints.append(aCornersRAcc)
-
-                    oImg = cv2.drawChessboardCorners(oRightImg, (nChessboardW, nChessboardH), aCornersRAcc, bFoundR)
-                    # cv2.imshow(sRightImg, oImg)
-                    # cv2.waitKey()
-                    # cv2.imwrite("draw stereo right/" + sRightImg, oImg)
-
-                    # Left 2D points
-                    aCornersLAcc = cv2.cornerSubPix(oBWLeftImg, aCornersL, (11, 11), (-1, -1), terminationCriteria)
-                    aLeftPoints.append(aCornersLAcc)
-
-                    oImg = cv2.drawChessboardCorners(oLeftImg, (nChessboardW, nChessboardH), aCornersLAcc, bFoundL)
-                    # cv2.imshow(sLeftImg, oImg)
-                    # cv2.waitKey()
-                    # cv2.imwrite("draw stereo left/" + sLeftImg, oImg)
-                    print("Chessboard found in image pair: ", sLeftImg, " and ", sRightImg)
-
-                else:
-                    print("Chessboard couldn't be detected in image pair: ", sLeftImg, " and ", sRightImg)
-
-            h,w = oBWRightImg.shape 
-            K1, D1 = loadCameraCoef(sLeftFile)
-            K2, D2 = loadCameraCoef(sRightFile)
-
-            if (nImages > 15):
-                nRMS, K1, D1, K2, D2, R, T, E, F = cv2.stereoCalibrate(aSpacePoints, aLeftPoints, aRightPoints, K1, D1, K2, D2, (w,h), flags=cv2.CALIB_FIX_INTRINSIC | cv2.CALIB_SAME_FOCAL_LENGTH)
-                print("Stereo calibration RMS: ", nRMS)
-                R1, R2, P1, P2, Q, roiLeft, roiRigth = cv2.stereoRectify(K1, D1, K2, D2, (w,h), R, T, flags=cv2.CALIB_ZERO_DISPARITY, alpha=0)
-
-                ##Show recfified images to make sure everything's ok
-                # sLeftImg = aLeftImgs[0]
-                # sRightImg = aRightImgs[0]
-
-                # oLeftImg = cv2.imread(os.path.join(sLeftFolderPath, sLeftImg))
-                # cv2.imshow("Left ", oLeftImg)
-                # cv2.waitKey()
-
-                # oRightImg = cv2.imread(os.path.join(sRightFolderPath, sRightImg))
-                # cv2.imshow("Right", oRightImg)
-                # cv2.waitKey()
-
-
-                # aLeftMapX, aLeftMapY = cv2.initUndistortRectifyMap(K1, D1, R1, P1, (w,h), cv2.CV_32FC1)
-                # oLeftRectified = cv2.remap(oLeftImg, aLeftMapX, aLeftMapY, cv2.INTER_LINEAR)
-                # cv2.imshow("Left rectified", oLeftRectified)
-                # cv2.imwrite("rectified/" + sLeftImg, oLeftRectified)
-                # cv2.waitKey()
-                        
-
-                # aRightMapX, aRightMapY = cv2.initUndistortRectifyMap(K2, D2, R2, P2, (w,h), cv2.CV_32FC1)
-                # oRightRectified = cv2.remap(oRightImg, aRightMapX, aRightMapY, cv2.INTER_LINEAR)
-                # cv2.imshow("Right rectified", oRightRectified)
-                # cv2.imwrite("rectified/" + sRightImg, oRightRectified)
-                # cv2.waitKey()
-
-                aPath = QFileDialog.getSaveFileName(self, 'Save File', "stereoCamParams.yml", "YML Files (*.yml)")
-                if (aPath[0]):
-                    saveStereoCoef(K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q, aPath[0])
-
-                    ##Success message and navigate back home
-                    oMessageBox = QMessageBox()
-                    oMessageBox.setWindowTitle("Stereo Calibration Complete")
-                    oMessageBox.setText("Camera configuration files have been successfully written.")
-                    oMessageBox.setIcon(QMessageBox.Information)
-                    oMessageBox.setStandardButtons(QMessageBox.Ok)
-                    oMessageBox.setDefaultButton(QMessageBox.Ok)
-                    oMessageBox.buttonClicked.connect(navToWelcome)
-                    oMessageBox.exec_()
-
-            else:
-                raise ValueError('Not enough image pairs')
-        except:
-            ##Error message
-            oMessageBox = QMessageBox()
-            oMessageBox.setWindowTitle("Error")
-            oMessageBox.setText("An error ocurred during stereo camera calibration. Please try again and make sure that the chessboard pattern is visible in at least 15 image pairs.")
-            oMessageBox.setIcon(QMessageBox.Critical)
-            oMessageBox.setStandardButtons(QMessageBox.Ok)
-            oMessageBox.setDefaultButton(QMessageBox.Ok)
-            oMessageBox.exec_()
-            return  
-
-                
 
 ############################################################################
 
 class StereoReconstr(QDialog):
     def __init__(self): 
         super(StereoReconstr, self).__init__()
-        loadUi("Rekon - Stereo Reconstruction.ui",self)
+        loadScreenUi("Rekon - Stereo Reconstruction.ui", self)
 
         # self.oOpenDepthMap.stateChanged.connect(self)
         self.oCustomCalibrFilesCb.stateChanged.connect(self.onCustomCalibrFilesCbChecked)
@@ -692,7 +742,7 @@ class StereoReconstr(QDialog):
     def setFilePathLabel(self, bQ = False):
         """ Set file path under upload button """
 
-        aFilePath = QFileDialog.getOpenFileName(self, "Select file", "", "YML Files (*.yml)")
+        aFilePath = QFileDialog.getOpenFileName(self, "Select file", "", "Calibration Files (*.yml *.yaml *.xml *.npz *.npy)")
         sFilePath = aFilePath[0]
         if (not bQ):
 
@@ -731,6 +781,7 @@ class StereoReconstr(QDialog):
         """ Navigate to Parameters screen based on selected algoritghm """
         sAlgorithm = self.oReconstrAlgCb.currentText()
         bOpenDepthMap = self.oOpenDepthMapCb.isChecked()
+        bRectify = self.oRectifyCb.isChecked()
 
         if (self.oCustomQCb.isChecked()):
             sQFilePath = self.sQFilePathText
@@ -752,24 +803,23 @@ class StereoReconstr(QDialog):
                 return
 
         if ("SGBM" in sAlgorithm):
-            oSGBMParams = SGBMParams(bOpenDepthMap, sFilePath, sQFilePath)
-            widget.addWidget(oSGBMParams)
-            widget.setCurrentIndex(widget.currentIndex()+1)
+            showScreen(SGBMParams, bOpenDepthMap=bOpenDepthMap, sFilePath=sFilePath, sQFilePath=sQFilePath, bRectify=bRectify)
         else:
-            oSADParams = SADParams(bOpenDepthMap, sFilePath, sQFilePath)
-            widget.addWidget(oSADParams)
-            widget.setCurrentIndex(widget.currentIndex()+1)
+            showScreen(SADParams, bOpenDepthMap=bOpenDepthMap, sFilePath=sFilePath, sQFilePath=sQFilePath, bRectify=bRectify)
 
 
 ############################################################################
+# Milliseconds without parameter changes before the SGBM preview is recomputed
+nPreviewDelay = 300
 
 class SGBMParams(QDialog):
-    def __init__(self, bOpenDepthMap, sFilePath, sQFilePath): 
+    def __init__(self, bOpenDepthMap, sFilePath, sQFilePath, bRectify=False): 
         super(SGBMParams, self).__init__()
-        loadUi("Rekon - SGBM Parameters.ui",self)
+        loadScreenUi("Rekon - SGBM Parameters.ui", self)
         self.bOpenDepthMap = bOpenDepthMap
         self.sFilePath = sFilePath
         self.sQFilePath = sQFilePath
+        self.bRectify = bRectify
 
         self.oRestoreBtn.clicked.connect(self.restoreDefaultValues)
         self.oRestoreBtn.setIcon(QtGui.QIcon("undo.png"))
@@ -782,22 +832,75 @@ class SGBMParams(QDialog):
 
         self.oBackBtn.clicked.connect(self.navToStereoReconstr)
 
+        # Live preview: the downscaled depth map is recomputed once the values stop changing for nPreviewDelay ms
+        self.oPreviewJob = None
+        self.bPreviewPending = False
+        self.oPreviewTimer = QTimer(self)
+        self.oPreviewTimer.setSingleShot(True)
+        self.oPreviewTimer.setInterval(nPreviewDelay)
+        self.oPreviewTimer.timeout.connect(self.updatePreview)
+        for oSpinBox in (self.oMinDisparity, self.oNumDisparities, self.oBlockSize, self.oSpeckleWindowSize,
+                         self.oUniqRatio, self.oDisp12MaxDiff, self.oPreFilterCap, self.oSpeckleRange):
+            oSpinBox.valueChanged.connect(self.schedulePreview)
+
     def uploadImage(self, sLabel):
         """ Set images (left and right) to corresponding labels """
         if (sLabel == "left"):
             aFilePath = QFileDialog.getOpenFileName(self, "Select image", "", "Image Files (*.png *.jpg *.jpeg)")
             self.sLeftPath = aFilePath[0]
-            self.sLeftImage.setStyleSheet(f"background-image : url('{self.sLeftPath}');")
+            showThumbnail(self.sLeftImage, self.sLeftPath)
         elif (sLabel == "right"):
             aFilePath = QFileDialog.getOpenFileName(self, "Select image", "", "Image Files (*.png *.jpg *.jpeg)")
             self.sRightPath = aFilePath[0]
-            self.sRightImage.setStyleSheet(f"background-image : url('{self.sRightPath }');")
+            showThumbnail(self.sRightImage, self.sRightPath)
 
         if (hasattr(self, 'sLeftPath') and hasattr(self, 'sRightPath')):
             if (self.sLeftPath and self.sRightPath):
                 self.oGenerateBtn.setEnabled(True)
             else:
                 self.oGenerateBtn.setEnabled(False)
+        self.schedulePreview()
+
+    def schedulePreview(self):
+        """ (Re)start the preview delay, the preview is computed once the parameters stop changing """
+        if (getattr(self, 'sLeftPath', '') and getattr(self, 'sRightPath', '')):
+            self.oPreviewTimer.start()
+
+    def updatePreview(self):
+        """ Compute the downscaled depth map with the current parameters in the background.
+        While a preview is computed, the changes are collected and the latest values computed next. """
+        if self.oPreviewJob is not None and self.oPreviewJob.isRunning():
+            self.bPreviewPending = True
+            return
+        self.bPreviewPending = False
+
+        aParams = (self.oBlockSize.value(), self.oMinDisparity.value(), self.oNumDisparities.value(), self.oDisp12MaxDiff.value(),
+                   self.oUniqRatio.value(), self.oSpeckleWindowSize.value(), self.oSpeckleRange.value(), self.oPreFilterCap.value())
+        sLeftPath, sRightPath = self.sLeftPath, self.sRightPath
+
+        self.oPreviewJob = BackgroundJob(lambda fnProgress: computePreviewSGBM(self.sFilePath, sLeftPath, sRightPath, *aParams, bRectify=self.bRectify))
+        self.oPreviewJob.succeeded.connect(self.showPreview)
+        self.oPreviewJob.failed.connect(self.showPreviewError)
+        self.oPreviewJob.finished.connect(self.finishPreview)
+        self.oPreviewJob.start()
+
+    def finishPreview(self):
+        """ Compute the preview of the values changed while the previous one was computed """
+        if (self.bPreviewPending):
+            self.oPreviewJob.wait()
+            self.updatePreview()
+
+    def showPreview(self, aPreview):
+        """ Show the downscaled depth map in the preview label """
+        nHeight, nWidth = aPreview.shape
+        oImage = QtGui.QImage(aPreview.data, nWidth, nHeight, aPreview.strides[0], QtGui.QImage.Format_Grayscale8)
+        oPixmap = QtGui.QPixmap.fromImage(oImage)  # Copies the pixels, aPreview can be released
+        self.oPreviewImage.setPixmap(oPixmap.scaled(self.oPreviewImage.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+    def showPreviewError(self, oError):
+        """ Show why the preview couldn't be computed in place of the preview, without interrupting the tuning """
+        print("Preview failed: ", oError)
+        self.oPreviewImage.setText(str(oError) if isinstance(oError, InputError) else "Preview not available for these parameters.")
 
     def restoreDefaultValues(self):
         """ Reset default parameter values for SGBM matcher """
@@ -811,6 +914,7 @@ class SGBMParams(QDialog):
         self.oSpeckleRange.setValue(2)
 
     def proceedWithReconstruction(self):
+        """ Compute the depth map and the point cloud in the background, then show the depth map if requested """
 
         nMinDisparity = self.oMinDisparity.value()
         nNumDisparities =  self.oNumDisparities.value()
@@ -821,120 +925,49 @@ class SGBMParams(QDialog):
         nPreFilterCap = self.oPreFilterCap.value()
         nSpeckleRange = self.oSpeckleRange.value()
 
-
-        aDisparity, Q = self.computeDepthMap(self.sFilePath, self.bOpenDepthMap, self.sLeftPath, self.sRightPath, nBlockSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap)
-        
-        aColors = cv2.imread(self.sLeftPath, cv2.COLOR_RGB2BGR)
-        aColors = cv2.cvtColor(aColors, cv2.COLOR_RGB2BGR)
- 
-        aMask = aDisparity > aDisparity.min()
-
-        if (self.sQFilePath):
-            Q = loadQ(self.sQFilePath)
-        print(Q)
-
-        aReprojectedPoints = cv2.reprojectImageTo3D(aDisparity, Q)  
-
-        aFinalPoints = aReprojectedPoints[aMask]
-        aFinalColors = aColors[aMask]
-
-        writePLY("reconstructed.ply", aFinalPoints, aFinalColors)
+        runInBackground(self, self.oGenerateBtn,
+                        lambda fnProgress: reconstructSGBM(self.sFilePath, self.sLeftPath, self.sRightPath, self.sQFilePath, "reconstructed.ply", nBlockSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, bRectify=self.bRectify, fnProgress=fnProgress),
+                        self.showDepthMap, self.showReconstrError,
+                        RunReport("reconstruct", dict(algorithm="sgbm", left=self.sLeftPath, right=self.sRightPath, stereo_params=self.sFilePath, q=self.sQFilePath,
+                                                      rectify=self.bRectify, block_size=nBlockSize, min_disparity=nMinDisparity, num_disparities=nNumDisparities,
+                                                      disp12_max_diff=nDisp12MaxDiff, uniqueness_ratio=nUniquenessRatio, speckle_window_size=nSpeckleWindowSize,
+                                                      speckle_range=nSpeckleRange, pre_filter_cap=nPreFilterCap)),
+                        "reconstructed.report.json")
+
+    def showDepthMap(self, aDisparity):
+        """ Open the (normalized) depth map if requested """
+        if (self.bOpenDepthMap):
+            cv2.imshow('Disparity/Depth Map', np.uint8(aDisparity))
+            cv2.waitKey()
+
+    def showReconstrError(self, oError):
+        """ Error pop-up for a failed reconstruction """
+        print("An error occurred while computing the depth map: ", oError)
+        oMessageBox = QMessageBox()
+        oMessageBox.setWindowTitle("Error")
+        if isinstance(oError, InputError):
+            oMessageBox.setText("Could not compute depth map. " + str(oError))
+        else:
+            oMessageBox.setText("An error occurred while computing the depth map. Please check input data and try again.")
+        oMessageBox.setIcon(QMessageBox.Critical)
+        oMessageBox.buttonClicked.connect(navToWelcome)
+        oMessageBox.exec_()
 
     def navToStereoReconstr(self):
         """ Navigate to 3D Stereo Reconstruction """
-        oStereoReconstr = StereoReconstr()
-        widget.addWidget(oStereoReconstr)
-        widget.setCurrentIndex(widget.currentIndex()+1)
-
-    def computeDepthMap(self, sStereoParams, bShowDepthMap, sLeftImg, sRightImg, nWindowSize=3,nMinDisparity=-1, nNumDisparities=80, nDisp12MaxDiff=12, nUniquenessRatio=10, nSpeckleWindowSize=150, nSpeckleRange=2, nPreFilterCap=63, sMode=cv2.STEREO_SGBM_MODE_SGBM_3WAY):
-        """ Compute depth map from image pair and stereo calibration coefficients. """
-        try:
-            K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q = loadStereoCoef(sStereoParams)  # Get cams params
-
-            oLeftImg = cv2.imread(sLeftImg)
-            oRightImg = cv2.imread(sRightImg)
-
-            if (oLeftImg.shape != oRightImg.shape):
-                print("Images don't have the same size")
-                # Error pop-up
-                oMessageBox = QMessageBox()
-                oMessageBox.setWindowTitle("Error")
-                oMessageBox.setText("Could not compute depth map. Images don't have the same size.")
-                oMessageBox.setIcon(QMessageBox.Critical)
-                oMessageBox.buttonClicked.connect(navToWelcome)
-                oMessageBox.exec_()
-                return
-
-            nHeight, nWidth, oChannel = oLeftImg.shape
-
-            # Undistortion and rectification
-            ##TODO
-            # aLeftMapX, aLeftMapY = cv2.initUndistortRectifyMap(K1, D1, R1, P1, (nWidth, nHeight), cv2.CV_32FC1)
-            # oLeftRectified = cv2.remap(oLeftImg, aLeftMapX, aLeftMapY, cv2.INTER_LINEAR, cv2.BORDER_CONSTANT)
-
-            # aRightMapX, aRightMapY = cv2.initUndistortRectifyMap(K2, D2, R2, P2, (nWidth, nHeight), cv2.CV_32FC1)
-            # oRightRectified = cv2.remap(oRightImg, aRightMapX, aRightMapY, cv2.INTER_LINEAR, cv2.BORDER_CONSTANT)
-
-            oLeftRectified = oLeftImg
-            oRightRectified = oRightImg
-
-            # cv2.imshow("Left rectified", oLeftRectified)
-            # cv2.imwrite( sLeftImg + "rectified.jpg" , oLeftRectified)
-            # cv2.waitKey()
-                    
-            # cv2.imshow("Right rectified", oRightRectified)
-            # cv2.imwrite(sRightImg + "rectified.jpg", oRightRectified)
-            # cv2.waitKey()
-
-            # Convert images to grayscale
-            oBWLeft = cv2.cvtColor(oLeftRectified, cv2.COLOR_BGR2GRAY)
-            oBWRight = cv2.cvtColor(oRightRectified, cv2.COLOR_BGR2GRAY)
-
-            # SGBM parameters 
-
-            oLeftMatcher = cv2.StereoSGBM_create(
-                minDisparity=nMinDisparity,
-                numDisparities=nNumDisparities,  # max_disp has to be dividable by 16 f. E. HH 192, 256
-                blockSize=nWindowSize,
-                P1=8 * 2 * nWindowSize**2,
-                P2=32 * 2 * nWindowSize**2,
-                disp12MaxDiff=nDisp12MaxDiff,
-                uniquenessRatio=nUniquenessRatio,
-                speckleWindowSize=nSpeckleWindowSize,
-                speckleRange=nSpeckleRange,
-                preFilterCap=nPreFilterCap,
-                mode=sMode
-            )
-            
-            disparity_map = oLeftMatcher.compute(oBWLeft, oBWRight)
-
-            oFilteredImg = cv2.normalize(src=disparity_map, dst=disparity_map, beta=0, alpha=255, norm_type=cv2.NORM_MINMAX);
-            oFilteredImg = np.uint8(oFilteredImg)
-
-            if (bShowDepthMap):
-                cv2.imshow('Disparity/Depth Map', oFilteredImg)
-                cv2.waitKey()
-
-            return [disparity_map, Q]
-        except:
-            # Error pop-up
-            oMessageBox = QMessageBox()
-            oMessageBox.setWindowTitle("Error")
-            oMessageBox.setText("An error occurred while computing the depth map. Please check input data and try again.")
-            oMessageBox.setIcon(QMessageBox.Critical)
-            oMessageBox.buttonClicked.connect(navToWelcome)
-            oMessageBox.exec_()
-            return
+        showScreen(StereoReconstr)
     
 
 ############################################################################
 class SADParams(QDialog):
-    def __init__(self, bOpenDepthMap, sFilePath, sQFilePath): 
+    def __init__(self, bOpenDepthMap, sFilePath, sQFilePath, bRectify=False): 
         super(SADParams, self).__init__()
-        loadUi("Rekon - SAD Parameters.ui",self)
+        loadScreenUi("Rekon - SAD Parameters.ui", self)
         self.bOpenDepthMap = bOpenDepthMap
         self.sFilePath = sFilePath
         self.sQFilePath = sQFilePath
+        self.bRectify = bRectify
+        self.oWorkersBox.setValue(os.cpu_count() or 1)
 
         self.oRestoreBtn.clicked.connect(self.restoreDefaultValues)
         self.oRestoreBtn.setIcon(QtGui.QIcon("undo.png"))
@@ -952,11 +985,11 @@ class SADParams(QDialog):
         if (sLabel == "left"):
             aFilePath = QFileDialog.getOpenFileName(self, "Select image", "~", "Image Files (*.png *.jpg)")
             self.sLeftPath = aFilePath[0]
-            self.sLeftImage.setStyleSheet(f"background-image : url('{self.sLeftPath}');")
+            showThumbnail(self.sLeftImage, self.sLeftPath)
         elif (sLabel == "right"):
             aFilePath = QFileDialog.getOpenFileName(self, "Select image", "~", "Image Files (*.png *.jpg)")
             self.sRightPath = aFilePath[0]
-            self.sRightImage.setStyleSheet(f"background-image : url('{self.sRightPath }');")
+            showThumbnail(self.sRightImage, self.sRightPath)
 
         if (hasattr(self, 'sLeftPath') and hasattr(self, 'sRightPath')):
             if (self.sLeftPath and self.sRightPath):
@@ -969,148 +1002,59 @@ class SADParams(QDialog):
         """ Reset default values for SAD algorithm """
         self.oBlockSize.setValue(5)
         self.oSearchBlockSize.setValue(56)
+        self.oWorkersBox.setValue(os.cpu_count() or 1)
+        self.oChannelsBox.setCurrentText("gray")
 
     def navToStereoReconstr(self):
         """ Navigate to 3D Stereo Reconstruction """
-        oStereoReconstr = StereoReconstr()
-        widget.addWidget(oStereoReconstr)
-        widget.setCurrentIndex(widget.currentIndex()+1)
+        showScreen(StereoReconstr)
     
     def proceedWithReconstruction(self):
-        ##TODO error handling
-        try:
-            K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q = loadStereoCoef(self.sFilePath)  # Get cams params
-
-            oLeftImg = cv2.imread(self.sLeftPath)
-            oRightImg = cv2.imread(self.sRightPath)
-
-            nHeight, nWidth, nChannels = oLeftImg.shape
-
-            # Undistortion and rectification
-            # aLeftMapX, aLeftMapY = cv2.initUndistortRectifyMap(K1, D1, R1, P1, (nWidth, nHeight), cv2.CV_32FC1)
-            # oLeftRectified = cv2.remap(oLeftImg, aLeftMapX, aLeftMapY, cv2.INTER_LINEAR, cv2.BORDER_CONSTANT)
-
-            # aRightMapX, aRightMapY = cv2.initUndistortRectifyMap(K2, D2, R2, P2, (nWidth, nHeight), cv2.CV_32FC1)
-            # oRightRectified = cv2.remap(oRightImg, aRightMapX, aRightMapY, cv2.INTER_LINEAR, cv2.BORDER_CONSTANT)
-
-            # Convert images to grayscale
-            oLeftRectified = oLeftImg
-            oRightRectified = oRightImg 
-
-            # oBWLeft = cv2.cvtColor(oLeftRectified, cv2.COLOR_BGR2GRAY)
-            # oBWRight = cv2.cvtColor(oRightRectified, cv2.COLOR_BGR2GRAY)
-
-            npLeft = np.asarray(oLeftRectified)
-            npRight = np.asarray(oRightRectified)
-
-            aLeftImg = npLeft.astype(int)
-            aRightImg = npRight.astype(int)
-
-            aDisparity = self.computeDepthMapSAD(aLeftImg, aRightImg)
-
-            aColors = cv2.imread(self.sLeftPath, cv2.COLOR_RGB2BGR)
-            aColors = cv2.cvtColor(aColors, cv2.COLOR_RGB2BGR)
-    
-            aMask = aDisparity > aDisparity.min()
-            if (self.sQFilePath): 
-                Q = loadQ(self.sQFilePath)
-            print(Q)
-            
-            aReprojectedPoints = cv2.reprojectImageTo3D(aDisparity, Q) 
-            print(aReprojectedPoints) 
-
-            aFinalPoints = aReprojectedPoints[aMask]
-            aFinalColors = aColors[aMask]
-
-            writePLY("reconstructed.ply", aFinalPoints, aFinalColors)
-        except:
-            # Error pop-up
-            oMessageBox = QMessageBox()
-            oMessageBox.setWindowTitle("Error")
-            oMessageBox.setText("An error occurred while computing the reconstruction. Please check the input data and try again.")
-            oMessageBox.setIcon(QMessageBox.Critical)
-            oMessageBox.buttonClicked.connect(navToWelcome)
-            oMessageBox.exec_()
-            return
-
-    def computeSumAbsDiff(self,aLeftBlock, aRightBlock):
-        """ Sum of absolute difference between 2 pixel blocks """
-        if aLeftBlock.shape != aRightBlock.shape:
-            return -1
-
-        return np.sum(abs(aLeftBlock - aRightBlock))
-
-    def compareBlocks(self, nRow, nCol, aLeftBlock, aRightImg, nBlockSize=5, nSearchBlockSize=56):
-        """
-        Compare left block of pixels with multiple blocks from the right
-        image using nSearchBlockSize to limit the search in the right
-        image.
-        Returns (row, column) row and column index of the best matching block 
-        in the right image
-        """
-        # Get search range for the right image
-        nMinCol = max(0, nCol - nSearchBlockSize)
-        nMaxCol = min(aRightImg.shape[1], nCol + nSearchBlockSize)
-
-        bFirst = True
-        nMinSad = None
-        pMinSAD = None
-
-        for nCol in range(nMinCol, nMaxCol):
-
-            aRightBlock = aRightImg[nRow: nRow + nBlockSize, nCol: nCol + nBlockSize]
-            nSAD = self.computeSumAbsDiff(aLeftBlock, aRightBlock)
-
-            if bFirst:
-                nMinSad = nSAD
-                pMinSAD = (nRow, nCol)
-                bFirst = False
-            else:
-                if nSAD < nMinSad:
-                    nMinSad = nSAD
-                    pMinSAD = (nRow, nCol)
-
-        return pMinSAD
-
-    def computeDepthMapSAD(self, aLeftImg, aRightImg, nBlockSize=5, nSearchBlockSize=56):
-
-        if aLeftImg.shape != aRightImg.shape:
-            print("Images don't have the same size")
-            # Error pop-up
-            oMessageBox = QMessageBox()
-            oMessageBox.setWindowTitle("Error")
-            oMessageBox.setText("Could not compute depth map. Images don't have the same size.")
-            oMessageBox.setIcon(QMessageBox.Critical)
-            oMessageBox.buttonClicked.connect(navToWelcome)
-            oMessageBox.exec_()
-            return
-
-
-        nHeight, nWidth, nChannels = aLeftImg.shape
-        aDisparity = np.zeros((nHeight, nWidth))
-
-        # Go over each pixel position
-        for nRow in tqdm(range(nBlockSize, nHeight-nBlockSize), desc = "Computing depth map"):
-            for nCol in range(nBlockSize, nWidth-nBlockSize):
-                aLeftBlock = aLeftImg[nRow : nRow + nBlockSize, nCol : nCol + nBlockSize]
-                pMinSAD = self.compareBlocks(nRow, nCol, aLeftBlock, aRightImg, nBlockSize, nSearchBlockSize)
-                aDisparity[nRow, nCol] = abs(pMinSAD[1] - nCol)
+        """ Compute the depth map and the point cloud in the background, then show the depth map if requested """
+        nBlockSize = self.oBlockSize.value()
+        nSearchBlockSize = self.oSearchBlockSize.value()
+        nWorkers = self.oWorkersBox.value()
+        sChannels = self.oChannelsBox.currentText()
+
+        runInBackground(self, self.oGenerateBtn,
+                        lambda fnProgress: reconstructSAD(self.sFilePath, self.sLeftPath, self.sRightPath, self.sQFilePath, "reconstructed.ply", nBlockSize, nSearchBlockSize, nWorkers, sChannels, bRectify=self.bRectify, fnProgress=fnProgress),
+                        self.showDepthMap, self.showReconstrError,
+                        RunReport("reconstruct", dict(algorithm="sad", left=self.sLeftPath, right=self.sRightPath, stereo_params=self.sFilePath, q=self.sQFilePath,
+                                                      rectify=self.bRectify, block_size=nBlockSize, search_block_size=nSearchBlockSize, workers=nWorkers, channels=sChannels)),
+                        "reconstructed.report.json")
+
+    def showDepthMap(self, aDisparity):
+        """ Open the depth map if requested """
         if (self.bOpenDepthMap):
+            import matplotlib.pyplot as plt  # Imported on first use, it's the slowest import of the application
+
             plt.imshow(aDisparity, cmap='hot', interpolation='nearest')
             # plt.savefig('disparity.png')
             plt.show()
             # img = PIL.Image.fromarray(aDisparity, 'L')
             # img.show() 
-        
-        return np.uint8(aDisparity)
+
+    def showReconstrError(self, oError):
+        """ Error pop-up for a failed reconstruction """
+        print("An error occurred while computing the reconstruction: ", oError)
+        oMessageBox = QMessageBox()
+        oMessageBox.setWindowTitle("Error")
+        if isinstance(oError, InputError):
+            oMessageBox.setText("Could not compute depth map. " + str(oError))
+        else:
+            oMessageBox.setText("An error occurred while computing the reconstruction. Please check the input data and try again.")
+        oMessageBox.setIcon(QMessageBox.Critical)
+        oMessageBox.buttonClicked.connect(navToWelcome)
+        oMessageBox.exec_()
 
 ############################################################################
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     app.setWindowIcon(QtGui.QIcon('icon.png'))
-    welcome = WelcomeScreen()
+    if nImportSeconds > nImportBudget:
+        print(f"Imports took {nImportSeconds:.2f} s, over the budget of {nImportBudget:.2f} s")
     widget = QtWidgets.QStackedWidget()
-    widget.addWidget(welcome)
+    showScreen(WelcomeScreen)
     widget.setFixedWidth(1000);
     widget.setFixedHeight(800);
     widget.show()
@@ -0,0 +1,1922 @@
+""" Rekon processing core: calibration, rectification, stereo matching and PLY export.
+Doesn't depend on PyQt5 or matplotlib, so it can be used headless (see cli.py). """
+import hashlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from os import path
+
+import cv2
+import numpy as np
+from tqdm import *
+
+try:
+    import resource  # Peak resident set size, not available on Windows
+except ImportError:
+    resource = None
+
+terminationCriteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+# cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_FILTER_QUADS
+# cv2.CALIB_USE_INTRINSIC_GUESS
+nChessboardFlags = cv2.CALIB_CB_ADAPTIVE_THRESH
+
+############################################################################
+### Errors and progress reporting ###
+class JobCancelled(Exception):
+    """ Raised by the progress callback of a background job once the user cancelled it """
+
+class InputError(Exception):
+    """ Invalid input data, the message is shown to the user """
+
+def reportProgress(fnProgress, nDone, nTotal, sStage):
+    """ Call the optional progress callback fnProgress(nDone, nTotal, sStage) """
+    if fnProgress is not None:
+        fnProgress(nDone, nTotal, sStage)
+
+############################################################################
+### Run reports ###
+aActiveReports = []  # Run reports timeStage adds to
+oReportsLock = threading.Lock()
+
+def getPeakRSS():
+    """ Peak resident set size of the process so far in bytes, None where the platform doesn't report it """
+    if resource is None:
+        return None
+    nPeak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return nPeak if sys.platform == "darwin" else nPeak * 1024
+
+@contextmanager
+def timeStage(sName):
+    """ Add the wall and CPU time of the enclosed work of the current thread to the active run reports under sName,
+    for work that runs concurrently (thread pools, pipeline stages) and so can't be a stage of the progress reports """
+    if not aActiveReports:
+        yield
+        return
+    nStart = time.perf_counter()
+    nCPUStart = time.thread_time()
+    try:
+        yield
+    finally:
+        nSeconds = time.perf_counter() - nStart
+        nCPUSeconds = time.thread_time() - nCPUStart
+        with oReportsLock:
+            for oReport in aActiveReports:
+                dThread = oReport.dReport["threads"].setdefault(sName, {"calls": 0, "seconds": 0.0, "cpuSeconds": 0.0})
+                dThread["calls"] += 1
+                dThread["seconds"] += nSeconds
+                dThread["cpuSeconds"] += nCPUSeconds
+
+class RunReport:
+    """ Wall time, CPU time and peak memory of the stages of a run, saved as JSON next to its outputs.
+    The stages follow the progress reports: reportProgress is passed as the fnProgress of the run (and forwards to
+    fnProgress), a stage lasting from the first report with its name to the first report of another stage.
+    CPU time is that of the whole process, worker processes excluded. Peak memory is the peak of the Python and NumPy
+    allocations during the stage (tracemalloc, if bTraceMemory) and the peak resident set size of the process up to
+    the end of the stage. The concurrent work timed with timeStage is added up per name under "threads". """
+    def __init__(self, sCommand, dParams=None, fnProgress=None, bTraceMemory=True):
+        self.fnProgress = fnProgress
+        self.bTraceMemory = bTraceMemory
+        self.bStartedTracing = False
+        self.dStage = None
+        self.dReport = {"command": sCommand, "parameters": dParams or {}, "started": None, "status": "running",
+                        "seconds": None, "cpuSeconds": None, "peakRSSBytes": None, "stages": [], "threads": {}}
+
+    def start(self):
+        """ Start timing the run, returns the report """
+        if self.bTraceMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.bStartedTracing = True
+        self.dReport["started"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.nStart = time.perf_counter()
+        self.nCPUStart = time.process_time()
+        with oReportsLock:
+            aActiveReports.append(self)
+        return self
+
+    def reportProgress(self, nDone, nTotal, sStage):
+        """ Progress callback of the run, see reportProgress """
+        if self.dStage is None or self.dStage["name"] != sStage:
+            self.finishStage()
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            self.dStage = {"name": sStage, "start": time.perf_counter(), "cpuStart": time.process_time()}
+        reportProgress(self.fnProgress, nDone, nTotal, sStage)
+
+    def finishStage(self):
+        if self.dStage is None:
+            return
+        nNow = time.perf_counter()
+        self.dReport["stages"].append({"name": self.dStage["name"], "startSeconds": self.dStage["start"] - self.nStart,
+                                       "seconds": nNow - self.dStage["start"], "cpuSeconds": time.process_time() - self.dStage["cpuStart"],
+                                       "peakTracedBytes": tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None,
+                                       "peakRSSBytes": getPeakRSS()})
+        self.dStage = None
+
+    def finish(self, sStatus="succeeded", oError=None):
+        """ Stop timing the run, sStatus being "succeeded", "failed" or "cancelled". Returns the report as a dict. """
+        self.finishStage()
+        with oReportsLock:
+            if self in aActiveReports:
+                aActiveReports.remove(self)
+        if self.bStartedTracing:
+            tracemalloc.stop()
+            self.bStartedTracing = False
+
+        self.dReport.update(status=sStatus, seconds=time.perf_counter() - self.nStart, cpuSeconds=time.process_time() - self.nCPUStart, peakRSSBytes=getPeakRSS())
+        if oError is not None:
+            self.dReport["error"] = str(oError)
+        return self.dReport
+
+    def save(self, sPath):
+        """ Write the report to a JSON file, failing to do so doesn't fail the run """
+        try:
+            if os.path.dirname(sPath):
+                os.makedirs(os.path.dirname(sPath), exist_ok=True)
+            with open(sPath, 'w') as oFile:
+                json.dump(self.dReport, oFile, indent=2, default=str)
+        except OSError:
+            print("Run report couldn't be written: ", sPath)
+
+    def getSummary(self):
+        """ The stages and their timings as text lines """
+        def getMB(nBytes):
+            return "-" if nBytes is None else f"{nBytes / (1 << 20):.0f} MB"
+        aLines = [f"{self.dReport['command']}: {self.dReport['status']} in {self.dReport['seconds'] or 0:.2f} s "
+                  f"(CPU {self.dReport['cpuSeconds'] or 0:.2f} s, peak RSS {getMB(self.dReport['peakRSSBytes'])})"]
+        for dStage in self.dReport["stages"]:
+            aLines.append(f"    {dStage['name']}: {dStage['seconds']:.2f} s, CPU {dStage['cpuSeconds']:.2f} s, peak {getMB(dStage['peakTracedBytes'])} allocated")
+        for sName, dThread in self.dReport["threads"].items():
+            aLines.append(f"    {sName} (threads, {dThread['calls']} calls): {dThread['seconds']:.2f} s, CPU {dThread['cpuSeconds']:.2f} s")
+        return "\n".join(aLines)
+
+#################################################################
+### Methods for writing/reading calibration files ###
+def saveCameraCoef(K, D, rms, sPath):
+    """ Save camera matrix and the distortion coefficients to given path - yml file """
+
+    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_WRITE)
+
+    oFile.write("K", K)
+    oFile.write("D", D)
+    oFile.write("RMS", rms)
+
+    oFile.release()
+
+
+# Matrices of a stereo calibration file, in the order of saveStereoCoef and loadStereoCoef
+aStereoCoefNames = ["K1", "D1", "K2", "D2", "R", "T", "E", "F", "R1", "R2", "P1", "P2", "Q"]
+
+def saveStereoCoef(K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q, sPath):
+    """ Save the stereo coefficients to given path/file """
+
+    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_WRITE)
+    for sName, aMatrix in zip(aStereoCoefNames, [K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q]):
+        oFile.write(sName, aMatrix)
+    oFile.release()
+
+def readCalibrationFile(sPath):
+    """ All the values of a calibration file by name, as arrays: an OpenCV YAML/XML file as written by saveCameraCoef and
+    saveStereoCoef, a .npz archive of named matrices or a .npy file holding a Q matrix (such as Q2.npy) """
+    sExtension = os.path.splitext(sPath)[1].lower()
+    try:
+        if sExtension == ".npy":
+            return {"Q": np.load(sPath)}
+        if sExtension == ".npz":
+            with np.load(sPath) as oFile:
+                return {sName: oFile[sName] for sName in oFile.files}
+    except (OSError, ValueError) as oError:
+        raise InputError(f"Calibration file couldn't be read: {sPath}") from oError
+
+    oFile = cv2.FileStorage(sPath, cv2.FILE_STORAGE_READ)
+    if not oFile.isOpened():
+        raise InputError(f"Calibration file couldn't be read: {sPath}")
+    dMatrices = {}
+    try:
+        for sName in oFile.root().keys():
+            oNode = oFile.getNode(sName)
+            if oNode.isReal() or oNode.isInt():
+                dMatrices[sName] = np.array(oNode.real())
+            elif oNode.isMap():
+                dMatrices[sName] = oNode.mat()
+    except cv2.error as oError:
+        raise InputError(f"Calibration file couldn't be read: {sPath}") from oError
+    finally:
+        oFile.release()
+    return dMatrices
+
+def loadCalibration(sPath, aNames):
+    """ Matrices aNames of a calibration file (None for the missing ones). The file is parsed once and reused until it
+    changes (see oCalibrationCache); the returned matrices are copies, OpenCV updates some of them in place. """
+    try:
+        tKey = getFileKey(sPath)
+    except OSError as oError:
+        raise InputError(f"Calibration file couldn't be read: {sPath}") from oError
+    dMatrices = oCalibrationCache.get(tKey)
+    if dMatrices is None:
+        dMatrices = readCalibrationFile(sPath)
+        oCalibrationCache.put(tKey, dMatrices)
+    return [None if dMatrices.get(sName) is None else dMatrices[sName].copy() for sName in aNames]
+
+def loadCameraCoef(sPath):
+    """ Loads camera matrix and distortion coefficients for single camera calibration """
+    return loadCalibration(sPath, ["K", "D"])
+
+def loadQ(sPath):
+    """ Loads the Q (disparity-to-depth) matrix of a stereo calibration or custom Q file """
+    return loadCalibration(sPath, ["Q"])[0]
+
+def loadStereoCoef(sPath):
+    """ Loads coefficients for stereo calibration"""
+    return loadCalibration(sPath, aStereoCoefNames)
+
+############################################################################
+### In-memory caches ###
+class LRUCache:
+    """ Least recently used cache, bounded by a number of items and/or the total size of the numpy arrays it holds.
+    Values are arrays, lists of arrays or any other object (counted as 0 bytes). Thread safe. """
+
+    def __init__(self, nMaxItems=None, nMaxBytes=None):
+        self.nMaxItems = nMaxItems
+        self.nMaxBytes = nMaxBytes
+        self.nBytes = 0
+        self.dItems = OrderedDict()
+        self.oLock = threading.Lock()
+
+    @staticmethod
+    def getSize(oValue):
+        if isinstance(oValue, np.ndarray):
+            return oValue.nbytes
+        if isinstance(oValue, (list, tuple)):
+            return sum(LRUCache.getSize(oItem) for oItem in oValue)
+        return 0
+
+    def get(self, tKey):
+        """ Returns the cached value, None if there is none """
+        with self.oLock:
+            if tKey not in self.dItems:
+                return None
+            self.dItems.move_to_end(tKey)
+            return self.dItems[tKey]
+
+    def put(self, tKey, oValue):
+        """ Add a value, evicting the least recently used ones beyond the limits. Values bigger than nMaxBytes aren't cached. """
+        nSize = self.getSize(oValue)
+        with self.oLock:
+            if tKey in self.dItems:
+                self.nBytes -= self.getSize(self.dItems.pop(tKey))
+            if self.nMaxBytes is not None and nSize > self.nMaxBytes:
+                return
+            self.dItems[tKey] = oValue
+            self.nBytes += nSize
+            while ((self.nMaxItems is not None and len(self.dItems) > self.nMaxItems) or
+                   (self.nMaxBytes is not None and self.nBytes > self.nMaxBytes)):
+                self.nBytes -= self.getSize(self.dItems.popitem(last=False)[1])
+
+    def pop(self, tKey):
+        """ Remove and return a value, None if there is none """
+        with self.oLock:
+            oValue = self.dItems.pop(tKey, None)
+            self.nBytes -= self.getSize(oValue)
+            return oValue
+
+    def clear(self):
+        with self.oLock:
+            self.dItems.clear()
+            self.nBytes = 0
+
+def getFileKey(sPath):
+    """ Identity of a file's content for the caches: absolute path, modification time and size """
+    oStat = os.stat(sPath)
+    return (os.path.abspath(sPath), oStat.st_mtime_ns, oStat.st_size)
+
+# Parsed calibration files by file identity, so batches and parameter tuning don't parse them again on every run
+oCalibrationCache = LRUCache(nMaxItems=16)
+# Decoded (and rectified) image pairs, so parameter tuning doesn't decode the same images on every run
+oImagePairCache = LRUCache(nMaxItems=4)
+# Disparity maps by image pair and matcher parameters
+nDisparityCacheBytes = 256 << 20
+oDisparityCache = LRUCache(nMaxBytes=nDisparityCacheBytes)
+# Idle StereoSGBM matchers by parameters, a matcher is used by one thread at a time
+oSGBMMatchers = LRUCache(nMaxItems=8)
+
+############################################################################
+### Methods for stereo rectification ###
+class StereoRectifier:
+    """ Undistortion and rectification maps of a stereo calibration file. The maps are built once per image size
+    in the fixed-point CV_16SC2 format and cached on disk next to the calibration file. """
+
+    def __init__(self, sStereoParams):
+        self.sStereoParams = sStereoParams
+        with open(sStereoParams, 'rb') as oFile:
+            self.sSourceHash = hashlib.sha1(oFile.read()).hexdigest()
+        self.dMaps = {}
+
+    def getMapsPath(self, nWidth, nHeight):
+        """ Disk cache of the maps for one image size, e.g. stereoCamParams.rectify_640x480.npz """
+        return f"{os.path.splitext(self.sStereoParams)[0]}.rectify_{nWidth}x{nHeight}.npz"
+
+    def getMaps(self, nWidth, nHeight):
+        """ Returns [aLeftMap1, aLeftMap2, aRightMap1, aRightMap2] for images of the given size """
+        if (nWidth, nHeight) in self.dMaps:
+            return self.dMaps[(nWidth, nHeight)]
+
+        sMapsPath = self.getMapsPath(nWidth, nHeight)
+        aMaps = None
+        try:
+            with np.load(sMapsPath) as oFile:
+                # Only reuse maps built from the current content of the calibration file
+                if str(oFile["source"]) == self.sSourceHash:
+                    aMaps = [oFile["leftMap1"], oFile["leftMap2"], oFile["rightMap1"], oFile["rightMap2"]]
+        except (OSError, KeyError, ValueError):
+            pass
+
+        if aMaps is None:
+            K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q = loadStereoCoef(self.sStereoParams)
+            aLeftMap1, aLeftMap2 = cv2.initUndistortRectifyMap(K1, D1, R1, P1, (nWidth, nHeight), cv2.CV_16SC2)
+            aRightMap1, aRightMap2 = cv2.initUndistortRectifyMap(K2, D2, R2, P2, (nWidth, nHeight), cv2.CV_16SC2)
+            aMaps = [aLeftMap1, aLeftMap2, aRightMap1, aRightMap2]
+            try:
+                np.savez(sMapsPath, source=self.sSourceHash, leftMap1=aLeftMap1, leftMap2=aLeftMap2, rightMap1=aRightMap1, rightMap2=aRightMap2)
+            except OSError:
+                print("Rectification maps couldn't be cached: ", sMapsPath)
+
+        self.dMaps[(nWidth, nHeight)] = aMaps
+        return aMaps
+
+    def rectifyLeft(self, oImg):
+        """ Undistort and rectify an image of the left camera """
+        nHeight, nWidth = oImg.shape[:2]
+        aLeftMap1, aLeftMap2, aRightMap1, aRightMap2 = self.getMaps(nWidth, nHeight)
+        return cv2.remap(oImg, aLeftMap1, aLeftMap2, cv2.INTER_LINEAR, cv2.BORDER_CONSTANT)
+
+    def rectifyRight(self, oImg):
+        """ Undistort and rectify an image of the right camera """
+        nHeight, nWidth = oImg.shape[:2]
+        aLeftMap1, aLeftMap2, aRightMap1, aRightMap2 = self.getMaps(nWidth, nHeight)
+        return cv2.remap(oImg, aRightMap1, aRightMap2, cv2.INTER_LINEAR, cv2.BORDER_CONSTANT)
+
+dStereoRectifiers = {}
+
+def getStereoRectifier(sStereoParams):
+    """ Rectifier of a stereo calibration file, reused as long as the file isn't modified """
+    tKey = (os.path.abspath(sStereoParams), os.path.getmtime(sStereoParams))
+    if tKey not in dStereoRectifiers:
+        dStereoRectifiers[tKey] = StereoRectifier(sStereoParams)
+    return dStereoRectifiers[tKey]
+
+############################################################################
+### Methods for chessboard detection ###
+def detectChessboard(sImagePath, nChessboardW, nChessboardH, sDrawFolder=None):
+    """ Find the chessboard corners in one image and refine them to sub-pixel accuracy.
+    If sDrawFolder is given, the image with the drawn corners is written there.
+    Returns [bFound, aCorners, tImageSize, nSeconds], tImageSize being (width, height). """
+    nStart = time.perf_counter()
+
+    with timeStage("Decoding images"):
+        oImg = cv2.imread(sImagePath)
+        oBWImg = cv2.cvtColor(oImg, cv2.COLOR_BGR2GRAY)
+
+    with timeStage("Finding chessboard corners"):
+        bFound, aCorners = cv2.findChessboardCorners(oBWImg, (nChessboardW, nChessboardH), flags=nChessboardFlags)
+        if bFound:
+            aCorners = cv2.cornerSubPix(oBWImg, aCorners, (11, 11), (-1, -1), terminationCriteria)
+
+    if bFound:
+
+        if sDrawFolder is not None:
+            oImg = cv2.drawChessboardCorners(oImg, (nChessboardW, nChessboardH), aCorners, bFound)
+            cv2.imwrite(os.path.join(sDrawFolder, os.path.basename(sImagePath)), oImg)
+
+    return [bFound, aCorners, oBWImg.shape[::-1], time.perf_counter() - nStart]
+
+def getCornerCachePath(sFolderPath):
+    """ Path of the corner cache sidecar of an image folder: <folder>.corners.npz, next to the folder
+    so it doesn't show up among the calibration images """
+    return os.path.normpath(sFolderPath) + ".corners.npz"
+
+def getCornerCacheKey(sImagePath, nChessboardW, nChessboardH):
+    """ Cache key of one detection: image content hash, board size and detection flags """
+    oHash = hashlib.sha1()
+    with open(sImagePath, 'rb') as oFile:
+        for bChunk in iter(lambda: oFile.read(1 << 20), b''):
+            oHash.update(bChunk)
+    return f"{oHash.hexdigest()}_{nChessboardW}x{nChessboardH}_{nChessboardFlags}"
+
+def loadCornerCache(sFolderPath):
+    """ Load the corner cache of an image folder as a dictionary, empty if there is none or it can't be read """
+    sCachePath = getCornerCachePath(sFolderPath)
+    if not path.exists(sCachePath):
+        return {}
+    try:
+        with np.load(sCachePath) as oFile:
+            return dict(oFile)
+    except Exception:
+        print("Corner cache couldn't be read, ignoring it: ", sCachePath)
+        return {}
+
+def saveCornerCache(sFolderPath, dCache):
+    """ Write the corner cache of an image folder (compressed .npz, replaced atomically) """
+    sCachePath = getCornerCachePath(sFolderPath)
+    try:
+        with open(sCachePath + ".tmp", 'wb') as oFile:
+            np.savez_compressed(oFile, **dCache)
+        os.replace(sCachePath + ".tmp", sCachePath)
+    except OSError:
+        print("Corner cache couldn't be written: ", sCachePath)
+
+def detectChessboards(aImagePaths, nChessboardW, nChessboardH, sDrawFolder=None, nWorkers=None, bUseCache=True, fnProgress=None):
+    """ Run detectChessboard on every image in a thread pool (OpenCV releases the GIL).
+    Results are returned in input order. With bUseCache, detections are looked up in / added to the
+    corner cache of each image folder, so reruns on the same images skip the detection.
+    fnProgress(nDone, nTotal, sStage) is called after each image; if it raises, the remaining images are dropped. """
+    dCaches = {}
+    if bUseCache:
+        for sFolderPath in set(os.path.dirname(sImagePath) for sImagePath in aImagePaths):
+            dCaches[sFolderPath] = loadCornerCache(sFolderPath)
+
+    def detect(sImagePath):
+        """ Returns the detection result and the cache key if it has to be added to the cache """
+        if not bUseCache:
+            return detectChessboard(sImagePath, nChessboardW, nChessboardH, sDrawFolder), None
+
+        nStart = time.perf_counter()
+        sKey = getCornerCacheKey(sImagePath, nChessboardW, nChessboardH)
+        dCache = dCaches[os.path.dirname(sImagePath)]
+        if "corners_" + sKey in dCache:
+            aCorners = dCache["corners_" + sKey]
+            bFound = aCorners.size > 0
+            return [bFound, aCorners if bFound else None, tuple(int(n) for n in dCache["size_" + sKey]), time.perf_counter() - nStart], None
+
+        return detectChessboard(sImagePath, nChessboardW, nChessboardH, sDrawFolder), sKey
+
+    aResults = []
+    with ThreadPoolExecutor(max_workers=nWorkers) as oPool:
+        try:
+            for aResult in tqdm(oPool.map(detect, aImagePaths), total=len(aImagePaths), desc = "Detecting chessboards"):
+                aResults.append(aResult)
+                if fnProgress is not None:
+                    fnProgress(len(aResults), len(aImagePaths), "Detecting chessboards")
+        except BaseException:
+            oPool.shutdown(cancel_futures=True)
+            raise
+
+    # Add the new detections to the cache, images without chessboard are stored with no corners
+    aChangedFolders = set()
+    for sImagePath, (aResult, sKey) in zip(aImagePaths, aResults):
+        if sKey is not None:
+            bFound, aCorners, tImageSize, nSeconds = aResult
+            sFolderPath = os.path.dirname(sImagePath)
+            dCaches[sFolderPath]["corners_" + sKey] = aCorners if bFound else np.empty(0, np.float32)
+            dCaches[sFolderPath]["size_" + sKey] = np.array(tImageSize)
+            aChangedFolders.add(sFolderPath)
+    for sFolderPath in aChangedFolders:
+        saveCornerCache(sFolderPath, dCaches[sFolderPath])
+
+    return [aResult for aResult, sKey in aResults]
+
+############################################################################
+### Methods for writing/opening PLY files with MeshLab ###
+# Viewer the PLY files are opened with, the REKON_MESHLAB environment variable overrides it
+sMeshLabPath = os.environ.get("REKON_MESHLAB") or (r"C:\Program Files\VCG\MeshLab\meshlab.exe" if sys.platform == "win32" else "meshlab")
+
+def openMeshLab(sPath, sViewer=None):
+    """ Open the file in MeshLab (sViewer, sMeshLabPath by default) without waiting for the viewer to start.
+    Returns the thread launching it; a viewer that can't be started is only reported on stdout. """
+    sViewer = sViewer or sMeshLabPath
+
+    def launch():
+        try:
+            subprocess.Popen([sViewer, sPath], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as oError:
+            print(f"Viewer couldn't be started ({sViewer}): {oError}")
+
+    # Not a daemon: a CLI run ending right after the export still waits for the viewer to be spawned (not for it to start)
+    oThread = threading.Thread(target=launch, name="MeshLab launcher")
+    oThread.start()
+    return oThread
+
+# Vertex layout of the PLY files: float xyz followed by uchar rgb, little-endian
+aPLYVertexType = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("red", "u1"), ("green", "u1"), ("blue", "u1")])
+nPLYChunkSize = 1 << 20
+
+def writePLYRecords(oFile, aRecords, sFormat="binary_little_endian"):
+    """ Append aPLYVertexType records to a PLY file opened in binary mode, after its header """
+    if sFormat == "binary_little_endian":
+        aRecords.tofile(oFile)
+    else:
+        np.savetxt(oFile, aRecords, '%f %f %f %d %d %d')
+
+def getPLYHeader(nVertices, sFormat="binary_little_endian"):
+    """ Header of a PLY file of nVertices colored vertices """
+    if sFormat not in ("binary_little_endian", "ascii"):
+        raise ValueError(f"Unsupported PLY format: {sFormat}")
+
+    sPLYHeader = ("ply\n"
+                  f"format {sFormat} 1.0\n"
+                  f"element vertex {nVertices}\n"
+                  "property float x\n"
+                  "property float y\n"
+                  "property float z\n"
+                  "property uchar red\n"
+                  "property uchar green\n"
+                  "property uchar blue\n"
+                  "end_header\n")
+    return sPLYHeader.encode("ascii")
+
+def writePLY(sPath, aVertices, aColors=None, sFormat="binary_little_endian", nChunkSize=nPLYChunkSize, bOpenViewer=True, sViewer=None, fnWritten=None):
+    """ Write colored vertices to a PLY file, nChunkSize vertices at a time.
+    aVertices is either an aPLYVertexType array (aColors None), written as is, or N x 3 points with N x 3 colors.
+    sFormat is "binary_little_endian" (default, packed vertex records) or "ascii".
+    Once the file is closed, fnWritten(sPath) is called and, with bOpenViewer, the file is opened in
+    the sViewer executable (see openMeshLab) without waiting for it. """
+    bRecords = aVertices.dtype == aPLYVertexType
+    if not bRecords:
+        aVertices = aVertices.reshape(-1,3)
+        aColors = aColors.reshape(-1,3)
+    nVertices = len(aVertices)
+
+    sPLYHeader = getPLYHeader(nVertices, sFormat)
+
+    with open(sPath, 'wb') as oFile:
+        oFile.write(sPLYHeader)
+
+        if sFormat == "binary_little_endian" and not bRecords:
+            aChunk = np.empty(min(nChunkSize, nVertices), aPLYVertexType)
+        for nStart in range(0, nVertices, nChunkSize):
+            nStop = min(nStart + nChunkSize, nVertices)
+            if bRecords:
+                writePLYRecords(oFile, aVertices[nStart:nStop], sFormat)
+            elif sFormat == "binary_little_endian":
+                # Fill the packed records field by field, no intermediate copy of the whole cloud
+                aRecords = aChunk[:nStop - nStart]
+                aRecords["x"] = aVertices[nStart:nStop, 0]
+                aRecords["y"] = aVertices[nStart:nStop, 1]
+                aRecords["z"] = aVertices[nStart:nStop, 2]
+                aRecords["red"] = aColors[nStart:nStop, 0]
+                aRecords["green"] = aColors[nStart:nStop, 1]
+                aRecords["blue"] = aColors[nStart:nStop, 2]
+                aRecords.tofile(oFile)
+            else:
+                np.savetxt(oFile, np.hstack([aVertices[nStart:nStop], aColors[nStart:nStop]]), '%f %f %f %d %d %d')
+
+    if fnWritten is not None:
+        fnWritten(sPath)
+    if bOpenViewer:
+        openMeshLab(sPath, sViewer)
+
+############################################################################
+### Point cloud filtering ###
+# Offsets of a voxel and its 26 neighbours
+aVoxelNeighbours = np.array([(nX, nY, nZ) for nX in (-1, 0, 1) for nY in (-1, 0, 1) for nZ in (-1, 0, 1)])
+# Voxel sizes tried to fit a point cloud into its point budget, before dropping points at random,
+# the search stops once the budget is filled to nBudgetFill
+nBudgetSteps = 6
+nBudgetFill = 0.9
+
+def getCloudXYZ(aCloud):
+    """ N x 3 float64 coordinates of an aPLYVertexType array """
+    return np.stack([aCloud["x"], aCloud["y"], aCloud["z"]], axis=1).astype(np.float64)
+
+def getVoxelKeys(aXYZ, nVoxelSize):
+    """ Integer key of the cubic voxel of side nVoxelSize of each of the N x 3 points.
+    Returns [aPointKeys, aStrides], aStrides being the key offsets of a step along x, y and z. """
+    aIndex = np.floor(aXYZ / nVoxelSize).astype(np.int64)
+    aIndex -= aIndex.min(axis=0) - 1  # Margin of one voxel, so the neighbours of every voxel get distinct keys
+    aDims = aIndex.max(axis=0) + 2
+    if np.prod(aDims.astype(np.float64)) >= 2**62:
+        raise InputError(f"Voxel size {nVoxelSize:g} is too small for the extent of the point cloud, "
+                         "limit its depth range or use a bigger voxel size.")
+    aStrides = np.array([aDims[1] * aDims[2], aDims[2], 1])
+    return [aIndex[:, 0] * aStrides[0] + aIndex[:, 1] * aStrides[1] + aIndex[:, 2], aStrides]
+
+def getVoxels(aXYZ, nVoxelSize):
+    """ Group N x 3 points by cubic voxel of side nVoxelSize.
+    Returns [aKeys, aInverse, aCounts, aStrides]: the sorted keys of the occupied voxels, the voxel of each point
+    (index into aKeys), the number of points of each voxel and the key offsets of a step along x, y and z. """
+    aPointKeys, aStrides = getVoxelKeys(aXYZ, nVoxelSize)
+    aKeys, aInverse, aCounts = np.unique(aPointKeys, return_inverse=True, return_counts=True)
+    return [aKeys, aInverse.ravel(), aCounts, aStrides]
+
+def getPointSpacing(aCloud):
+    """ Rough distance between neighbouring points, assuming they sample a surface spanning the two biggest
+    extents (2nd to 98th percentile) of the cloud """
+    if len(aCloud) < 2:
+        return 1.0
+    aExtents = np.sort([np.subtract(*np.percentile(aCloud[sField], [98, 2])) for sField in ("x", "y", "z")])
+    nSpacing = np.sqrt(aExtents[1] * aExtents[2] / len(aCloud))
+    return float(nSpacing) if nSpacing > 0 else 1.0
+
+def filterDepthRange(aCloud, nMinDepth=None, nMaxDepth=None):
+    """ Points with finite coordinates and a depth (|z|) within [nMinDepth, nMaxDepth], the bounds being optional """
+    aDepth = np.abs(aCloud["z"])
+    aMask = np.isfinite(aCloud["x"]) & np.isfinite(aCloud["y"]) & np.isfinite(aDepth)
+    if nMinDepth is not None:
+        aMask &= aDepth >= nMinDepth
+    if nMaxDepth is not None:
+        aMask &= aDepth <= nMaxDepth
+    return aCloud[aMask]
+
+def downsampleVoxelGrid(aCloud, nVoxelSize):
+    """ Replace the points of each voxel of side nVoxelSize by their centroid, colored with their average color """
+    if len(aCloud) == 0:
+        return aCloud
+    aKeys, aInverse, aCounts, aStrides = getVoxels(getCloudXYZ(aCloud), nVoxelSize)
+
+    aDownsampled = np.empty(len(aKeys), aPLYVertexType)
+    for sField in ("x", "y", "z"):
+        aDownsampled[sField] = np.bincount(aInverse, aCloud[sField], len(aKeys)) / aCounts
+    for sField in ("red", "green", "blue"):
+        aDownsampled[sField] = np.rint(np.bincount(aInverse, aCloud[sField], len(aKeys)) / aCounts)
+    return aDownsampled
+
+def getDisparitySpace(aCloud, Q):
+    """ Image column, row and disparity of the points reprojected with Q, as N x 3 float64. Stereo points get sparser with
+    the square of their depth but are evenly spread in this space, one per pixel. """
+    try:
+        aInverseQ = np.linalg.inv(np.asarray(Q, np.float64))
+    except np.linalg.LinAlgError as oError:
+        raise InputError(f"Q matrix is not invertible: {oError}") from oError
+    aXYZW = np.hstack([getCloudXYZ(aCloud), np.ones((len(aCloud), 1))]) @ aInverseQ.T
+    return aXYZW[:, :3] / aXYZW[:, 3:]
+
+def removeOutliers(aCloud, Q, nRadius=3, nStdRatio=2.0):
+    """ Statistical outlier removal: count the points in the voxel (of side nRadius pixels, in disparity space, see
+    getDisparitySpace) of every point and in the 26 around it, and drop the points whose count is more than nStdRatio
+    standard deviations below the mean count: the disparity speckles matched apart from any surface """
+    if len(aCloud) == 0:
+        return aCloud
+    aKeys, aInverse, aCounts, aStrides = getVoxels(getDisparitySpace(aCloud, Q), nRadius)
+
+    # Neighbour counts of each occupied voxel, looking the 27 neighbour keys up in the sorted keys
+    aNeighbourCounts = np.zeros(len(aKeys), np.int64)
+    for nOffset in aVoxelNeighbours @ aStrides:
+        aIndex = np.minimum(np.searchsorted(aKeys, aKeys + nOffset), len(aKeys) - 1)
+        aFound = aKeys[aIndex] == aKeys + nOffset
+        aNeighbourCounts[aFound] += aCounts[aIndex[aFound]]
+
+    aPointCounts = aNeighbourCounts[aInverse]
+    return aCloud[aPointCounts >= aPointCounts.mean() - nStdRatio * aPointCounts.std()]
+
+def filterPointCloud(aCloud, Q, nMinDepth=None, nMaxDepth=None, nOutlierStdRatio=None, nOutlierRadius=3, nVoxelSize=None, nMaxPoints=None):
+    """ Clean up and shrink a point cloud (aPLYVertexType array) reprojected with Q before it's written:
+    - drop the points outside of [nMinDepth, nMaxDepth] and the ones at infinity (see filterDepthRange)
+    - with nOutlierStdRatio, drop the isolated points (see removeOutliers)
+    - with nVoxelSize, merge the points of each voxel (see downsampleVoxelGrid)
+    - with nMaxPoints, merge them with the smallest voxel size found leaving at most nMaxPoints, dropping points at
+      random if the search didn't find one """
+    aCloud = filterDepthRange(aCloud, nMinDepth, nMaxDepth)
+
+    if (nOutlierStdRatio):
+        aCloud = removeOutliers(aCloud, Q, nOutlierRadius, nOutlierStdRatio)
+
+    aFiltered = downsampleVoxelGrid(aCloud, nVoxelSize) if nVoxelSize else aCloud
+    if not nMaxPoints or len(aFiltered) <= nMaxPoints:
+        return aFiltered
+
+    # Search the smallest voxel size within the budget by counting the occupied voxels: from the point spacing (or
+    # nVoxelSize), scaled as for points on a surface, their number falling with the square of the voxel size,
+    # then bisected once the budget is bracketed
+    aXYZ = getCloudXYZ(aCloud)
+    nSize = nVoxelSize or getPointSpacing(aCloud)
+    nTooSmall = nBigEnough = None
+    for nStep in range(nBudgetSteps):
+        nCount = len(np.unique(getVoxelKeys(aXYZ, nSize)[0]))
+        if nCount > nMaxPoints:
+            nTooSmall = nSize
+        else:
+            nBigEnough = nSize
+            if nCount >= nBudgetFill * nMaxPoints:
+                break
+        if nTooSmall is not None and nBigEnough is not None:
+            nSize = np.sqrt(nTooSmall * nBigEnough)
+        elif nBigEnough is None:
+            nSize *= np.clip(np.sqrt(nCount / nMaxPoints), 1.05, 4)
+        else:
+            nSize *= np.clip(np.sqrt(nCount / nMaxPoints), 0.25, 0.95)
+    aFiltered = downsampleVoxelGrid(aCloud, nBigEnough or nTooSmall)
+    if len(aFiltered) <= nMaxPoints:
+        return aFiltered
+
+    aKeep = np.sort(np.random.default_rng(0).choice(len(aFiltered), nMaxPoints, replace=False))
+    return aFiltered[aKeep]
+
+############################################################################
+### Methods for SAD block matching ###
+# Image channels the SAD engine can match on
+aSADChannels = ["gray", "blue", "green", "red", "color"]
+
+def selectSADChannels(aImg, sChannels="gray"):
+    """ uint8 image the SAD engine matches on, from a BGR image: grayscale, one of its channels or all three ("color") """
+    if sChannels not in aSADChannels:
+        raise ValueError(f"Unknown SAD channels: {sChannels}")
+    if aImg.ndim == 2 or sChannels == "color":
+        return aImg
+    if sChannels == "gray":
+        return cv2.cvtColor(aImg, cv2.COLOR_BGR2GRAY)
+    return np.ascontiguousarray(aImg[:, :, aSADChannels.index(sChannels) - 1])
+
+def getSADCostType(nChannels, nBlockSize):
+    """ Smallest integer type holding the SAD of a block with its maximum kept free as the "no match" cost """
+    return np.int16 if 255 * nChannels * nBlockSize**2 < np.iinfo(np.int16).max else np.int32
+
+def computeBlockSumsSAD(aLeftImg, aRightImg, nShift, nBlockSize, oCostType):
+    """ SAD of the blocks of the left columns [nStartCol, nStopCol) that can be matched for one candidate disparity.
+    Returns [nStartCol, nStopCol, aBlockSum], aBlockSum[nRow, nCol - nStartCol] being the SAD of the block anchored at (nRow, nCol). """
+    nWidth = aLeftImg.shape[1]
+
+    # Left columns whose left block is inside the border and whose right block fits in the right image
+    nStartCol = max(nBlockSize, -nShift)
+    nStopCol = min(nWidth - nBlockSize, nWidth - nBlockSize - nShift + 1)
+    if nStartCol >= nStopCol:
+        return [nStartCol, nStopCol, None]
+
+    # Absolute differences for the whole frame at once (uint8), summed over the channels
+    nLastCol = nStopCol + nBlockSize - 1
+    aAbsDiff = cv2.absdiff(aLeftImg[:, nStartCol:nLastCol], aRightImg[:, nStartCol + nShift:nLastCol + nShift])
+    if aAbsDiff.ndim == 3:
+        aAbsDiff = aAbsDiff.sum(axis=2, dtype=np.uint16)
+
+    # Box filter anchored at the top-left corner sums each block, like aImg[nRow:nRow+nBlockSize, nCol:nCol+nBlockSize]
+    nDepth = cv2.CV_16S if oCostType == np.int16 else cv2.CV_32S
+    aBlockSum = cv2.boxFilter(aAbsDiff, nDepth, (nBlockSize, nBlockSize), anchor=(0, 0), normalize=False)
+    return [nStartCol, nStopCol, aBlockSum]
+
+def copyWhere(aDst, aSrc, aMask):
+    """ np.copyto(aDst, aSrc, where=aMask) for 2D arrays of the same type, aSrc possibly a scalar. OpenCV's masked copy
+    is vectorized, numpy's branches on every element and is an order of magnitude slower on the irregular masks of
+    the matching. """
+    if np.isscalar(aSrc):
+        aSrc = np.full(aDst.shape, aSrc, aDst.dtype)
+    cv2.copyTo(aSrc, aMask.view(np.uint8), aDst)
+
+def keepBestSAD(aCost, aBestCost, aDisparity, nShift, aBetter, aNeighbourCosts=None, aPreviousCost=None):
+    """ Make the signed shift nShift, of cost aCost, the best match of the pixels of aBetter, in place.
+    aNeighbourCosts = [aCostBelow, aCostAbove] then follow the costs of the shifts just below and above the best one,
+    the candidates being tried in increasing order and aPreviousCost being the cost of nShift - 1 (the maximum of the
+    cost type where it's unknown, as the cost above is until the next shift is tried). """
+    if aNeighbourCosts is not None:
+        aCostBelow, aCostAbove = aNeighbourCosts
+        copyWhere(aCostAbove, aCost, aDisparity == nShift - 1)
+        copyWhere(aCostBelow, aPreviousCost, aBetter)
+        copyWhere(aCostAbove, np.iinfo(aCostAbove.dtype).max, aBetter)
+    copyWhere(aBestCost, aCost, aBetter)
+    copyWhere(aDisparity, nShift, aBetter)
+
+def fitSubpixelSAD(aDisparity, aBestCost, aCostBelow, aCostAbove):
+    """ Sub-pixel disparity: vertex of the parabola through the costs of the best shift and of its two neighbours,
+    at most half a pixel away. Pixels whose neighbours weren't both matched keep their integer shift.
+    Returns the signed shift as float32. """
+    nMax = np.iinfo(aBestCost.dtype).max
+    aBelow = aCostBelow.astype(np.float32)
+    aAbove = aCostAbove.astype(np.float32)
+    aCurvature = aBelow + aAbove - 2 * aBestCost.astype(np.float32)
+    aFit = (aCostBelow < nMax) & (aCostAbove < nMax) & (aCurvature > 0)
+
+    aOffset = np.divide(aBelow - aAbove, 2 * aCurvature, out=np.zeros_like(aCurvature), where=aFit)
+    return aDisparity + np.clip(aOffset, -0.5, 0.5)
+
+def computeDisparitySAD(aLeftImg, aRightImg, nBlockSize=5, nSearchBlockSize=56, bShowProgress=True, fnProgress=None, bSigned=False, bSubpixel=False):
+    """ Cost-volume SAD block matching of uint8 images (grayscale, one channel or color, see selectSADChannels).
+    The right image is shifted once per candidate disparity in [-nSearchBlockSize, nSearchBlockSize) and the best
+    (first, on ties) candidate is kept for every pixel, costs being accumulated in int16 (int32 for big blocks).
+    Returns the absolute column offset of the best match as int16 (signed with bSigned), or with bSubpixel refined to a
+    fraction of a pixel as float32 (see fitSubpixelSAD); pixels closer than nBlockSize to the border stay 0.
+    fnProgress(nDone, nTotal, sStage) is called after each candidate disparity. """
+    nHeight, nWidth = aLeftImg.shape[:2]
+    oCostType = getSADCostType(aLeftImg.shape[2] if aLeftImg.ndim == 3 else 1, nBlockSize)
+    nMaxCost = np.iinfo(oCostType).max
+
+    aBestCost = np.full((nHeight, nWidth), nMaxCost, oCostType)
+    aDisparity = np.zeros((nHeight, nWidth), np.int16)
+    aNeighbourCosts = aPreviousCost = None
+    if (bSubpixel):
+        aNeighbourCosts = [aBestCost.copy(), aBestCost.copy()]
+        aPreviousCost = aBestCost.copy()  # Cost slice of the previous shift, over the whole frame
+
+    for nShift in tqdm(range(-nSearchBlockSize, nSearchBlockSize), desc = "Computing depth map", disable = not bShowProgress):
+        nStartCol, nStopCol, aBlockSum = computeBlockSumsSAD(aLeftImg, aRightImg, nShift, nBlockSize, oCostType)
+        if aBlockSum is not None:
+            # Only the pixels that can be matched, in place
+            tRegion = np.s_[nBlockSize:nHeight - nBlockSize, nStartCol:nStopCol]
+            aCost = aBlockSum[nBlockSize:nHeight - nBlockSize, :nStopCol - nStartCol]
+            aBetter = aCost < aBestCost[tRegion]
+            if (bSubpixel):
+                keepBestSAD(aCost, aBestCost[tRegion], aDisparity[tRegion], nShift, aBetter,
+                            [aNeighbourCosts[0][tRegion], aNeighbourCosts[1][tRegion]], aPreviousCost[tRegion])
+            else:
+                keepBestSAD(aCost, aBestCost[tRegion], aDisparity[tRegion], nShift if bSigned else abs(nShift), aBetter)
+        if (bSubpixel):
+            aPreviousCost.fill(nMaxCost)
+            if aBlockSum is not None:
+                aPreviousCost[tRegion] = aCost
+
+        if fnProgress is not None:
+            fnProgress(nShift + nSearchBlockSize + 1, 2 * nSearchBlockSize, "Computing depth map")
+
+    if (bSubpixel):
+        aDisparity = fitSubpixelSAD(aDisparity, aBestCost, *aNeighbourCosts)
+        if not (bSigned):
+            np.abs(aDisparity, out=aDisparity)
+    return aDisparity
+
+def matchTileSAD(aLeftImg, aRightImg, aBestCost, aDisparity, tTile, nBlockSize, nMinShift, nMaxShift, aTileEstimate=None, nRadius=0, aUnrestricted=None, aNeighbourCosts=None):
+    """ SAD matching of the block anchors of tTile = (nStartRow, nStopRow, nStartCol, nStopCol) over the signed shifts
+    nMinShift .. nMaxShift, updating aBestCost and aDisparity in place (costs, bounds and ties of computeDisparitySAD).
+    With aTileEstimate, a pixel only takes the shifts within nRadius of its estimate; aUnrestricted, a list of cost and
+    disparity arrays, then gets the best of all the shifts. With aNeighbourCosts, the costs of the shifts around the best
+    one are followed as well (see keepBestSAD), aUnrestricted then holding its own two neighbour cost arrays. """
+    nWidth = aLeftImg.shape[1]
+    nDepth = cv2.CV_16S if aBestCost.dtype == np.int16 else cv2.CV_32S
+    nStartRow, nStopRow, nTileStart, nTileStop = tTile
+    tTileRegion = np.s_[nStartRow:nStopRow, nTileStart:nTileStop]
+    nMaxCost = np.iinfo(aBestCost.dtype).max
+    if aNeighbourCosts is not None:
+        aTileCost = np.full((nStopRow - nStartRow, nTileStop - nTileStart), nMaxCost, aBestCost.dtype)
+        aPreviousCost = aTileCost.copy()
+
+    for nShift in range(nMinShift, nMaxShift + 1):
+        # Anchors whose right block fits in the right image
+        nStartCol = max(nTileStart, -nShift)
+        nStopCol = min(nTileStop, nWidth - nBlockSize - nShift + 1)
+        if aNeighbourCosts is not None:
+            aTileCost, aPreviousCost = aPreviousCost, aTileCost
+            aTileCost.fill(nMaxCost)
+        if nStartCol >= nStopCol:
+            continue
+
+        nLastRow = nStopRow + nBlockSize - 1
+        nLastCol = nStopCol + nBlockSize - 1
+        aAbsDiff = cv2.absdiff(aLeftImg[nStartRow:nLastRow, nStartCol:nLastCol], aRightImg[nStartRow:nLastRow, nStartCol + nShift:nLastCol + nShift])
+        if aAbsDiff.ndim == 3:
+            aAbsDiff = aAbsDiff.sum(axis=2, dtype=np.uint16)
+        aCost = cv2.boxFilter(aAbsDiff, nDepth, (nBlockSize, nBlockSize), anchor=(0, 0), normalize=False)[:nStopRow - nStartRow, :nStopCol - nStartCol]
+
+        if aNeighbourCosts is None:
+            tRegion = np.s_[nStartRow:nStopRow, nStartCol:nStopCol]
+            aPrevious = None
+        else:
+            # The whole tile, so pixels whose neighbour shift can't be matched get the maximum cost as their neighbour cost
+            aTileCost[:, nStartCol - nTileStart:nStopCol - nTileStart] = aCost
+            aCost = aTileCost
+            tRegion = tTileRegion
+            aPrevious = aPreviousCost
+
+        if aUnrestricted is not None:
+            aBest = aUnrestricted[0][tRegion]
+            aBetter = aCost < aBest
+            keepBestSAD(aCost, aBest, aUnrestricted[1][tRegion], nShift, aBetter,
+                        None if aNeighbourCosts is None else [aUnrestricted[2][tRegion], aUnrestricted[3][tRegion]], aPrevious)
+
+        aBetter = aCost < aBestCost[tRegion]
+        if aTileEstimate is not None:
+            nOffset = tRegion[1].start - nTileStart
+            aBetter &= np.abs(aTileEstimate[:, nOffset:nOffset + aBetter.shape[1]] - nShift) <= nRadius
+        keepBestSAD(aCost, aBestCost[tRegion], aDisparity[tRegion], nShift, aBetter,
+                    None if aNeighbourCosts is None else [aNeighbourCosts[0][tRegion], aNeighbourCosts[1][tRegion]], aPrevious)
+
+def getTilesSAD(nHeight, nWidth, nBlockSize):
+    """ Tiles (nStartRow, nStopRow, nStartCol, nStopCol) of nPyramidTileSize block anchors covering the matchable pixels """
+    return [(nStartRow, min(nStartRow + nPyramidTileSize, nHeight - nBlockSize), nStartCol, min(nStartCol + nPyramidTileSize, nWidth - nBlockSize))
+            for nStartRow in range(nBlockSize, nHeight - nBlockSize, nPyramidTileSize)
+            for nStartCol in range(nBlockSize, nWidth - nBlockSize, nPyramidTileSize)]
+
+def refineDisparitySAD(aLeftImg, aRightImg, aEstimate, nBlockSize=5, nSearchBlockSize=56, nRadius=2, bReturnCost=False, nMaxDiff=None, bSubpixel=False):
+    """ SAD matching restricted to the candidates aEstimate - nRadius .. aEstimate + nRadius around a per-pixel estimate
+    of the signed shift. The image is processed in tiles of nPyramidTileSize pixels, each one searching only the shifts
+    its pixels need, so the cost follows the local spread of the estimate rather than the search range.
+    With nMaxDiff, a pixel whose cost is higher by more than nMaxDiff than the best one among all the shifts searched in
+    its tile takes that one instead (its estimate was wrong). Costs, bounds and ties are those of computeDisparitySAD.
+    Returns the signed shift as int16 (float32 refined to a fraction of a pixel with bSubpixel, see fitSubpixelSAD),
+    0 where nothing could be matched, and with bReturnCost [aDisparity, aBestCost], unmatched pixels having the maximum
+    cost of its type. """
+    nHeight, nWidth = aLeftImg.shape[:2]
+    oCostType = getSADCostType(aLeftImg.shape[2] if aLeftImg.ndim == 3 else 1, nBlockSize)
+
+    aBestCost = np.full((nHeight, nWidth), np.iinfo(oCostType).max, oCostType)
+    aDisparity = np.zeros((nHeight, nWidth), np.int16)
+    aNeighbourCosts = [aBestCost.copy(), aBestCost.copy()] if bSubpixel else None
+    aUnrestricted = None if nMaxDiff is None else [aBestCost.copy(), aDisparity.copy()] + ([aBestCost.copy(), aBestCost.copy()] if bSubpixel else [])
+
+    for tTile in getTilesSAD(nHeight, nWidth, nBlockSize):
+        nStartRow, nStopRow, nStartCol, nStopCol = tTile
+        # Outliers of the estimate are pulled into the range of most of the tile, so they don't widen its search
+        aTileEstimate = aEstimate[nStartRow:nStopRow, nStartCol:nStopCol]
+        nLow, nHigh = np.percentile(aTileEstimate, [nPyramidOutliers, 100 - nPyramidOutliers])
+        aTileEstimate = np.clip(aTileEstimate, int(np.floor(nLow)), int(np.ceil(nHigh)))
+
+        nMinShift = max(-nSearchBlockSize, int(aTileEstimate.min()) - nRadius)
+        nMaxShift = min(nSearchBlockSize - 1, int(aTileEstimate.max()) + nRadius)
+        matchTileSAD(aLeftImg, aRightImg, aBestCost, aDisparity, tTile, nBlockSize, nMinShift, nMaxShift, aTileEstimate, nRadius, aUnrestricted, aNeighbourCosts)
+
+    if aUnrestricted is not None:
+        aWrong = aBestCost.astype(np.int32) - aUnrestricted[0] > nMaxDiff
+        np.copyto(aBestCost, aUnrestricted[0], where=aWrong)
+        np.copyto(aDisparity, aUnrestricted[1], where=aWrong)
+        if (bSubpixel):
+            np.copyto(aNeighbourCosts[0], aUnrestricted[2], where=aWrong)
+            np.copyto(aNeighbourCosts[1], aUnrestricted[3], where=aWrong)
+
+    if (bSubpixel):
+        aDisparity = fitSubpixelSAD(aDisparity, aBestCost, *aNeighbourCosts)
+
+    if bReturnCost:
+        return [aDisparity, aBestCost]
+    return aDisparity
+
+# Candidates searched around the upsampled estimate at each level of the SAD pyramid, tile size of that search
+# and percentage of the estimates at each end of a tile's range that are clipped as outliers
+nPyramidRadius = 2
+nPyramidTileSize = 128
+nPyramidOutliers = 5
+
+def smoothDisparityEstimate(aDisparity, nBlockSize=5):
+    """ Signed SAD disparity prepared as the estimate of refineDisparitySAD: the border left unmatched takes the
+    disparity of the nearest matched pixels, and a median removes the isolated mismatches. """
+    nHeight, nWidth = aDisparity.shape
+    if nHeight > 2 * nBlockSize and nWidth > 2 * nBlockSize:
+        aDisparity = cv2.copyMakeBorder(aDisparity[nBlockSize:-nBlockSize, nBlockSize:-nBlockSize], nBlockSize, nBlockSize, nBlockSize, nBlockSize, cv2.BORDER_REPLICATE)
+    return cv2.medianBlur(aDisparity.astype(np.float32), 5).astype(np.int16)
+
+def computeDisparitySADPyramid(aLeftImg, aRightImg, nBlockSize=5, nSearchBlockSize=56, nLevels=2, fnProgress=None, bSigned=False, bSubpixel=False):
+    """ Coarse-to-fine SAD matching: full search on the images downscaled nLevels times by 2, then at each finer level
+    only nPyramidRadius candidates around the doubled estimate of the level below (refineDisparitySAD).
+    An approximation of computeDisparitySAD whose cost hardly depends on nSearchBlockSize.
+    Returns the absolute shift as int16, or the signed one if bSigned; with bSubpixel, the full resolution level is
+    refined to a fraction of a pixel and the shift is float32. """
+    aLeftPyramid = [aLeftImg]
+    aRightPyramid = [aRightImg]
+    for nLevel in range(nLevels):
+        aLeftPyramid.append(cv2.pyrDown(aLeftPyramid[-1]))
+        aRightPyramid.append(cv2.pyrDown(aRightPyramid[-1]))
+
+    nTopSearch = max(1, -(-nSearchBlockSize // 2**nLevels))
+    aDisparity = computeDisparitySAD(aLeftPyramid[-1], aRightPyramid[-1], nBlockSize, nTopSearch, bShowProgress=False, bSigned=True, bSubpixel=bSubpixel and nLevels == 0)
+    reportProgress(fnProgress, 1, nLevels + 1, "Computing depth map")
+
+    for nLevel in range(nLevels - 1, -1, -1):
+        nHeight, nWidth = aLeftPyramid[nLevel].shape[:2]
+        aEstimate = 2 * cv2.resize(smoothDisparityEstimate(aDisparity, nBlockSize), (nWidth, nHeight), interpolation=cv2.INTER_NEAREST)
+        aDisparity = refineDisparitySAD(aLeftPyramid[nLevel], aRightPyramid[nLevel], aEstimate, nBlockSize, -(-nSearchBlockSize // 2**nLevel), nPyramidRadius, bSubpixel=bSubpixel and nLevel == 0)
+        reportProgress(fnProgress, nLevels + 1 - nLevel, nLevels + 1, "Computing depth map")
+
+    if (bSigned):
+        return aDisparity
+    return np.abs(aDisparity)
+
+def createSharedArray(aArray):
+    """ Copy an array to a new shared memory block. Returns the block and its (name, shape, dtype) descriptor. """
+    oMem = shared_memory.SharedMemory(create=True, size=max(aArray.nbytes, 1))
+    aShared = np.ndarray(aArray.shape, dtype=aArray.dtype, buffer=oMem.buf)
+    aShared[:] = aArray
+    return oMem, (oMem.name, aArray.shape, aArray.dtype.str)
+
+def attachSharedArray(tDescriptor):
+    """ Attach to a shared memory block created by createSharedArray. Returns the block and an array view on it. """
+    sName, tShape, sDtype = tDescriptor
+    oMem = shared_memory.SharedMemory(name=sName)
+    return oMem, np.ndarray(tShape, dtype=np.dtype(sDtype), buffer=oMem.buf)
+
+def computeBandSAD(tLeftImg, tRightImg, tDisparity, nStartRow, nStopRow, nBlockSize=5, nSearchBlockSize=56, bSubpixel=False):
+    """ Process pool worker: compute rows [nStartRow, nStopRow) of the SAD disparity map.
+    Images are read from shared memory; the band is padded by nBlockSize rows on each side so its rows
+    are computed exactly as in a full-frame run, then written to the shared disparity map. """
+    oLeftMem, aLeftImg = attachSharedArray(tLeftImg)
+    oRightMem, aRightImg = attachSharedArray(tRightImg)
+    oDisparityMem, aDisparity = attachSharedArray(tDisparity)
+    try:
+        nHeight = aLeftImg.shape[0]
+        nPadStart = max(0, nStartRow - nBlockSize)
+        nPadStop = min(nHeight, nStopRow + nBlockSize)
+
+        aBand = computeDisparitySAD(aLeftImg[nPadStart:nPadStop], aRightImg[nPadStart:nPadStop], nBlockSize, nSearchBlockSize, bShowProgress=False, bSubpixel=bSubpixel)
+        aDisparity[nStartRow:nStopRow] = aBand[nStartRow - nPadStart:nStopRow - nPadStart]
+    finally:
+        del aLeftImg, aRightImg, aDisparity
+        oLeftMem.close()
+        oRightMem.close()
+        oDisparityMem.close()
+
+# Row bands per worker, more bands than workers give finer progress and cancellation
+nBandsPerWorker = 4
+
+def computeDisparitySADParallel(aLeftImg, aRightImg, nBlockSize=5, nSearchBlockSize=56, nWorkers=1, fnProgress=None, nPyramidLevels=0, bSubpixel=False):
+    """ Split the SAD matching into horizontal row bands computed by a pool of nWorkers processes.
+    The result is identical to computeDisparitySAD whatever the number of workers.
+    With nPyramidLevels, the coarse-to-fine computeDisparitySADPyramid is used instead, in this process.
+    With bSubpixel, the disparity is refined to a fraction of a pixel and returned as float32.
+    fnProgress(nDone, nTotal, sStage) is called after each band; if it raises, the pending bands are dropped. """
+    if nPyramidLevels > 0:
+        return computeDisparitySADPyramid(aLeftImg, aRightImg, nBlockSize, nSearchBlockSize, nPyramidLevels, fnProgress, bSubpixel=bSubpixel)
+
+    nHeight, nWidth = aLeftImg.shape[:2]
+    nWorkers = max(1, min(nWorkers, nHeight))
+    if nWorkers == 1:
+        return computeDisparitySAD(aLeftImg, aRightImg, nBlockSize, nSearchBlockSize, fnProgress=fnProgress, bSubpixel=bSubpixel)
+
+    nBands = min(nWorkers * nBandsPerWorker, nHeight)
+    aRowBounds = np.linspace(0, nHeight, nBands + 1).astype(int)
+    aSharedMem = []
+    try:
+        oLeftMem, tLeftImg = createSharedArray(aLeftImg)
+        aSharedMem.append(oLeftMem)
+        oRightMem, tRightImg = createSharedArray(aRightImg)
+        aSharedMem.append(oRightMem)
+        oDisparityType = np.float32 if bSubpixel else np.int16
+        oDisparityMem, tDisparity = createSharedArray(np.zeros((nHeight, nWidth), oDisparityType))
+        aSharedMem.append(oDisparityMem)
+
+        with ProcessPoolExecutor(max_workers=nWorkers) as oPool:
+            aFutures = [oPool.submit(computeBandSAD, tLeftImg, tRightImg, tDisparity, nStartRow, nStopRow, nBlockSize, nSearchBlockSize, bSubpixel)
+                        for nStartRow, nStopRow in zip(aRowBounds[:-1], aRowBounds[1:])]
+            try:
+                for nDone, oFuture in enumerate(tqdm(as_completed(aFutures), total=len(aFutures), desc = "Computing depth map"), 1):
+                    oFuture.result()
+                    if fnProgress is not None:
+                        fnProgress(nDone, len(aFutures), "Computing depth map")
+            except BaseException:
+                oPool.shutdown(cancel_futures=True)
+                raise
+
+        aDisparity = np.ndarray((nHeight, nWidth), dtype=oDisparityType, buffer=oDisparityMem.buf).copy()
+    finally:
+        for oMem in aSharedMem:
+            oMem.close()
+            oMem.unlink()
+
+    return aDisparity
+
+
+############################################################################
+### Calibration ###
+def calibrateCamera(sFolderPath, nSquareSize=0.025, nChessboardW=8, nChessboardH=5, sDrawFolder=None, fnProgress=None):
+    """ Single camera calibration using chessboard pattern. Compute RMS, camera matrix, distortion coefficients, rotation and translation vectors.
+    Returns [True, nRMS, aCameraMatrix, aDistorsionCoef, aRotation, aTranslation], or [False] if the calibration failed. """
+    # Array of object 3D points - intersection of squares in the chessboard
+    # (0,0,0), (1,0,0), ... etc
+    aObjectPoints = np.zeros((nChessboardH*nChessboardW, 3), np.float32)
+    aObjectPoints[:, :2] = np.mgrid[0:nChessboardW, 0:nChessboardH].T.reshape(-1, 2)
+
+    aObjectPoints = aObjectPoints * nSquareSize  # Real world coordinates using the nChessboard & nChessboardH of one square
+
+    aSpacePoints = []  # 3D points
+    aImagePoints = []  # 2D points
+
+    aPaths = os.listdir(sFolderPath)
+    nImages = 0
+
+    try:
+        aDetections = detectChessboards([os.path.join(sFolderPath, sImageName) for sImageName in aPaths], nChessboardW, nChessboardH, sDrawFolder=sDrawFolder, fnProgress=fnProgress)
+
+        for sImageName, (bFound, aCornersAcc, tImageSize, nSeconds) in zip(aPaths, aDetections):
+            # If found, add object points, image points (refined in detectChessboard)
+            if bFound:
+                aSpacePoints.append(aObjectPoints)
+                aImagePoints.append(aCornersAcc)
+
+                print(f"Chessboard found in {sImageName}! ({nSeconds:.2f} s)")
+                nImages+=1
+            else:
+                print(f"Chessboard couldn't be detected in  {sImageName}! ({nSeconds:.2f} s)")
+
+        if (nImages > 15):
+            reportProgress(fnProgress, 0, 0, "Calibrating")
+            nRMS, aCameraMatrix, aDistorsionCoef, aRotation, aTranslation = cv2.calibrateCamera(aSpacePoints, aImagePoints, tImageSize, None, None)
+            return [True, nRMS, aCameraMatrix, aDistorsionCoef, aRotation, aTranslation]
+        else:
+            return [False]
+    except JobCancelled:
+        raise
+    except:
+        print("An error occured in single camera calibration")
+        return [False]
+
+def calibrateStereo(sLeftFile, sRightFile, sLeftFolderPath, sRightFolderPath, nSquareSize=0.025, nChessboardW=9, nChessboardH=6, fnProgress=None):
+    """ Stereo camera calibration using chessboard pattern, on top of the single camera calibration files sLeftFile and sRightFile.
+    Returns [K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q]. """
+    # Get images from folders
+    aLeftImgs = os.listdir(sLeftFolderPath);
+    aRightImgs = os.listdir(sRightFolderPath);
+
+    if len(aLeftImgs) != len(aRightImgs):
+        print("The number of left images doesn't match the number of right images. Images can't be paired.")
+        print("Left images count: ", len(aLeftImgs))
+        print("Right images count: ", len(aRightImgs))
+        raise InputError("The number of left files doesn't match the number of right files. Images can't be paired.")
+
+    # Array of object 3D points - intersection of squares in the chessboard
+    # (0,0,0), (1,0,0), ... etc
+    aObjectPoints = np.zeros((nChessboardH * nChessboardW, 3), np.float32)
+    aObjectPoints[:, :2] = np.mgrid[0 : nChessboardW, 0 : nChessboardH].T.reshape(-1, 2)
+
+    aObjectPoints = aObjectPoints * nSquareSize  # Real world coordinates using the nChessboard & nChessboardH of one square
+
+    aSpacePoints = []  # 3D points in real world space
+    aLeftPoints = []  # 2D points in left image plane.
+    aRightPoints = []  # 2D points in right image plane.
+
+    # Pair the images for single loop handling
+    aPairedImages = zip(aLeftImgs, aRightImgs)  
+
+    # Iterate through the pairs and find chessboard corners. Add points to corresponding arrays
+    # If openCV can't find the corners, discard the pair.
+    nImages = 0
+    # Detect the corners of all left and right images in one pool, results come back in input order
+    aDetections = detectChessboards([os.path.join(sLeftFolderPath, sLeftImg) for sLeftImg in aLeftImgs] +
+                                    [os.path.join(sRightFolderPath, sRightImg) for sRightImg in aRightImgs], nChessboardW, nChessboardH, fnProgress=fnProgress)
+    aLeftDetections = aDetections[:len(aLeftImgs)]
+    aRightDetections = aDetections[len(aLeftImgs):]
+
+    for (sLeftImg, sRightImg), aLeftDetection, aRightDetection in zip(aPairedImages, aLeftDetections, aRightDetections):
+        bFoundL, aCornersLAcc, tLeftSize, nSecondsL = aLeftDetection
+        bFoundR, aCornersRAcc, tRightSize, nSecondsR = aRightDetection
+        ##TODO check shape
+
+        if bFoundL and bFoundR: # Chessboard found in both images
+            nImages +=1
+            # 3D points
+            aSpacePoints.append(aObjectPoints)
+            
+            # Right 2D points
+            aRightPoints.append(aCornersRAcc)
+
+            # Left 2D points
+            aLeftPoints.append(aCornersLAcc)
+            print("Chessboard found in image pair: ", sLeftImg, " and ", sRightImg, f"({nSecondsL:.2f} s, {nSecondsR:.2f} s)")
+
+        else:
+            print("Chessboard couldn't be detected in image pair: ", sLeftImg, " and ", sRightImg, f"({nSecondsL:.2f} s, {nSecondsR:.2f} s)")
+
+    w,h = tRightSize
+    K1, D1 = loadCameraCoef(sLeftFile)
+    K2, D2 = loadCameraCoef(sRightFile)
+
+    if (nImages > 15):
+        reportProgress(fnProgress, 0, 0, "Calibrating")
+        nRMS, K1, D1, K2, D2, R, T, E, F = cv2.stereoCalibrate(aSpacePoints, aLeftPoints, aRightPoints, K1, D1, K2, D2, (w,h), flags=cv2.CALIB_FIX_INTRINSIC | cv2.CALIB_SAME_FOCAL_LENGTH)
+        print("Stereo calibration RMS: ", nRMS)
+        R1, R2, P1, P2, Q, roiLeft, roiRigth = cv2.stereoRectify(K1, D1, K2, D2, (w,h), R, T, flags=cv2.CALIB_ZERO_DISPARITY, alpha=0)
+
+        ##Show recfified images to make sure everything's ok
+        # sLeftImg = aLeftImgs[0]
+        # sRightImg = aRightImgs[0]
+
+        # oLeftImg = cv2.imread(os.path.join(sLeftFolderPath, sLeftImg))
+        # cv2.imshow("Left ", oLeftImg)
+        # cv2.waitKey()
+
+        # oRightImg = cv2.imread(os.path.join(sRightFolderPath, sRightImg))
+        # cv2.imshow("Right", oRightImg)
+        # cv2.waitKey()
+
+
+        # aLeftMapX, aLeftMapY = cv2.initUndistortRectifyMap(K1, D1, R1, P1, (w,h), cv2.CV_32FC1)
+        # oLeftRectified = cv2.remap(oLeftImg, aLeftMapX, aLeftMapY, cv2.INTER_LINEAR)
+        # cv2.imshow("Left rectified", oLeftRectified)
+        # cv2.imwrite("rectified/" + sLeftImg, oLeftRectified)
+        # cv2.waitKey()
+                
+
+        # aRightMapX, aRightMapY = cv2.initUndistortRectifyMap(K2, D2, R2, P2, (w,h), cv2.CV_32FC1)
+        # oRightRectified = cv2.remap(oRightImg, aRightMapX, aRightMapY, cv2.INTER_LINEAR)
+        # cv2.imshow("Right rectified", oRightRectified)
+        # cv2.imwrite("rectified/" + sRightImg, oRightRectified)
+        # cv2.waitKey()
+
+        return [K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q]
+    else:
+        raise ValueError('Not enough image pairs')
+
+############################################################################
+### Depth maps and point clouds ###
+def loadImagePair(sStereoParams, sLeftPath, sRightPath, bRectify=False, bGray=False):
+    """ Read an image pair, rectified with the stereo calibration file if bRectify and converted to grayscale if bGray.
+    Pairs are cached in memory by file identity, the returned arrays are read-only. """
+    tKey = (getFileKey(sLeftPath), getFileKey(sRightPath), getFileKey(sStereoParams) if bRectify else None, bGray)
+    aPair = oImagePairCache.get(tKey)
+    if aPair is not None:
+        return list(aPair)
+
+    if (bGray):
+        oLeftImg, oRightImg = loadImagePair(sStereoParams, sLeftPath, sRightPath, bRectify)
+        aPair = [cv2.cvtColor(oLeftImg, cv2.COLOR_BGR2GRAY), cv2.cvtColor(oRightImg, cv2.COLOR_BGR2GRAY)]
+    else:
+        with timeStage("Decoding images"):
+            oLeftImg = cv2.imread(sLeftPath)
+            oRightImg = cv2.imread(sRightPath)
+        if oLeftImg is None or oRightImg is None:
+            raise InputError("Images couldn't be read.")
+
+        # Undistortion and rectification, maps are built once per calibration file and image size
+        if (bRectify):
+            with timeStage("Rectifying"):
+                oRectifier = getStereoRectifier(sStereoParams)
+                oLeftImg, oRightImg = oRectifier.rectifyLeft(oLeftImg), oRectifier.rectifyRight(oRightImg)
+        aPair = [oLeftImg, oRightImg]
+
+    for oImg in aPair:
+        oImg.flags.writeable = False
+    oImagePairCache.put(tKey, aPair)
+    return list(aPair)
+
+def computeDepthMapSGBM(sStereoParams, sLeftImg, sRightImg, nWindowSize=3,nMinDisparity=-1, nNumDisparities=80, nDisp12MaxDiff=12, nUniquenessRatio=10, nSpeckleWindowSize=150, nSpeckleRange=2, nPreFilterCap=63, sMode=cv2.STEREO_SGBM_MODE_SGBM_3WAY, nPyramidLevels=0, bRectify=False, fnProgress=None):
+    """ Compute SGBM depth map from image pair and stereo calibration coefficients.
+    Returns [aDisparity, Q], the disparity being normalized to 0..255. fnProgress(nDone, nTotal, sStage) reports the current stage. """
+    reportProgress(fnProgress, 0, 0, "Loading images")
+
+    K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q = loadStereoCoef(sStereoParams)  # Get cams params
+
+    # Repeating a configuration on the same images, e.g. when only the Q file changed, skips the matching
+    tParams = (nWindowSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode, nPyramidLevels)
+    tKey = ("sgbm", getFileKey(sLeftImg), getFileKey(sRightImg), getFileKey(sStereoParams) if bRectify else None, tParams)
+    aDisparity = oDisparityCache.get(tKey)
+    if aDisparity is not None:
+        return [aDisparity.copy(), Q]
+
+    # Grayscale images
+    oBWLeft, oBWRight = loadImagePair(sStereoParams, sLeftImg, sRightImg, bRectify, bGray=True)
+
+    if (oBWLeft.shape != oBWRight.shape):
+        print("Images don't have the same size")
+        raise InputError("Images don't have the same size.")
+
+    # cv2.imshow("Left rectified", oLeftRectified)
+    # cv2.imwrite( sLeftImg + "rectified.jpg" , oLeftRectified)
+    # cv2.waitKey()
+            
+    # cv2.imshow("Right rectified", oRightRectified)
+    # cv2.imwrite(sRightImg + "rectified.jpg", oRightRectified)
+    # cv2.waitKey()
+
+    reportProgress(fnProgress, 0, 0, "Computing depth map")
+    disparity_map = computeDisparitySGBM(oBWLeft, oBWRight, nWindowSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode, nPyramidLevels=nPyramidLevels)
+    oDisparityCache.put(tKey, disparity_map.copy())
+
+    return [disparity_map, Q]
+
+# Width of the downscaled images of the SGBM preview
+nPreviewWidth = 480
+
+def computePreviewSGBM(sStereoParams, sLeftImg, sRightImg, nWindowSize=3, nMinDisparity=-1, nNumDisparities=80, nDisp12MaxDiff=12, nUniquenessRatio=10, nSpeckleWindowSize=150, nSpeckleRange=2, nPreFilterCap=63, sMode=cv2.STEREO_SGBM_MODE_SGBM_3WAY, bRectify=False, nWidth=nPreviewWidth):
+    """ Quick SGBM depth map of an image pair downscaled to nWidth pixels wide, for tuning the parameters.
+    The parameters measured in pixels (disparities, left-right difference, speckle window area and range) are scaled
+    with the images, so the preview looks like the full resolution depth map. Returns it normalized to 0..255 as uint8. """
+    if nNumDisparities <= 0 or nNumDisparities % 16:
+        raise InputError("numDisparities has to be a positive multiple of 16.")
+
+    # Only the matching runs again when a parameter changes, the decoded images are cached
+    tParams = (nWindowSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode, nWidth)
+    tKey = ("sgbm preview", getFileKey(sLeftImg), getFileKey(sRightImg), getFileKey(sStereoParams) if bRectify else None, tParams)
+    aPreview = oDisparityCache.get(tKey)
+    if aPreview is not None:
+        return aPreview.copy()
+
+    oBWLeft, oBWRight = loadImagePair(sStereoParams, sLeftImg, sRightImg, bRectify, bGray=True)
+    if (oBWLeft.shape != oBWRight.shape):
+        raise InputError("Images don't have the same size.")
+
+    nHeight, nFullWidth = oBWLeft.shape
+    nScale = min(1.0, nWidth / nFullWidth)
+    tSize = (max(1, round(nFullWidth * nScale)), max(1, round(nHeight * nScale)))
+    oSmallLeft = cv2.resize(oBWLeft, tSize, interpolation=cv2.INTER_AREA)
+    oSmallRight = cv2.resize(oBWRight, tSize, interpolation=cv2.INTER_AREA)
+
+    # Negative or zero values turn the checks off, they're kept as they are
+    def scale(nValue, nFactor=nScale):
+        return int(np.ceil(nValue * nFactor)) if nValue > 0 else nValue
+    nSmallNum = max(16, -(-scale(nNumDisparities) // 16) * 16)
+    aDisparity = computeDisparitySGBM(oSmallLeft, oSmallRight, nWindowSize, int(np.floor(nMinDisparity * nScale)), nSmallNum, scale(nDisp12MaxDiff),
+                                      nUniquenessRatio, scale(nSpeckleWindowSize, nScale**2), scale(nSpeckleRange), nPreFilterCap, sMode)
+    aPreview = np.uint8(aDisparity)
+    oDisparityCache.put(tKey, aPreview.copy())
+    return aPreview
+
+def computeDisparitySGBM(oBWLeft, oBWRight, nWindowSize=3, nMinDisparity=-1, nNumDisparities=80, nDisp12MaxDiff=12, nUniquenessRatio=10, nSpeckleWindowSize=150, nSpeckleRange=2, nPreFilterCap=63, sMode=cv2.STEREO_SGBM_MODE_SGBM_3WAY, bNormalize=True, nPyramidLevels=0):
+    """ SGBM disparity of a grayscale image pair, normalized to 0..255 unless bNormalize is False (raw 16 x disparity).
+    With nPyramidLevels, the disparity range of the scene is first estimated on the images downscaled nPyramidLevels
+    times by 2 and the full resolution search is narrowed to it (see narrowDisparityRangeSGBM). """
+    if nPyramidLevels > 0:
+        nNarrowMin, nNarrowNum = narrowDisparityRangeSGBM(oBWLeft, oBWRight, nWindowSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode, nPyramidLevels)
+        disparity_map = computeDisparitySGBM(oBWLeft, oBWRight, nWindowSize, nNarrowMin, nNarrowNum, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode, bNormalize=False)
+        # Unmatched pixels get the value of the full range search, so the normalization is the same
+        disparity_map[disparity_map == (nNarrowMin - 1) * 16] = (nMinDisparity - 1) * 16
+        if (bNormalize):
+            cv2.normalize(src=disparity_map, dst=disparity_map, beta=0, alpha=255, norm_type=cv2.NORM_MINMAX)
+        return disparity_map
+
+    # Matchers are kept by parameters and reused, only one thread uses a matcher at a time
+    tParams = (nWindowSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode)
+    aIdleMatchers = oSGBMMatchers.pop(tParams) or []
+    oLeftMatcher = aIdleMatchers.pop() if aIdleMatchers else None
+    if aIdleMatchers:
+        oSGBMMatchers.put(tParams, aIdleMatchers)
+
+    if oLeftMatcher is None:
+        # SGBM parameters 
+        oLeftMatcher = cv2.StereoSGBM_create(
+            minDisparity=nMinDisparity,
+            numDisparities=nNumDisparities,  # max_disp has to be dividable by 16 f. E. HH 192, 256
+            blockSize=nWindowSize,
+            P1=8 * 2 * nWindowSize**2,
+            P2=32 * 2 * nWindowSize**2,
+            disp12MaxDiff=nDisp12MaxDiff,
+            uniquenessRatio=nUniquenessRatio,
+            speckleWindowSize=nSpeckleWindowSize,
+            speckleRange=nSpeckleRange,
+            preFilterCap=nPreFilterCap,
+            mode=sMode
+        )
+    
+    disparity_map = oLeftMatcher.compute(oBWLeft, oBWRight)
+    oSGBMMatchers.put(tParams, (oSGBMMatchers.pop(tParams) or []) + [oLeftMatcher])
+
+    if (bNormalize):
+        oFilteredImg = cv2.normalize(src=disparity_map, dst=disparity_map, beta=0, alpha=255, norm_type=cv2.NORM_MINMAX);
+
+    # The depth map is normalized in place, it can be displayed as uint8
+    return disparity_map
+
+# Disparities (at full resolution) added around the range estimated at the top of the SGBM pyramid
+nPyramidMargin = 8
+
+def narrowDisparityRangeSGBM(oBWLeft, oBWRight, nWindowSize=3, nMinDisparity=-1, nNumDisparities=80, nDisp12MaxDiff=12, nUniquenessRatio=10, nSpeckleWindowSize=150, nSpeckleRange=2, nPreFilterCap=63, sMode=cv2.STEREO_SGBM_MODE_SGBM_3WAY, nLevels=2):
+    """ Disparity range of the scene, from an SGBM run on the images downscaled nLevels times by 2 (0.5 and 99.5
+    percentiles of the matched pixels, plus a margin). Returns [nMinDisparity, nNumDisparities] within the given range,
+    the number of disparities being a multiple of 16 as SGBM requires. """
+    oSmallLeft, oSmallRight = oBWLeft, oBWRight
+    for nLevel in range(nLevels):
+        oSmallLeft, oSmallRight = cv2.pyrDown(oSmallLeft), cv2.pyrDown(oSmallRight)
+
+    nScale = 2**nLevels
+    nSmallMin = nMinDisparity // nScale
+    nSmallNum = -(-nNumDisparities // nScale) + 1
+    nSmallNum = -(-nSmallNum // 16) * 16  # SGBM needs a multiple of 16
+    aSmall = computeDisparitySGBM(oSmallLeft, oSmallRight, nWindowSize, nSmallMin, nSmallNum, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, sMode, bNormalize=False)
+
+    aMatched = aSmall[aSmall > (nSmallMin - 1) * 16]
+    return fitDisparityRange(aMatched * (nScale / 16), nMinDisparity, nNumDisparities)
+
+def fitDisparityRange(aDisparities, nMinDisparity=-1, nNumDisparities=80):
+    """ SGBM search range covering the 0.5 to 99.5 percentiles of the disparities (in pixels at full resolution) of the
+    matched pixels, plus nPyramidMargin. Returns [nMinDisparity, nNumDisparities] within the given range, the number of
+    disparities being a multiple of 16 as SGBM requires. """
+    if aDisparities.size == 0:
+        return [nMinDisparity, nNumDisparities]
+    nLow, nHigh = np.percentile(aDisparities, [0.5, 99.5])
+
+    nMaxDisparity = nMinDisparity + nNumDisparities
+    nNarrowMin = max(nMinDisparity, int(np.floor(nLow)) - nPyramidMargin)
+    nNarrowMax = min(nMaxDisparity, int(np.ceil(nHigh)) + nPyramidMargin + 1)
+    nNarrowNum = -(-(nNarrowMax - nNarrowMin) // 16) * 16
+    if nNarrowNum >= nNumDisparities:
+        return [nMinDisparity, nNumDisparities]
+    # The rounding up to 16 mustn't go past the configured range
+    nNarrowMin = min(nNarrowMin, nMaxDisparity - nNarrowNum)
+    return [nNarrowMin, nNarrowNum]
+
+def computeDepthMapSAD(aLeftImg, aRightImg, nBlockSize=5, nSearchBlockSize=56, nWorkers=1, fnProgress=None, sChannels="gray", nPyramidLevels=0, bSubpixel=True):
+    """ SAD depth map of a BGR uint8 image pair matched on sChannels (see selectSADChannels), as float32 disparities
+    refined to a fraction of a pixel (see fitSubpixelSAD), or whole pixel int16 ones without bSubpixel.
+    With nPyramidLevels, the coarse-to-fine search is used (see computeDisparitySADPyramid).
+    fnProgress(nDone, nTotal, sStage) reports the progress. """
+
+    if aLeftImg.shape != aRightImg.shape:
+        print("Images don't have the same size")
+        raise InputError("Images don't have the same size.")
+
+    # Shift the right image once per candidate disparity instead of comparing blocks pixel by pixel,
+    # split in row bands over nWorkers processes
+    return computeDisparitySADParallel(selectSADChannels(aLeftImg, sChannels), selectSADChannels(aRightImg, sChannels), nBlockSize, nSearchBlockSize, nWorkers, fnProgress, nPyramidLevels, bSubpixel)
+
+# Pixels reprojected at once (in whole rows), bounds the size of the temporary coordinate arrays
+nReprojectPixels = 1 << 20
+
+def reprojectPointCloud(aDisparity, Q, aColors, nRowOffset=0, nThreshold=None):
+    """ Reproject the valid pixels of a depth map (disparity above nThreshold, by default its minimum) to 3D, like
+    cv2.reprojectImageTo3D but only for those pixels and in float32, band by band. aColors is the RGB image the disparity
+    was computed on. For a strip of a bigger depth map, nRowOffset is the image row of its first row.
+    Returns the colored points as an aPLYVertexType array, ready for writePLY. """
+    nHeight, nWidth = aDisparity.shape
+    aMask = aDisparity > (aDisparity.min() if nThreshold is None else nThreshold)
+    aCloud = np.empty(np.count_nonzero(aMask), aPLYVertexType)
+    Q = np.asarray(Q, np.float32)
+
+    nBandRows = max(1, nReprojectPixels // nWidth)
+    nStop = 0
+    for nStartRow in range(0, nHeight, nBandRows):
+        aRows, aCols = np.nonzero(aMask[nStartRow:nStartRow + nBandRows])
+        aRows += nStartRow
+        nStart, nStop = nStop, nStop + len(aRows)
+        if nStart == nStop:
+            continue
+
+        # [X Y Z W] = Q [x y d 1], the point being (X/W, Y/W, Z/W), 0 where W is 0 as in OpenCV
+        aX = aCols.astype(np.float32)
+        aY = (aRows + nRowOffset).astype(np.float32)
+        aD = aDisparity[aRows, aCols].astype(np.float32)
+        aW = Q[3, 0] * aX + Q[3, 1] * aY + Q[3, 2] * aD + Q[3, 3]
+        aInvW = np.divide(1, aW, out=np.zeros_like(aW), where=aW != 0)
+
+        aRecords = aCloud[nStart:nStop]
+        for nAxis, sField in enumerate(("x", "y", "z")):
+            aRecords[sField] = (Q[nAxis, 0] * aX + Q[nAxis, 1] * aY + Q[nAxis, 2] * aD + Q[nAxis, 3]) * aInvW
+        for nChannel, sField in enumerate(("red", "green", "blue")):
+            aRecords[sField] = aColors[aRows, aCols, nChannel]
+
+    return aCloud
+
+def writePointCloud(sOutputPath, aDisparity, Q, sStereoParams, sLeftPath, sRightPath, sQFilePath='', bRectify=False, bOpenViewer=True, fnProgress=None, sViewer=None, dCloudFilter=None):
+    """ Reproject the valid pixels of a depth map to 3D and write them, colored from the left image, to a PLY file.
+    dCloudFilter are keyword arguments of filterPointCloud, applied to the points before they're written. """
+    reportProgress(fnProgress, 0, 0, "Reprojecting")
+    # Colors have to line up with the (rectified) left image the disparity was computed on, it's usually still cached
+    aColors = loadImagePair(sStereoParams, sLeftPath, sRightPath, bRectify)[0][..., ::-1]
+
+    if (sQFilePath):
+        Q = loadQ(sQFilePath)
+    print(Q)
+
+    aCloud = reprojectPointCloud(aDisparity, Q, aColors)
+    if (dCloudFilter):
+        reportProgress(fnProgress, 0, 0, "Filtering point cloud")
+        aCloud = filterPointCloud(aCloud, Q, **dCloudFilter)
+
+    reportProgress(fnProgress, 0, 0, "Writing PLY")
+    writePLY(sOutputPath, aCloud, bOpenViewer=bOpenViewer, sViewer=sViewer)
+
+def reconstructSGBM(sStereoParams, sLeftPath, sRightPath, sQFilePath='', sOutputPath="reconstructed.ply", nWindowSize=3, nMinDisparity=-1, nNumDisparities=80, nDisp12MaxDiff=12, nUniquenessRatio=10, nSpeckleWindowSize=150, nSpeckleRange=2, nPreFilterCap=63, nPyramidLevels=0, bRectify=False, bOpenViewer=True, fnProgress=None, sViewer=None, dCloudFilter=None):
+    """ SGBM depth map and point cloud of an image pair. Returns the depth map. """
+    aDisparity, Q = computeDepthMapSGBM(sStereoParams, sLeftPath, sRightPath, nWindowSize, nMinDisparity, nNumDisparities, nDisp12MaxDiff, nUniquenessRatio, nSpeckleWindowSize, nSpeckleRange, nPreFilterCap, nPyramidLevels=nPyramidLevels, bRectify=bRectify, fnProgress=fnProgress)
+    writePointCloud(sOutputPath, aDisparity, Q, sStereoParams, sLeftPath, sRightPath, sQFilePath, bRectify, bOpenViewer, fnProgress, sViewer, dCloudFilter)
+    return aDisparity
+
+def reconstructSAD(sStereoParams, sLeftPath, sRightPath, sQFilePath='', sOutputPath="reconstructed.ply", nBlockSize=5, nSearchBlockSize=56, nWorkers=1, sChannels="gray", nPyramidLevels=0, bSubpixel=True, bRectify=False, bOpenViewer=True, fnProgress=None, sViewer=None, dCloudFilter=None):
+    """ SAD depth map and point cloud of an image pair, matched on sChannels (see selectSADChannels), with sub-pixel
+    disparities unless bSubpixel is False. Returns the depth map. """
+    reportProgress(fnProgress, 0, 0, "Loading images")
+    K1, D1, K2, D2, R, T, E, F, R1, R2, P1, P2, Q = loadStereoCoef(sStereoParams)  # Get cams params
+
+    oLeftRectified, oRightRectified = loadImagePair(sStereoParams, sLeftPath, sRightPath, bRectify)
+
+    aDisparity = computeDepthMapSAD(oLeftRectified, oRightRectified, nBlockSize, nSearchBlockSize, nWorkers, fnProgress, sChannels, nPyramidLevels, bSubpixel)
+
+    writePointCloud(sOutputPath, aDisparity, Q, sStereoParams, sLeftPath, sRightPath, sQFilePath, bRectify, bOpenViewer, fnProgress, sViewer, dCloudFilter)
+    return aDisparity
+
+############################################################################
+### Batch reconstruction pipeline ###
+oPipelineEnd = object()  # Marks the end of the items in the pipeline queues
+
+def runPipeline(aItems, aStages, nQueueSize=4, fnProgress=None):
+    """ Pass every item through aStages, a list of (sName, fnStage) applied in order.
+    Every stage but the last runs on its own thread and hands its results to the next one through a bounded
+    queue of nQueueSize items, so the stages overlap while only a few items are in memory at once.
+    The last stage runs on the calling thread and fnProgress(nDone, nTotal, sStage) is called after each item;
+    if a stage or fnProgress raises, the other stages are stopped and the exception is re-raised.
+    Returns the busy time of each stage as {sName: nSeconds}. """
+    oStop = threading.Event()
+    dSeconds = {sName: 0.0 for sName, fnStage in aStages}
+    aErrors = []
+    aQueues = [queue.Queue(nQueueSize) for _ in aStages[:-1]]  # aQueues[i] feeds stage i+1
+
+    def put(oQueue, oItem):
+        """ Blocking put that gives up once the pipeline is stopped """
+        while not oStop.is_set():
+            try:
+                oQueue.put(oItem, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(oQueue):
+        """ Blocking get that returns oPipelineEnd once the pipeline is stopped """
+        while not oStop.is_set():
+            try:
+                return oQueue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return oPipelineEnd
+
+    def getInput(nStage):
+        if nStage == 0:
+            return iter(aItems)
+        return iter(lambda: get(aQueues[nStage - 1]), oPipelineEnd)
+
+    def runStage(nStage):
+        sName, fnStage = aStages[nStage]
+        try:
+            for oItem in getInput(nStage):
+                if oStop.is_set():
+                    return
+                nStart = time.perf_counter()
+                with timeStage(sName):
+                    oResult = fnStage(oItem)
+                dSeconds[sName] += time.perf_counter() - nStart
+                if not put(aQueues[nStage], oResult):
+                    return
+            put(aQueues[nStage], oPipelineEnd)
+        except BaseException as oError:
+            aErrors.append(oError)
+            oStop.set()
+
+    aThreads = [threading.Thread(target=runStage, args=(nStage,), daemon=True) for nStage in range(len(aStages) - 1)]
+    for oThread in aThreads:
+        oThread.start()
+
+    sName, fnStage = aStages[-1]
+    try:
+        for nDone, oItem in enumerate(getInput(len(aStages) - 1), 1):
+            nStart = time.perf_counter()
+            with timeStage(sName):
+                fnStage(oItem)
+            dSeconds[sName] += time.perf_counter() - nStart
+            reportProgress(fnProgress, nDone, len(aItems), sName)
+    except BaseException:
+        oStop.set()
+        raise
+    finally:
+        for oThread in aThreads:
+            oThread.join()
+
+    if aErrors:
+        raise aErrors[0]
+    return dSeconds
+
+def pairImageFolders(sLeftFolderPath, sRightFolderPath):
+    """ Pair the images of a left and a right folder by sorted file name. Returns [(sLeftPath, sRightPath)]. """
+    aLeftImgs = sorted(os.listdir(sLeftFolderPath))
+    aRightImgs = sorted(os.listdir(sRightFolderPath))
+
+    if len(aLeftImgs) != len(aRightImgs):
+        print("Left images count: ", len(aLeftImgs))
+        print("Right images count: ", len(aRightImgs))
+        raise InputError("The number of left files doesn't match the number of right files. Images can't be paired.")
+
+    return [(os.path.join(sLeftFolderPath, sLeftImg), os.path.join(sRightFolderPath, sRightImg)) for sLeftImg, sRightImg in zip(aLeftImgs, aRightImgs)]
+
+def reconstructBatch(sStereoParams, sLeftFolderPath, sRightFolderPath, sOutputFolder, sAlgorithm="sgbm", dMatcherParams=None, sQFilePath='', bRectify=False, nQueueSize=4, fnProgress=None, dCloudFilter=None):
+    """ Reconstruct every image pair of a left and a right folder to <sOutputFolder>/<left image name>.ply.
+    The pairs go through a pipeline of decode, rectify, disparity, reproject and PLY write stages running concurrently.
+    dMatcherParams are keyword arguments of computeDisparitySGBM (sAlgorithm "sgbm") or computeDepthMapSAD ("sad"),
+    dCloudFilter the ones of filterPointCloud, applied in the reproject stage.
+    Returns {"pairs", "seconds", "pairsPerSecond", "stages": {sStage: nBusySeconds}}. """
+    if sAlgorithm not in ("sgbm", "sad"):
+        raise ValueError(f"Unknown stereo matching algorithm: {sAlgorithm}")
+    dMatcherParams = dMatcherParams or {}
+
+    aPairs = pairImageFolders(sLeftFolderPath, sRightFolderPath)
+    os.makedirs(sOutputFolder, exist_ok=True)
+
+    Q = loadQ(sQFilePath if sQFilePath else sStereoParams)
+    if (bRectify):
+        oRectifier = getStereoRectifier(sStereoParams)
+
+    def decode(tPair):
+        sLeftPath, sRightPath = tPair
+        oLeftImg = cv2.imread(sLeftPath)
+        oRightImg = cv2.imread(sRightPath)
+        if oLeftImg is None or oRightImg is None:
+            raise InputError(f"Images couldn't be read: {sLeftPath}, {sRightPath}")
+        if oLeftImg.shape != oRightImg.shape:
+            raise InputError(f"Images don't have the same size: {sLeftPath}, {sRightPath}")
+        sName = os.path.splitext(os.path.basename(sLeftPath))[0]
+        return [os.path.join(sOutputFolder, sName + ".ply"), oLeftImg, oRightImg]
+
+    def rectify(aPair):
+        sOutputPath, oLeftImg, oRightImg = aPair
+        if (bRectify):
+            oLeftImg, oRightImg = oRectifier.rectifyLeft(oLeftImg), oRectifier.rectifyRight(oRightImg)
+        return [sOutputPath, oLeftImg, oRightImg]
+
+    def match(aPair):
+        sOutputPath, oLeftImg, oRightImg = aPair
+        if sAlgorithm == "sgbm":
+            aDisparity = computeDisparitySGBM(cv2.cvtColor(oLeftImg, cv2.COLOR_BGR2GRAY), cv2.cvtColor(oRightImg, cv2.COLOR_BGR2GRAY), **dMatcherParams)
+        else:
+            aDisparity = computeDepthMapSAD(oLeftImg, oRightImg, **dMatcherParams)
+        return [sOutputPath, oLeftImg, aDisparity]
+
+    def reproject(aPair):
+        sOutputPath, oLeftImg, aDisparity = aPair
+        aCloud = reprojectPointCloud(aDisparity, Q, oLeftImg[..., ::-1])
+        if (dCloudFilter):
+            aCloud = filterPointCloud(aCloud, Q, **dCloudFilter)
+        return [sOutputPath, aCloud]
+
+    def write(aItem):
+        sOutputPath, aCloud = aItem
+        writePLY(sOutputPath, aCloud, bOpenViewer=False)
+
+    nStart = time.perf_counter()
+    dStageSeconds = runPipeline(aPairs, [("Decoding", decode), ("Rectifying", rectify), ("Computing depth map", match),
+                                         ("Reprojecting", reproject), ("Writing PLY", write)], nQueueSize, fnProgress)
+    nSeconds = time.perf_counter() - nStart
+
+    nPairsPerSecond = len(aPairs) / nSeconds if nSeconds > 0 else 0.0
+    print(f"Reconstructed {len(aPairs)} image pairs in {nSeconds:.2f} s ({nPairsPerSecond:.2f} pairs/s)")
+    for sStage, nStageSeconds in dStageSeconds.items():
+        print(f"    {sStage}: {nStageSeconds:.2f} s")
+
+    return {"pairs": len(aPairs), "seconds": nSeconds, "pairsPerSecond": nPairsPerSecond, "stages": dStageSeconds}
+
+############################################################################
+### Tiled reconstruction of large image pairs ###
+# Estimated working memory per pixel of a strip, in bytes, used to size the strips to the memory budget
+nSGBMBytesPerPixel = 32  # plus 2 bytes per candidate disparity for the SGBM cost buffers
+nSADBytesPerPixel = 32
+nSGBMStripOverlap = 32
+
+def openImage(sPath):
+    """ Image as a (H, W, 3) BGR uint8 array. .npy files are memory mapped, so only the rows in use are read;
+    other formats are decoded in full by OpenCV, which can't decode a region of an image. """
+    if sPath.lower().endswith(".npy"):
+        return np.load(sPath, mmap_mode='r')
+    oImg = cv2.imread(sPath)
+    if oImg is None:
+        raise InputError(f"Image couldn't be read: {sPath}")
+    return oImg
+
+def reconstructTiled(sStereoParams, sLeftPath, sRightPath, sQFilePath='', sOutputPath="reconstructed.ply", sAlgorithm="sgbm", dMatcherParams=None, nMemoryBudget=512 << 20, fnProgress=None):
+    """ Point cloud of an image pair too big to be processed at once. The images are matched in horizontal strips sized to
+    nMemoryBudget bytes of working memory, overlapping so the block matching near the strip edges sees the same rows as in
+    a full frame run (exact for SAD, SGBM paths are cut after nSGBMStripOverlap rows). The disparity is kept in a memory
+    mapped file next to the output, then reprojected and streamed to the PLY file strip by strip.
+    The images have to be rectified already; use .npy images for a flat memory use whatever the image size.
+    dMatcherParams are keyword arguments of computeDisparitySGBM (sAlgorithm "sgbm") or computeDisparitySADParallel and sChannels ("sad").
+    Returns the number of points written. """
+    if sAlgorithm not in ("sgbm", "sad"):
+        raise ValueError(f"Unknown stereo matching algorithm: {sAlgorithm}")
+    dMatcherParams = dict(dMatcherParams or {})
+
+    reportProgress(fnProgress, 0, 0, "Loading images")
+    Q = loadQ(sQFilePath if sQFilePath else sStereoParams)
+    aLeftImg = openImage(sLeftPath)
+    aRightImg = openImage(sRightPath)
+    if aLeftImg.shape != aRightImg.shape:
+        print("Images don't have the same size")
+        raise InputError("Images don't have the same size.")
+    nHeight, nWidth = aLeftImg.shape[:2]
+
+    if sAlgorithm == "sgbm":
+        nOverlap = nSGBMStripOverlap
+        nBytesPerPixel = nSGBMBytesPerPixel + 2 * dMatcherParams.get("nNumDisparities", 80)
+        dMatcherParams["bNormalize"] = False
+    else:
+        # A block only reaches nBlockSize rows down, the strips are exact with that much overlap
+        nOverlap = dMatcherParams.get("nBlockSize", 5)
+        sChannels = dMatcherParams.pop("sChannels", "gray")
+        dMatcherParams.setdefault("bSubpixel", True)
+        nBytesPerPixel = nSADBytesPerPixel * (3 if sChannels == "color" else 1)
+
+    nStripRows = nMemoryBudget // (nWidth * nBytesPerPixel) - 2 * nOverlap
+    if nStripRows < 1:
+        raise InputError("The memory budget is too small for a single strip of the images.")
+    aStripStarts = list(range(0, nHeight, nStripRows))
+
+    sDisparityPath = sOutputPath + ".disparity.npy"
+    oDisparityType = np.float32 if sAlgorithm == "sad" and dMatcherParams["bSubpixel"] else np.int16
+    aDisparity = np.lib.format.open_memmap(sDisparityPath, 'w+', oDisparityType, (nHeight, nWidth))
+    try:
+        # Pass 1: disparity of every strip, computed with its overlap and cropped
+        for nDone, nStartRow in enumerate(aStripStarts, 1):
+            nStopRow = min(nStartRow + nStripRows, nHeight)
+            nPadStart = max(0, nStartRow - nOverlap)
+            nPadStop = min(nHeight, nStopRow + nOverlap)
+            aLeftStrip = np.ascontiguousarray(aLeftImg[nPadStart:nPadStop])
+            aRightStrip = np.ascontiguousarray(aRightImg[nPadStart:nPadStop])
+
+            if sAlgorithm == "sgbm":
+                aStrip = computeDisparitySGBM(cv2.cvtColor(aLeftStrip, cv2.COLOR_BGR2GRAY), cv2.cvtColor(aRightStrip, cv2.COLOR_BGR2GRAY), **dMatcherParams)
+            else:
+                aStrip = computeDisparitySADParallel(selectSADChannels(aLeftStrip, sChannels), selectSADChannels(aRightStrip, sChannels), **dMatcherParams)
+            aDisparity[nStartRow:nStopRow] = aStrip[nStartRow - nPadStart:nStopRow - nPadStart]
+            del aLeftStrip, aRightStrip, aStrip
+            reportProgress(fnProgress, nDone, len(aStripStarts), "Computing depth map")
+        aDisparity.flush()
+
+        # Same scaling as the full frame depth maps: SGBM normalized to 0..255 over the whole image, SAD as it is
+        nMin = min(int(aDisparity[nStart:nStart + nStripRows].min()) for nStart in aStripStarts)
+        nMax = max(int(aDisparity[nStart:nStart + nStripRows].max()) for nStart in aStripStarts)
+        def getStrip(nStartRow):
+            aStrip = aDisparity[nStartRow:nStartRow + nStripRows]
+            if sAlgorithm == "sad":
+                return aStrip
+            nScale = 255.0 / (nMax - nMin) if nMax > nMin else 0.0
+            return np.rint(aStrip * nScale - nMin * nScale).astype(np.int16)
+        # Valid pixels are above the minimum of the whole depth map, 0 once normalized
+        nThreshold = min(getStrip(nStart).min() for nStart in aStripStarts) if sAlgorithm == "sad" else 0
+
+        # Pass 2: count the valid pixels for the PLY header, then reproject and append strip by strip
+        reportProgress(fnProgress, 0, 0, "Writing PLY")
+        nPoints = sum(int(np.count_nonzero(getStrip(nStart) > nThreshold)) for nStart in aStripStarts)
+        with open(sOutputPath, 'wb') as oFile:
+            oFile.write(getPLYHeader(nPoints))
+            for nDone, nStartRow in enumerate(aStripStarts, 1):
+                aColors = aLeftImg[nStartRow:nStartRow + nStripRows][..., ::-1]
+                writePLYRecords(oFile, reprojectPointCloud(getStrip(nStartRow), Q, aColors, nStartRow, nThreshold))
+                reportProgress(fnProgress, nDone, len(aStripStarts), "Writing PLY")
+    finally:
+        del aDisparity
+        os.remove(sDisparityPath)
+
+    print(f"Wrote {nPoints} points in {len(aStripStarts)} strips of {nStripRows} rows")
+    return nPoints
+
+############################################################################
+### Stereo video sequences ###
+# Most of the scene carries over from one frame to the next, so each frame is matched around the disparity of the previous one
+nTemporalRadius = 3  # SAD candidates searched on each side of the previous disparity
+nTemporalMaxDiff = 12  # mean absolute difference per pixel and channel by which a SAD match can be worse (than another shift, than the previous frame) before it is unsure
+nTemporalFallback = 0.05  # fraction of unsure pixels above which a SAD tile or an SGBM band is searched over the full range
+nTemporalBands = 4  # horizontal bands of an SGBM frame, each with the disparity range of its rows in the previous frame
+
+def readStereoFrames(sLeftSource, sRightSource):
+    """ Frame pairs of a synchronized stereo video: two video files, or two folders of frame images paired by sorted
+    file name. Yields (nFrame, oLeftImg, oRightImg) with BGR images, up to the end of the shorter video. """
+    if os.path.isdir(sLeftSource) and os.path.isdir(sRightSource):
+        for nFrame, (sLeftPath, sRightPath) in enumerate(pairImageFolders(sLeftSource, sRightSource)):
+            oLeftImg = cv2.imread(sLeftPath)
+            oRightImg = cv2.imread(sRightPath)
+            if oLeftImg is None or oRightImg is None:
+                raise InputError(f"Images couldn't be read: {sLeftPath}, {sRightPath}")
+            yield nFrame, oLeftImg, oRightImg
+        return
+
+    oLeftVideo = cv2.VideoCapture(sLeftSource)
+    oRightVideo = cv2.VideoCapture(sRightSource)
+    try:
+        if not (oLeftVideo.isOpened() and oRightVideo.isOpened()):
+            raise InputError(f"Videos couldn't be opened: {sLeftSource}, {sRightSource}")
+        nFrame = 0
+        while True:
+            bLeft, oLeftImg = oLeftVideo.read()
+            bRight, oRightImg = oRightVideo.read()
+            if not (bLeft and bRight):
+                break
+            yield nFrame, oLeftImg, oRightImg
+            nFrame += 1
+    finally:
+        oLeftVideo.release()
+        oRightVideo.release()
+
+def computeDisparitySADTemporal(aLeftImg, aRightImg, aPrevious=None, aPreviousCost=None, nBlockSize=5, nSearchBlockSize=56, nRadius=nTemporalRadius):
+    """ SAD matching of a video frame warm started from the signed disparity aPrevious and the matching costs aPreviousCost
+    of the previous frame: each pixel only searches nRadius candidates around its previous disparity (refineDisparitySAD).
+    A match is unsure where its cost grew by more than nTemporalMaxDiff per pixel and channel since the previous frame
+    (moving objects, scene cuts); tiles with more than nTemporalFallback unsure pixels are searched over the full range,
+    as is the whole frame without aPrevious. Returns [aDisparity, aBestCost, nFullTiles], the signed shift as int16 and
+    the costs to pass on to the next frame. """
+    nHeight, nWidth = aLeftImg.shape[:2]
+    nChannels = aLeftImg.shape[2] if aLeftImg.ndim == 3 else 1
+    oCostType = getSADCostType(nChannels, nBlockSize)
+    aTiles = getTilesSAD(nHeight, nWidth, nBlockSize)
+
+    if aPrevious is None:
+        aBestCost = np.full((nHeight, nWidth), np.iinfo(oCostType).max, oCostType)
+        aDisparity = np.zeros((nHeight, nWidth), np.int16)
+    else:
+        aEstimate = smoothDisparityEstimate(aPrevious, nBlockSize)
+        nMaxDiff = nTemporalMaxDiff * nChannels * nBlockSize**2
+        aDisparity, aBestCost = refineDisparitySAD(aLeftImg, aRightImg, aEstimate, nBlockSize, nSearchBlockSize, nRadius, bReturnCost=True, nMaxDiff=nMaxDiff)
+        aUnsure = aBestCost.astype(np.int32) - aPreviousCost > nMaxDiff
+        aTiles = [(nStartRow, nStopRow, nStartCol, nStopCol) for nStartRow, nStopRow, nStartCol, nStopCol in aTiles
+                  if np.count_nonzero(aUnsure[nStartRow:nStopRow, nStartCol:nStopCol]) > nTemporalFallback * (nStopRow - nStartRow) * (nStopCol - nStartCol)]
+
+    for tTile in aTiles:
+        nStartRow, nStopRow, nStartCol, nStopCol = tTile
+        aBestCost[nStartRow:nStopRow, nStartCol:nStopCol] = np.iinfo(oCostType).max
+        aDisparity[nStartRow:nStopRow, nStartCol:nStopCol] = 0
+        matchTileSAD(aLeftImg, aRightImg, aBestCost, aDisparity, tTile, nBlockSize, -nSearchBlockSize, nSearchBlockSize - 1)
+
+    return [aDisparity, aBestCost, len(aTiles)]
+
+def computeDisparitySGBMTemporal(oBWLeft, oBWRight, aPrevious=None, dMatcherParams=None):
+    """ SGBM matching of a video frame warm started from the raw disparity aPrevious of the previous frame (16 x disparity,
+    see computeDisparitySGBM with bNormalize False). The frame is matched in nTemporalBands horizontal bands overlapping by
+    nSGBMStripOverlap rows, each searching only the disparity range its rows had in the previous frame (fitDisparityRange).
+    A band is matched again over the full range when it loses more than nTemporalFallback of its matched pixels, or when
+    more than nTemporalFallback of them are at the ends of the narrowed range (the scene moved out of it).
+    dMatcherParams are keyword arguments of computeDisparitySGBM. Returns [aDisparity, nFullBands], the raw disparity,
+    unmatched pixels being at (nMinDisparity - 1) * 16 as in a full range run. """
+    dMatcherParams = dict(dMatcherParams or {})
+    dMatcherParams["bNormalize"] = False
+    nMinDisparity = dMatcherParams.pop("nMinDisparity", -1)
+    nNumDisparities = dMatcherParams.pop("nNumDisparities", 80)
+    nUnmatched = (nMinDisparity - 1) * 16
+
+    if aPrevious is None:
+        return [computeDisparitySGBM(oBWLeft, oBWRight, nMinDisparity=nMinDisparity, nNumDisparities=nNumDisparities, **dMatcherParams), nTemporalBands]
+    dMatcherParams.pop("nPyramidLevels", None)
+
+    nHeight = oBWLeft.shape[0]
+    aDisparity = np.empty_like(aPrevious)
+    aRowBounds = np.linspace(0, nHeight, nTemporalBands + 1).astype(int)
+    nFullBands = 0
+    for nStartRow, nStopRow in zip(aRowBounds[:-1], aRowBounds[1:]):
+        nPadStart = max(0, nStartRow - nSGBMStripOverlap)
+        nPadStop = min(nHeight, nStopRow + nSGBMStripOverlap)
+        def matchBand(nBandMin, nBandNum):
+            aBand = computeDisparitySGBM(oBWLeft[nPadStart:nPadStop], oBWRight[nPadStart:nPadStop], nMinDisparity=nBandMin, nNumDisparities=nBandNum, **dMatcherParams)
+            return aBand[nStartRow - nPadStart:nStopRow - nPadStart]
+
+        aPreviousBand = aPrevious[nStartRow:nStopRow]
+        nPreviousMatched = np.count_nonzero(aPreviousBand > nUnmatched)
+        nBandMin, nBandNum = fitDisparityRange(aPreviousBand[aPreviousBand > nUnmatched] / 16, nMinDisparity, nNumDisparities)
+        aBand = matchBand(nBandMin, nBandNum)
+
+        if (nBandMin, nBandNum) != (nMinDisparity, nNumDisparities):
+            aMatched = aBand > (nBandMin - 1) * 16
+            # Disparities within a pixel of a narrowed end, the ends of the full range being real bounds
+            aAtEnds = np.zeros_like(aMatched)
+            if nBandMin > nMinDisparity:
+                aAtEnds |= aBand < (nBandMin + 1) * 16
+            if nBandMin + nBandNum < nMinDisparity + nNumDisparities:
+                aAtEnds |= aBand >= (nBandMin + nBandNum - 2) * 16
+            nMatched = np.count_nonzero(aMatched)
+            if nMatched < (1 - nTemporalFallback) * nPreviousMatched or np.count_nonzero(aAtEnds & aMatched) > nTemporalFallback * nMatched:
+                nBandMin, nBandNum = nMinDisparity, nNumDisparities
+                aBand = matchBand(nBandMin, nBandNum)
+                nFullBands += 1
+            else:
+                aBand[~aMatched] = nUnmatched
+        else:
+            nFullBands += 1
+        aDisparity[nStartRow:nStopRow] = aBand
+
+    return [aDisparity, nFullBands]
+
+def reconstructSequence(sStereoParams, sLeftSource, sRightSource, sOutputFolder=None, sAlgorithm="sad", dMatcherParams=None, sQFilePath='', bRectify=False, fnFrame=None, fnProgress=None, dCloudFilter=None):
+    """ Depth maps of a synchronized stereo video (two video files or two folders of frame images, see readStereoFrames),
+    every frame after the first one being matched from the disparity of the previous one (computeDisparitySADTemporal,
+    computeDisparitySGBMTemporal). With sOutputFolder, the point cloud of each frame is written to
+    <sOutputFolder>/frame_00000.ply, frame_00001.ply..., filtered with the dCloudFilter arguments of filterPointCloud;
+    fnFrame(nFrame, aDisparity) gets each depth map, float32 in whole pixels for SAD (the warm start matches on integer
+    shifts) and normalized to 0..255 for SGBM as for an image pair.
+    dMatcherParams are keyword arguments of computeDisparitySGBM (sAlgorithm "sgbm") or nBlockSize, nSearchBlockSize and
+    sChannels ("sad", matched in this process, the warm start replacing the workers and the pyramid).
+    Returns {"frames", "seconds", "framesPerSecond", "fullSearches"}, fullSearches being the fraction of the SAD tiles
+    or SGBM bands searched over the full range after the first frame. """
+    if sAlgorithm not in ("sgbm", "sad"):
+        raise ValueError(f"Unknown stereo matching algorithm: {sAlgorithm}")
+    dMatcherParams = dict(dMatcherParams or {})
+    if sAlgorithm == "sad":
+        nBlockSize = dMatcherParams.get("nBlockSize", 5)
+        nSearchBlockSize = dMatcherParams.get("nSearchBlockSize", 56)
+        sChannels = dMatcherParams.get("sChannels", "gray")
+
+    if (sOutputFolder):
+        os.makedirs(sOutputFolder, exist_ok=True)
+        Q = loadQ(sQFilePath if sQFilePath else sStereoParams)
+    if (bRectify):
+        oRectifier = getStereoRectifier(sStereoParams)
+
+    aPrevious = aPreviousCost = None
+    nFrames = nFullSearches = nSearches = 0
+    nStart = time.perf_counter()
+    for nFrame, oLeftImg, oRightImg in readStereoFrames(sLeftSource, sRightSource):
+        if oLeftImg.shape != oRightImg.shape:
+            raise InputError(f"Frames don't have the same size: {nFrame}")
+        if aPrevious is not None and aPrevious.shape != oLeftImg.shape[:2]:
+            raise InputError(f"The frame size changed: {nFrame}")
+        if (bRectify):
+            oLeftImg, oRightImg = oRectifier.rectifyLeft(oLeftImg), oRectifier.rectifyRight(oRightImg)
+
+        if sAlgorithm == "sgbm":
+            aRaw, nFull = computeDisparitySGBMTemporal(cv2.cvtColor(oLeftImg, cv2.COLOR_BGR2GRAY), cv2.cvtColor(oRightImg, cv2.COLOR_BGR2GRAY), aPrevious, dMatcherParams)
+            aDisparity = cv2.normalize(src=aRaw, dst=None, beta=0, alpha=255, norm_type=cv2.NORM_MINMAX)
+            nTotal = nTemporalBands
+            aPrevious = aRaw
+        else:
+            aSigned, aPreviousCost, nFull = computeDisparitySADTemporal(selectSADChannels(oLeftImg, sChannels), selectSADChannels(oRightImg, sChannels),
+                                                                         aPrevious, aPreviousCost, nBlockSize, nSearchBlockSize)
+            aDisparity = np.abs(aSigned).astype(np.float32)
+            nTotal = len(getTilesSAD(*aSigned.shape, nBlockSize))
+            aPrevious = aSigned
+        if nFrame > 0:
+            nFullSearches += nFull
+            nSearches += nTotal
+
+        if (sOutputFolder):
+            aCloud = reprojectPointCloud(aDisparity, Q, oLeftImg[..., ::-1])
+            if (dCloudFilter):
+                aCloud = filterPointCloud(aCloud, Q, **dCloudFilter)
+            writePLY(os.path.join(sOutputFolder, "frame_%05d.ply" % nFrame), aCloud, bOpenViewer=False)
+        if fnFrame is not None:
+            fnFrame(nFrame, aDisparity)
+        nFrames += 1
+        reportProgress(fnProgress, nFrames, 0, "Computing depth map")
+    nSeconds = time.perf_counter() - nStart
+
+    nFramesPerSecond = nFrames / nSeconds if nSeconds > 0 else 0.0
+    nFullRatio = nFullSearches / nSearches if nSearches else 0.0
+    print(f"Reconstructed {nFrames} frames in {nSeconds:.2f} s ({nFramesPerSecond:.2f} frames/s, {100 * nFullRatio:.1f}% searched over the full range)")
+    return {"frames": nFrames, "seconds": nSeconds, "framesPerSecond": nFramesPerSecond, "fullSearches": nFullRatio}
@@ -0,0 +1,45 @@
+""" BackgroundJob: results of a job cancelled during its last stage are dropped """
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+import main
+from rekon import JobCancelled
+
+oApp = QApplication.instance() or QApplication(sys.argv)
+
+
+def runJob(oJob):
+    """ Run oJob on this thread, so its signals are delivered before run() returns. Returns the emitted results and errors. """
+    aResults = []
+    aErrors = []
+    oJob.succeeded.connect(aResults.append)
+    oJob.failed.connect(aErrors.append)
+    oJob.run()
+    return [aResults, aErrors]
+
+
+def testSucceeded():
+    def fnJob(fnProgress):
+        fnProgress(1, 1, "Writing PLY")
+        return "result"
+    aResults, aErrors = runJob(main.BackgroundJob(fnJob))
+    assert aResults == ["result"]
+    assert aErrors == []
+
+
+def testCancelledAfterLastProgress():
+    oJob = main.BackgroundJob(None)
+
+    def fnJob(fnProgress):
+        fnProgress(1, 1, "Writing PLY")
+        oJob.cancel()  # The user clicks Cancel while the last stage runs, no progress is reported after it
+        return "result"
+    oJob.fnJob = fnJob
+    aResults, aErrors = runJob(oJob)
+    assert aResults == []
+    assert len(aErrors) == 1 and isinstance(aErrors[0], JobCancelled)
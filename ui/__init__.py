@@ -0,0 +1,28 @@
+""" Python modules generated from the Qt Designer screens ("Rekon - Welcome.ui" -> ui/welcome.py) by compileui.py.
+main.py builds the screens from them, which is faster than parsing the .ui files, and falls back to the .ui file
+while its module is missing or was generated from another version of it. """
+import hashlib
+import importlib
+import os
+
+def getUIModuleName(sUIPath):
+    """ Name of the generated module of a .ui file: "Rekon - Camera Calibration.ui" -> "camera_calibration" """
+    sName = os.path.splitext(os.path.basename(sUIPath))[0]
+    if sName.startswith("Rekon - "):
+        sName = sName[len("Rekon - "):]
+    return sName.lower().replace(" ", "_")
+
+def getUIHash(sUIPath):
+    """ Hash of the content of a .ui file, stored in its generated module to detect when it's out of date """
+    with open(sUIPath, "rb") as oFile:
+        return hashlib.md5(oFile.read()).hexdigest()
+
+def loadUIModule(sUIPath):
+    """ Generated module of a .ui file, None if it's missing or was generated from another version of the file """
+    try:
+        oModule = importlib.import_module(__name__ + "." + getUIModuleName(sUIPath))
+    except ImportError:
+        return None
+    if getattr(oModule, "sUIHash", None) != getUIHash(sUIPath):
+        return None
+    return oModule
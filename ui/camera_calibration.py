@@ -0,0 +1,234 @@
+# Generated from 'Rekon - Camera Calibration.ui' by compileui.py, edit the .ui file and run it again
+sUIHash = "c23ec75d30aede818fc07020d9f1f940"
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Rekon - Camera Calibration.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 791)
+        Dialog.setMinimumSize(QtCore.QSize(1000, 500))
+        Dialog.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen = QtWidgets.QWidget(Dialog)
+        self.widgetMainScreen.setGeometry(QtCore.QRect(0, 0, 1000, 800))
+        self.widgetMainScreen.setMinimumSize(QtCore.QSize(800, 800))
+        self.widgetMainScreen.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen.setBaseSize(QtCore.QSize(500, 500))
+        self.widgetMainScreen.setStyleSheet("#widgetMainScreen{\n"
+"background-image: url(\"C:/Users/marah/Desktop/Licenta-GUI/bg.jpg\");\n"
+"background-repeat: no-repeat; \n"
+"background-position: center; \n"
+"}")
+        self.widgetMainScreen.setObjectName("widgetMainScreen")
+        self.gridLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(0, 590, 1001, 151))
+        self.gridLayoutWidget.setObjectName("gridLayoutWidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.gridLayoutWidget)
+        self.gridLayout_2.setContentsMargins(150, 0, 150, 0)
+        self.gridLayout_2.setVerticalSpacing(0)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.oProcessBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oProcessBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oProcessBtn.setFont(font)
+        self.oProcessBtn.setStyleSheet("#oProcessBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgb(214, 211, 192);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oProcessBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oProcessBtn.setObjectName("oProcessBtn")
+        self.gridLayout_2.addWidget(self.oProcessBtn, 1, 0, 1, 1)
+        self.oBackBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oBackBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oBackBtn.setFont(font)
+        self.oBackBtn.setStyleSheet("#oBackBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oBackBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oBackBtn.setObjectName("oBackBtn")
+        self.gridLayout_2.addWidget(self.oBackBtn, 2, 0, 1, 1)
+        self.gridLayoutWidget_2 = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget_2.setGeometry(QtCore.QRect(30, 210, 951, 80))
+        self.gridLayoutWidget_2.setObjectName("gridLayoutWidget_2")
+        self.gridLayout = QtWidgets.QGridLayout(self.gridLayoutWidget_2)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.oLeftCamBtn = QtWidgets.QPushButton(self.gridLayoutWidget_2)
+        self.oLeftCamBtn.setMinimumSize(QtCore.QSize(250, 0))
+        self.oLeftCamBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oLeftCamBtn.setFont(font)
+        self.oLeftCamBtn.setStyleSheet("#oLeftCamBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oLeftCamBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oLeftCamBtn.setObjectName("oLeftCamBtn")
+        self.gridLayout.addWidget(self.oLeftCamBtn, 0, 0, 1, 1)
+        self.oRightCamBtn = QtWidgets.QPushButton(self.gridLayoutWidget_2)
+        self.oRightCamBtn.setMinimumSize(QtCore.QSize(250, 0))
+        self.oRightCamBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oRightCamBtn.setFont(font)
+        self.oRightCamBtn.setStyleSheet("#oRightCamBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oRightCamBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}")
+        self.oRightCamBtn.setObjectName("oRightCamBtn")
+        self.gridLayout.addWidget(self.oRightCamBtn, 0, 1, 1, 1)
+        self.label = QtWidgets.QLabel(self.widgetMainScreen)
+        self.label.setGeometry(QtCore.QRect(170, 150, 651, 71))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(26)
+        self.label.setFont(font)
+        self.label.setAutoFillBackground(False)
+        self.label.setAlignment(QtCore.Qt.AlignCenter)
+        self.label.setObjectName("label")
+        self.sLeftLabel = QtWidgets.QLabel(self.widgetMainScreen)
+        self.sLeftLabel.setGeometry(QtCore.QRect(30, 280, 471, 20))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(11)
+        font.setItalic(True)
+        self.sLeftLabel.setFont(font)
+        self.sLeftLabel.setStyleSheet("color: rgb(184, 181, 165)")
+        self.sLeftLabel.setText("")
+        self.sLeftLabel.setObjectName("sLeftLabel")
+        self.sRightLabel = QtWidgets.QLabel(self.widgetMainScreen)
+        self.sRightLabel.setGeometry(QtCore.QRect(510, 280, 471, 20))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(11)
+        font.setItalic(True)
+        self.sRightLabel.setFont(font)
+        self.sRightLabel.setStyleSheet("color: rgb(184, 181, 165)")
+        self.sRightLabel.setText("")
+        self.sRightLabel.setObjectName("sRightLabel")
+        self.gridLayoutWidget_3 = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget_3.setGeometry(QtCore.QRect(230, 350, 530, 85))
+        self.gridLayoutWidget_3.setObjectName("gridLayoutWidget_3")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.gridLayoutWidget_3)
+        self.gridLayout_3.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.oChessboardHBox = QtWidgets.QSpinBox(self.gridLayoutWidget_3)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oChessboardHBox.setFont(font)
+        self.oChessboardHBox.setAutoFillBackground(False)
+        self.oChessboardHBox.setFrame(False)
+        self.oChessboardHBox.setProperty("value", 6)
+        self.oChessboardHBox.setObjectName("oChessboardHBox")
+        self.gridLayout_3.addWidget(self.oChessboardHBox, 1, 2, 1, 1)
+        self.oChessboardWBox = QtWidgets.QSpinBox(self.gridLayoutWidget_3)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(15)
+        self.oChessboardWBox.setFont(font)
+        self.oChessboardWBox.setFrame(False)
+        self.oChessboardWBox.setKeyboardTracking(True)
+        self.oChessboardWBox.setProperty("value", 9)
+        self.oChessboardWBox.setObjectName("oChessboardWBox")
+        self.gridLayout_3.addWidget(self.oChessboardWBox, 1, 1, 1, 1)
+        self.oSquareSizeBox = QtWidgets.QDoubleSpinBox(self.gridLayoutWidget_3)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oSquareSizeBox.setFont(font)
+        self.oSquareSizeBox.setFrame(False)
+        self.oSquareSizeBox.setDecimals(3)
+        self.oSquareSizeBox.setMinimum(0.02)
+        self.oSquareSizeBox.setSingleStep(0.1)
+        self.oSquareSizeBox.setProperty("value", 0.025)
+        self.oSquareSizeBox.setObjectName("oSquareSizeBox")
+        self.gridLayout_3.addWidget(self.oSquareSizeBox, 1, 0, 1, 1)
+        self.label_2 = QtWidgets.QLabel(self.gridLayoutWidget_3)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_2.setFont(font)
+        self.label_2.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_2.setObjectName("label_2")
+        self.gridLayout_3.addWidget(self.label_2, 0, 0, 1, 1)
+        self.label_3 = QtWidgets.QLabel(self.gridLayoutWidget_3)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_3.setFont(font)
+        self.label_3.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout_3.addWidget(self.label_3, 0, 1, 1, 1)
+        self.label_4 = QtWidgets.QLabel(self.gridLayoutWidget_3)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_4.setFont(font)
+        self.label_4.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_4.setObjectName("label_4")
+        self.gridLayout_3.addWidget(self.label_4, 0, 2, 1, 1)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.oProcessBtn.setText(_translate("Dialog", "Process Images"))
+        self.oBackBtn.setText(_translate("Dialog", "Back "))
+        self.oLeftCamBtn.setText(_translate("Dialog", "Left camera"))
+        self.oRightCamBtn.setText(_translate("Dialog", "Right camera"))
+        self.label.setText(_translate("Dialog", "Choose image folders for..."))
+        self.label_2.setText(_translate("Dialog", "Square size"))
+        self.label_3.setText(_translate("Dialog", "Chessboard width"))
+        self.label_4.setText(_translate("Dialog", "Chessboard height"))
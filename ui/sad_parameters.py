@@ -0,0 +1,265 @@
+# Generated from 'Rekon - SAD Parameters.ui' by compileui.py, edit the .ui file and run it again
+sUIHash = "510c277d05202dae566001b72e5e3aca"
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Rekon - SAD Parameters.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 782)
+        Dialog.setMinimumSize(QtCore.QSize(1000, 500))
+        Dialog.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen = QtWidgets.QWidget(Dialog)
+        self.widgetMainScreen.setGeometry(QtCore.QRect(0, 0, 1000, 800))
+        self.widgetMainScreen.setMinimumSize(QtCore.QSize(800, 800))
+        self.widgetMainScreen.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen.setBaseSize(QtCore.QSize(500, 500))
+        self.widgetMainScreen.setStyleSheet("#widgetMainScreen{\n"
+"background-image: url(\"C:/Users/marah/Desktop/Licenta-GUI/bg.jpg\");\n"
+"background-repeat: no-repeat; \n"
+"background-position: center; \n"
+"}")
+        self.widgetMainScreen.setObjectName("widgetMainScreen")
+        self.gridLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(0, 590, 1001, 151))
+        self.gridLayoutWidget.setObjectName("gridLayoutWidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.gridLayoutWidget)
+        self.gridLayout_2.setContentsMargins(150, 0, 150, 0)
+        self.gridLayout_2.setVerticalSpacing(0)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.oGenerateBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oGenerateBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oGenerateBtn.setFont(font)
+        self.oGenerateBtn.setStyleSheet("#oGenerateBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgb(214, 211, 192);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oGenerateBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oGenerateBtn.setObjectName("oGenerateBtn")
+        self.gridLayout_2.addWidget(self.oGenerateBtn, 1, 0, 1, 1)
+        self.oBackBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oBackBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oBackBtn.setFont(font)
+        self.oBackBtn.setStyleSheet("#oBackBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oBackBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oBackBtn.setObjectName("oBackBtn")
+        self.gridLayout_2.addWidget(self.oBackBtn, 2, 0, 1, 1)
+        self.gridLayoutWidget_2 = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget_2.setGeometry(QtCore.QRect(180, 440, 641, 81))
+        self.gridLayoutWidget_2.setObjectName("gridLayoutWidget_2")
+        self.gridLayout = QtWidgets.QGridLayout(self.gridLayoutWidget_2)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.oBlockSize = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oBlockSize.setFont(font)
+        self.oBlockSize.setAutoFillBackground(False)
+        self.oBlockSize.setFrame(False)
+        self.oBlockSize.setMinimum(0)
+        self.oBlockSize.setMaximum(999)
+        self.oBlockSize.setProperty("value", 5)
+        self.oBlockSize.setObjectName("oBlockSize")
+        self.gridLayout.addWidget(self.oBlockSize, 1, 0, 1, 1)
+        self.oSearchBlockSize = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oSearchBlockSize.setFont(font)
+        self.oSearchBlockSize.setAutoFillBackground(False)
+        self.oSearchBlockSize.setFrame(False)
+        self.oSearchBlockSize.setMaximum(999)
+        self.oSearchBlockSize.setProperty("value", 56)
+        self.oSearchBlockSize.setObjectName("oSearchBlockSize")
+        self.gridLayout.addWidget(self.oSearchBlockSize, 1, 1, 1, 1)
+        self.label_10 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_10.setFont(font)
+        self.label_10.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_10.setObjectName("label_10")
+        self.gridLayout.addWidget(self.label_10, 0, 1, 1, 1)
+        self.label_9 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_9.setFont(font)
+        self.label_9.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_9.setObjectName("label_9")
+        self.gridLayout.addWidget(self.label_9, 0, 0, 1, 1)
+        self.label_11 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_11.setFont(font)
+        self.label_11.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_11.setObjectName("label_11")
+        self.gridLayout.addWidget(self.label_11, 0, 2, 1, 1)
+        self.oWorkersBox = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oWorkersBox.setFont(font)
+        self.oWorkersBox.setAutoFillBackground(False)
+        self.oWorkersBox.setFrame(False)
+        self.oWorkersBox.setMinimum(1)
+        self.oWorkersBox.setMaximum(64)
+        self.oWorkersBox.setProperty("value", 1)
+        self.oWorkersBox.setObjectName("oWorkersBox")
+        self.gridLayout.addWidget(self.oWorkersBox, 1, 2, 1, 1)
+        self.label_12 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_12.setFont(font)
+        self.label_12.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_12.setObjectName("label_12")
+        self.gridLayout.addWidget(self.label_12, 0, 3, 1, 1)
+        self.oChannelsBox = QtWidgets.QComboBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oChannelsBox.setFont(font)
+        self.oChannelsBox.setFrame(False)
+        self.oChannelsBox.setObjectName("oChannelsBox")
+        self.oChannelsBox.addItem("")
+        self.oChannelsBox.addItem("")
+        self.oChannelsBox.addItem("")
+        self.oChannelsBox.addItem("")
+        self.oChannelsBox.addItem("")
+        self.gridLayout.addWidget(self.oChannelsBox, 1, 3, 1, 1)
+        self.horizontalLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.horizontalLayoutWidget.setGeometry(QtCore.QRect(0, 0, 1001, 311))
+        self.horizontalLayoutWidget.setObjectName("horizontalLayoutWidget")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.horizontalLayoutWidget)
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.sLeftImage = QtWidgets.QLabel(self.horizontalLayoutWidget)
+        self.sLeftImage.setText("")
+        self.sLeftImage.setObjectName("sLeftImage")
+        self.horizontalLayout.addWidget(self.sLeftImage)
+        self.sRightImage = QtWidgets.QLabel(self.horizontalLayoutWidget)
+        self.sRightImage.setText("")
+        self.sRightImage.setObjectName("sRightImage")
+        self.horizontalLayout.addWidget(self.sRightImage)
+        self.oRestoreBtn = QtWidgets.QPushButton(self.widgetMainScreen)
+        self.oRestoreBtn.setGeometry(QtCore.QRect(390, 400, 271, 41))
+        self.oRestoreBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        font.setBold(False)
+        font.setItalic(True)
+        font.setWeight(50)
+        self.oRestoreBtn.setFont(font)
+        self.oRestoreBtn.setStyleSheet("#oRestoreBtn {\n"
+"text-align:right;\n"
+"border-radius:20px;\n"
+"padding-right:2px\n"
+"}\n"
+"#oRestoreBtn:hover{\n"
+"    border: 2px solid rgb(251, 240, 234);\n"
+"    text-align:right;\n"
+"    padding-right:2px\n"
+"}\n"
+"")
+        self.oRestoreBtn.setIconSize(QtCore.QSize(20, 20))
+        self.oRestoreBtn.setObjectName("oRestoreBtn")
+        self.oRightImgBtn = QtWidgets.QPushButton(self.widgetMainScreen)
+        self.oRightImgBtn.setGeometry(QtCore.QRect(640, 315, 231, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(10)
+        self.oRightImgBtn.setFont(font)
+        self.oRightImgBtn.setStyleSheet("#oRightImgBtn {\n"
+"border-radius:10px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oRightImgBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}")
+        self.oRightImgBtn.setObjectName("oRightImgBtn")
+        self.oLeftImgBtn = QtWidgets.QPushButton(self.widgetMainScreen)
+        self.oLeftImgBtn.setGeometry(QtCore.QRect(150, 315, 201, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(10)
+        self.oLeftImgBtn.setFont(font)
+        self.oLeftImgBtn.setStyleSheet("#oLeftImgBtn {\n"
+"border-radius:10px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oLeftImgBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}")
+        self.oLeftImgBtn.setObjectName("oLeftImgBtn")
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.oGenerateBtn.setText(_translate("Dialog", "Generate PLY"))
+        self.oBackBtn.setText(_translate("Dialog", "Back "))
+        self.label_10.setToolTip(_translate("Dialog", "Maximum disparity minus minimum disparity. The value is always greater than zero. In the current implementation, this parameter must be divisible by 16."))
+        self.label_10.setText(_translate("Dialog", "searchBlockSize"))
+        self.label_9.setToolTip(_translate("Dialog", "Minimum possible disparity value. Normally, it is zero but sometimes rectification algorithms can shift images, so this parameter n/eeds to be adjusted accordingly."))
+        self.label_9.setText(_translate("Dialog", "blockSize"))
+        self.label_11.setToolTip(_translate("Dialog", "Number of processes computing the depth map in parallel, each on a horizontal band of the image. The result doesn\'t depend on this value."))
+        self.label_11.setText(_translate("Dialog", "workers"))
+        self.label_12.setToolTip(_translate("Dialog", "Image channels the blocks are compared on. Grayscale or a single channel is several times faster than color."))
+        self.label_12.setText(_translate("Dialog", "channels"))
+        self.oChannelsBox.setItemText(0, _translate("Dialog", "gray"))
+        self.oChannelsBox.setItemText(1, _translate("Dialog", "blue"))
+        self.oChannelsBox.setItemText(2, _translate("Dialog", "green"))
+        self.oChannelsBox.setItemText(3, _translate("Dialog", "red"))
+        self.oChannelsBox.setItemText(4, _translate("Dialog", "color"))
+        self.oRestoreBtn.setText(_translate("Dialog", "Restore default values"))
+        self.oRightImgBtn.setText(_translate("Dialog", "Upload right image"))
+        self.oLeftImgBtn.setText(_translate("Dialog", "Upload left image"))
@@ -0,0 +1,359 @@
+# Generated from 'Rekon - SGBM Parameters.ui' by compileui.py, edit the .ui file and run it again
+sUIHash = "99ceca3c411625633f189824ae806574"
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Rekon - SGBM Parameters.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 782)
+        Dialog.setMinimumSize(QtCore.QSize(1000, 500))
+        Dialog.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen = QtWidgets.QWidget(Dialog)
+        self.widgetMainScreen.setGeometry(QtCore.QRect(0, 0, 1000, 800))
+        self.widgetMainScreen.setMinimumSize(QtCore.QSize(800, 800))
+        self.widgetMainScreen.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen.setBaseSize(QtCore.QSize(500, 500))
+        self.widgetMainScreen.setStyleSheet("#widgetMainScreen{\n"
+"background-image: url(\"C:/Users/marah/Desktop/Licenta-GUI/bg.jpg\");\n"
+"background-repeat: no-repeat; \n"
+"background-position: center; \n"
+"}")
+        self.widgetMainScreen.setObjectName("widgetMainScreen")
+        self.gridLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(0, 590, 1001, 151))
+        self.gridLayoutWidget.setObjectName("gridLayoutWidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.gridLayoutWidget)
+        self.gridLayout_2.setContentsMargins(150, 0, 150, 0)
+        self.gridLayout_2.setVerticalSpacing(0)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.oGenerateBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oGenerateBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oGenerateBtn.setFont(font)
+        self.oGenerateBtn.setStyleSheet("#oGenerateBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgb(214, 211, 192);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oGenerateBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oGenerateBtn.setObjectName("oGenerateBtn")
+        self.gridLayout_2.addWidget(self.oGenerateBtn, 1, 0, 1, 1)
+        self.oBackBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oBackBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oBackBtn.setFont(font)
+        self.oBackBtn.setStyleSheet("#oBackBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oBackBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oBackBtn.setObjectName("oBackBtn")
+        self.gridLayout_2.addWidget(self.oBackBtn, 2, 0, 1, 1)
+        self.gridLayoutWidget_2 = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget_2.setGeometry(QtCore.QRect(80, 446, 831, 151))
+        self.gridLayoutWidget_2.setObjectName("gridLayoutWidget_2")
+        self.gridLayout = QtWidgets.QGridLayout(self.gridLayoutWidget_2)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setObjectName("gridLayout")
+        self.label_10 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_10.setFont(font)
+        self.label_10.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_10.setObjectName("label_10")
+        self.gridLayout.addWidget(self.label_10, 0, 1, 1, 1)
+        self.label_2 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_2.setFont(font)
+        self.label_2.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_2.setObjectName("label_2")
+        self.gridLayout.addWidget(self.label_2, 0, 2, 1, 1)
+        self.label_3 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_3.setFont(font)
+        self.label_3.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout.addWidget(self.label_3, 2, 0, 1, 1)
+        self.label_7 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_7.setFont(font)
+        self.label_7.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_7.setObjectName("label_7")
+        self.gridLayout.addWidget(self.label_7, 2, 3, 1, 1)
+        self.oDisp12MaxDiff = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oDisp12MaxDiff.setFont(font)
+        self.oDisp12MaxDiff.setAutoFillBackground(False)
+        self.oDisp12MaxDiff.setFrame(False)
+        self.oDisp12MaxDiff.setMinimum(-999)
+        self.oDisp12MaxDiff.setMaximum(999)
+        self.oDisp12MaxDiff.setProperty("value", 12)
+        self.oDisp12MaxDiff.setObjectName("oDisp12MaxDiff")
+        self.gridLayout.addWidget(self.oDisp12MaxDiff, 4, 1, 1, 1)
+        self.oPreFilterCap = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oPreFilterCap.setFont(font)
+        self.oPreFilterCap.setAutoFillBackground(False)
+        self.oPreFilterCap.setFrame(False)
+        self.oPreFilterCap.setMinimum(-999)
+        self.oPreFilterCap.setMaximum(999)
+        self.oPreFilterCap.setProperty("value", 63)
+        self.oPreFilterCap.setObjectName("oPreFilterCap")
+        self.gridLayout.addWidget(self.oPreFilterCap, 4, 2, 1, 1)
+        self.oBlockSize = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oBlockSize.setFont(font)
+        self.oBlockSize.setAutoFillBackground(False)
+        self.oBlockSize.setFrame(False)
+        self.oBlockSize.setMinimum(1)
+        self.oBlockSize.setProperty("value", 3)
+        self.oBlockSize.setObjectName("oBlockSize")
+        self.gridLayout.addWidget(self.oBlockSize, 1, 2, 1, 1)
+        self.label_9 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_9.setFont(font)
+        self.label_9.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_9.setObjectName("label_9")
+        self.gridLayout.addWidget(self.label_9, 0, 0, 1, 1)
+        self.label_4 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_4.setFont(font)
+        self.label_4.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_4.setObjectName("label_4")
+        self.gridLayout.addWidget(self.label_4, 2, 1, 1, 1)
+        self.oNumDisparities = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oNumDisparities.setFont(font)
+        self.oNumDisparities.setAutoFillBackground(False)
+        self.oNumDisparities.setFrame(False)
+        self.oNumDisparities.setProperty("value", 80)
+        self.oNumDisparities.setObjectName("oNumDisparities")
+        self.gridLayout.addWidget(self.oNumDisparities, 1, 1, 1, 1)
+        self.oSpeckleWindowSize = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oSpeckleWindowSize.setFont(font)
+        self.oSpeckleWindowSize.setAutoFillBackground(False)
+        self.oSpeckleWindowSize.setFrame(False)
+        self.oSpeckleWindowSize.setMinimum(-999)
+        self.oSpeckleWindowSize.setMaximum(999)
+        self.oSpeckleWindowSize.setProperty("value", 50)
+        self.oSpeckleWindowSize.setObjectName("oSpeckleWindowSize")
+        self.gridLayout.addWidget(self.oSpeckleWindowSize, 1, 3, 1, 1)
+        self.label_8 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_8.setFont(font)
+        self.label_8.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_8.setObjectName("label_8")
+        self.gridLayout.addWidget(self.label_8, 2, 2, 1, 1)
+        self.oSpeckleRange = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setWeight(50)
+        font.setKerning(True)
+        self.oSpeckleRange.setFont(font)
+        self.oSpeckleRange.setFrame(False)
+        self.oSpeckleRange.setKeyboardTracking(True)
+        self.oSpeckleRange.setMinimum(-999)
+        self.oSpeckleRange.setMaximum(999)
+        self.oSpeckleRange.setProperty("value", 2)
+        self.oSpeckleRange.setObjectName("oSpeckleRange")
+        self.gridLayout.addWidget(self.oSpeckleRange, 4, 3, 1, 1)
+        self.oUniqRatio = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oUniqRatio.setFont(font)
+        self.oUniqRatio.setAutoFillBackground(False)
+        self.oUniqRatio.setFrame(False)
+        self.oUniqRatio.setMinimum(-999)
+        self.oUniqRatio.setMaximum(999)
+        self.oUniqRatio.setProperty("value", 10)
+        self.oUniqRatio.setObjectName("oUniqRatio")
+        self.gridLayout.addWidget(self.oUniqRatio, 4, 0, 1, 1)
+        self.oMinDisparity = QtWidgets.QSpinBox(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oMinDisparity.setFont(font)
+        self.oMinDisparity.setAutoFillBackground(False)
+        self.oMinDisparity.setFrame(False)
+        self.oMinDisparity.setMinimum(-999)
+        self.oMinDisparity.setMaximum(999)
+        self.oMinDisparity.setProperty("value", -1)
+        self.oMinDisparity.setObjectName("oMinDisparity")
+        self.gridLayout.addWidget(self.oMinDisparity, 1, 0, 1, 1)
+        self.label_5 = QtWidgets.QLabel(self.gridLayoutWidget_2)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.label_5.setFont(font)
+        self.label_5.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_5.setObjectName("label_5")
+        self.gridLayout.addWidget(self.label_5, 0, 3, 1, 1)
+        self.horizontalLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.horizontalLayoutWidget.setGeometry(QtCore.QRect(0, 0, 1001, 311))
+        self.horizontalLayoutWidget.setObjectName("horizontalLayoutWidget")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.horizontalLayoutWidget)
+        self.horizontalLayout.setContentsMargins(0, 0, 0, 0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.sLeftImage = QtWidgets.QLabel(self.horizontalLayoutWidget)
+        self.sLeftImage.setText("")
+        self.sLeftImage.setObjectName("sLeftImage")
+        self.horizontalLayout.addWidget(self.sLeftImage)
+        self.oPreviewImage = QtWidgets.QLabel(self.horizontalLayoutWidget)
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(10)
+        self.oPreviewImage.setFont(font)
+        self.oPreviewImage.setText("")
+        self.oPreviewImage.setAlignment(QtCore.Qt.AlignCenter)
+        self.oPreviewImage.setWordWrap(True)
+        self.oPreviewImage.setObjectName("oPreviewImage")
+        self.horizontalLayout.addWidget(self.oPreviewImage)
+        self.sRightImage = QtWidgets.QLabel(self.horizontalLayoutWidget)
+        self.sRightImage.setText("")
+        self.sRightImage.setObjectName("sRightImage")
+        self.horizontalLayout.addWidget(self.sRightImage)
+        self.oRestoreBtn = QtWidgets.QPushButton(self.widgetMainScreen)
+        self.oRestoreBtn.setGeometry(QtCore.QRect(390, 400, 271, 41))
+        self.oRestoreBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        font.setBold(False)
+        font.setItalic(True)
+        font.setWeight(50)
+        self.oRestoreBtn.setFont(font)
+        self.oRestoreBtn.setStyleSheet("#oRestoreBtn {\n"
+"text-align:right;\n"
+"border-radius:20px;\n"
+"padding-right:2px\n"
+"}\n"
+"#oRestoreBtn:hover{\n"
+"    border: 2px solid rgb(251, 240, 234);\n"
+"    text-align:right;\n"
+"    padding-right:2px\n"
+"}\n"
+"")
+        self.oRestoreBtn.setIconSize(QtCore.QSize(20, 20))
+        self.oRestoreBtn.setObjectName("oRestoreBtn")
+        self.oRightImgBtn = QtWidgets.QPushButton(self.widgetMainScreen)
+        self.oRightImgBtn.setGeometry(QtCore.QRect(640, 315, 231, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(10)
+        self.oRightImgBtn.setFont(font)
+        self.oRightImgBtn.setStyleSheet("#oRightImgBtn {\n"
+"border-radius:10px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oRightImgBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}")
+        self.oRightImgBtn.setObjectName("oRightImgBtn")
+        self.oLeftImgBtn = QtWidgets.QPushButton(self.widgetMainScreen)
+        self.oLeftImgBtn.setGeometry(QtCore.QRect(150, 315, 201, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(10)
+        self.oLeftImgBtn.setFont(font)
+        self.oLeftImgBtn.setStyleSheet("#oLeftImgBtn {\n"
+"border-radius:10px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oLeftImgBtn:hover{\n"
+"    background-color:rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}")
+        self.oLeftImgBtn.setObjectName("oLeftImgBtn")
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.oGenerateBtn.setText(_translate("Dialog", "Generate PLY"))
+        self.oBackBtn.setText(_translate("Dialog", "Back "))
+        self.label_10.setToolTip(_translate("Dialog", "Maximum disparity minus minimum disparity. The value is always greater than zero. In the current implementation, this parameter must be divisible by 16."))
+        self.label_10.setText(_translate("Dialog", "numDisparities"))
+        self.label_2.setToolTip(_translate("Dialog", "Matched block size. It must be an odd number >=1 . Normally, it should be somewhere in the 3..11 range."))
+        self.label_2.setText(_translate("Dialog", "blockSize"))
+        self.label_3.setToolTip(_translate("Dialog", "Margin in percentage by which the best (minimum) computed cost function value should \"win\" the second best value to consider the found match correct."))
+        self.label_3.setText(_translate("Dialog", "uniquenessRatio"))
+        self.label_7.setToolTip(_translate("Dialog", "Maximum disparity variation within each connected component. If you do speckle filtering, set the parameter to a positive value, it will be implicitly multiplied by 16. "))
+        self.label_7.setText(_translate("Dialog", "speckleRange"))
+        self.label_9.setToolTip(_translate("Dialog", "Minimum possible disparity value. Normally, it is zero but sometimes rectification algorithms can shift images, so this parameter n/eeds to be adjusted accordingly."))
+        self.label_9.setText(_translate("Dialog", "minDisparity"))
+        self.label_4.setToolTip(_translate("Dialog", "Maximum allowed difference (in integer pixel units) in the left-right disparity check. Set it to a non-positive value to disable the check."))
+        self.label_4.setText(_translate("Dialog", "disp12MaxDiff"))
+        self.label_8.setToolTip(_translate("Dialog", "Truncation value for the prefiltered image pixels. The algorithm first computes x-derivative at each pixel and clips its value by [-preFilterCap, preFilterCap] interval"))
+        self.label_8.setText(_translate("Dialog", "preFilterCap"))
+        self.label_5.setToolTip(_translate("Dialog", "Maximum size of smooth disparity regions to consider their noise speckles and invalidate. Set it to 0 to disable speckle filtering. Otherwise, set it somewhere in the 50-200 range."))
+        self.label_5.setText(_translate("Dialog", "speckleWindowSize"))
+        self.oPreviewImage.setToolTip(_translate("Dialog", "Depth map of the downscaled images, updated as the parameters change. Generate computes it at full resolution."))
+        self.oRestoreBtn.setText(_translate("Dialog", "Restore default values"))
+        self.oRightImgBtn.setText(_translate("Dialog", "Upload right image"))
+        self.oLeftImgBtn.setText(_translate("Dialog", "Upload left image"))
@@ -0,0 +1,227 @@
+# Generated from 'Rekon - Stereo Reconstruction.ui' by compileui.py, edit the .ui file and run it again
+sUIHash = "3ba560e81ae0fcf4aee46fd7fb528c09"
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Rekon - Stereo Reconstruction.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 791)
+        Dialog.setMinimumSize(QtCore.QSize(1000, 500))
+        Dialog.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen = QtWidgets.QWidget(Dialog)
+        self.widgetMainScreen.setGeometry(QtCore.QRect(0, 0, 1000, 800))
+        self.widgetMainScreen.setMinimumSize(QtCore.QSize(800, 800))
+        self.widgetMainScreen.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen.setBaseSize(QtCore.QSize(500, 500))
+        self.widgetMainScreen.setStyleSheet("#widgetMainScreen{\n"
+"background-image: url(\"C:/Users/marah/Desktop/Licenta-GUI/bg.jpg\");\n"
+"background-repeat: no-repeat; \n"
+"background-position: center; \n"
+"}")
+        self.widgetMainScreen.setObjectName("widgetMainScreen")
+        self.gridLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(0, 590, 1001, 151))
+        self.gridLayoutWidget.setObjectName("gridLayoutWidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.gridLayoutWidget)
+        self.gridLayout_2.setContentsMargins(150, 0, 150, 0)
+        self.gridLayout_2.setVerticalSpacing(0)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.oNextBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oNextBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oNextBtn.setFont(font)
+        self.oNextBtn.setStyleSheet("#oNextBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgb(214, 211, 192);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oNextBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oNextBtn.setObjectName("oNextBtn")
+        self.gridLayout_2.addWidget(self.oNextBtn, 1, 0, 1, 1)
+        self.oBackBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oBackBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setItalic(False)
+        font.setWeight(50)
+        self.oBackBtn.setFont(font)
+        self.oBackBtn.setStyleSheet("#oBackBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oBackBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oBackBtn.setObjectName("oBackBtn")
+        self.gridLayout_2.addWidget(self.oBackBtn, 2, 0, 1, 1)
+        self.gridLayoutWidget_4 = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget_4.setGeometry(QtCore.QRect(20, 310, 951, 80))
+        self.gridLayoutWidget_4.setObjectName("gridLayoutWidget_4")
+        self.oCalibrFilesLayout = QtWidgets.QGridLayout(self.gridLayoutWidget_4)
+        self.oCalibrFilesLayout.setContentsMargins(0, 0, 0, 0)
+        self.oCalibrFilesLayout.setObjectName("oCalibrFilesLayout")
+        self.oUploadBtn = QtWidgets.QPushButton(self.gridLayoutWidget_4)
+        self.oUploadBtn.setMinimumSize(QtCore.QSize(250, 0))
+        self.oUploadBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oUploadBtn.setFont(font)
+        self.oUploadBtn.setStyleSheet("#oUploadBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oUploadBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oUploadBtn.setObjectName("oUploadBtn")
+        self.oCalibrFilesLayout.addWidget(self.oUploadBtn, 0, 0, 1, 1)
+        self.oCustomCalibrFilesCb = QtWidgets.QCheckBox(self.widgetMainScreen)
+        self.oCustomCalibrFilesCb.setGeometry(QtCore.QRect(270, 260, 671, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.oCustomCalibrFilesCb.setFont(font)
+        self.oCustomCalibrFilesCb.setObjectName("oCustomCalibrFilesCb")
+        self.label_6 = QtWidgets.QLabel(self.widgetMainScreen)
+        self.label_6.setGeometry(QtCore.QRect(290, 280, 621, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(8)
+        font.setItalic(True)
+        self.label_6.setFont(font)
+        self.label_6.setObjectName("label_6")
+        self.sFilePath = QtWidgets.QLabel(self.widgetMainScreen)
+        self.sFilePath.setGeometry(QtCore.QRect(260, 380, 471, 20))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(11)
+        font.setItalic(True)
+        self.sFilePath.setFont(font)
+        self.sFilePath.setStyleSheet("color: rgb(184, 181, 165)")
+        self.sFilePath.setText("")
+        self.sFilePath.setObjectName("sFilePath")
+        self.oOpenDepthMapCb = QtWidgets.QCheckBox(self.widgetMainScreen)
+        self.oOpenDepthMapCb.setGeometry(QtCore.QRect(270, 220, 291, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.oOpenDepthMapCb.setFont(font)
+        self.oOpenDepthMapCb.setObjectName("oOpenDepthMapCb")
+        self.oRectifyCb = QtWidgets.QCheckBox(self.widgetMainScreen)
+        self.oRectifyCb.setGeometry(QtCore.QRect(570, 220, 291, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.oRectifyCb.setFont(font)
+        self.oRectifyCb.setObjectName("oRectifyCb")
+        self.label_7 = QtWidgets.QLabel(self.widgetMainScreen)
+        self.label_7.setGeometry(QtCore.QRect(270, 130, 621, 41))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        font.setItalic(False)
+        self.label_7.setFont(font)
+        self.label_7.setObjectName("label_7")
+        self.oReconstrAlgCb = QtWidgets.QComboBox(self.widgetMainScreen)
+        self.oReconstrAlgCb.setGeometry(QtCore.QRect(270, 170, 401, 31))
+        font = QtGui.QFont()
+        font.setPointSize(14)
+        self.oReconstrAlgCb.setFont(font)
+        self.oReconstrAlgCb.setObjectName("oReconstrAlgCb")
+        self.oReconstrAlgCb.addItem("")
+        self.oReconstrAlgCb.addItem("")
+        self.oCustomQCb = QtWidgets.QCheckBox(self.widgetMainScreen)
+        self.oCustomQCb.setGeometry(QtCore.QRect(270, 420, 661, 31))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(12)
+        self.oCustomQCb.setFont(font)
+        self.oCustomQCb.setObjectName("oCustomQCb")
+        self.gridLayoutWidget_5 = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget_5.setGeometry(QtCore.QRect(20, 460, 951, 80))
+        self.gridLayoutWidget_5.setObjectName("gridLayoutWidget_5")
+        self.oCalibrFilesLayout_2 = QtWidgets.QGridLayout(self.gridLayoutWidget_5)
+        self.oCalibrFilesLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.oCalibrFilesLayout_2.setObjectName("oCalibrFilesLayout_2")
+        self.oCustomQBtn = QtWidgets.QPushButton(self.gridLayoutWidget_5)
+        self.oCustomQBtn.setMinimumSize(QtCore.QSize(250, 0))
+        self.oCustomQBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oCustomQBtn.setFont(font)
+        self.oCustomQBtn.setStyleSheet("#oCustomQBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oUploadBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oCustomQBtn.setObjectName("oCustomQBtn")
+        self.oCalibrFilesLayout_2.addWidget(self.oCustomQBtn, 0, 0, 1, 1)
+        self.sQFilePath = QtWidgets.QLabel(self.widgetMainScreen)
+        self.sQFilePath.setGeometry(QtCore.QRect(260, 530, 471, 20))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(11)
+        font.setItalic(True)
+        self.sQFilePath.setFont(font)
+        self.sQFilePath.setStyleSheet("color: rgb(184, 181, 165)")
+        self.sQFilePath.setText("")
+        self.sQFilePath.setObjectName("sQFilePath")
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.oNextBtn.setText(_translate("Dialog", "Next"))
+        self.oBackBtn.setText(_translate("Dialog", "Back "))
+        self.oUploadBtn.setText(_translate("Dialog", "Upload file (*.yml)"))
+        self.oCustomCalibrFilesCb.setText(_translate("Dialog", "Use custom stereo calibration file "))
+        self.label_6.setText(_translate("Dialog", "(By default, stereoParams.yml used if found) "))
+        self.oOpenDepthMapCb.setText(_translate("Dialog", "Open depth map"))
+        self.oRectifyCb.setToolTip(_translate("Dialog", "Undistort and rectify the image pair with the stereo calibration file before matching."))
+        self.oRectifyCb.setText(_translate("Dialog", "Rectify images"))
+        self.label_7.setText(_translate("Dialog", "Reconstruction algorithm"))
+        self.oReconstrAlgCb.setItemText(0, _translate("Dialog", "Standard SGBM (OpenCV)"))
+        self.oReconstrAlgCb.setItemText(1, _translate("Dialog", "Block matching using SAD"))
+        self.oCustomQCb.setText(_translate("Dialog", "Use custom transformation matrix (Q)"))
+        self.oCustomQBtn.setText(_translate("Dialog", "Upload file (*.yml)"))
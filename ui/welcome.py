@@ -0,0 +1,118 @@
+# Generated from 'Rekon - Welcome.ui' by compileui.py, edit the .ui file and run it again
+sUIHash = "06bacee61a3f40ba3f7c88e6aa38de42"
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'Rekon - Welcome.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(1000, 800)
+        Dialog.setMinimumSize(QtCore.QSize(1000, 500))
+        Dialog.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen = QtWidgets.QWidget(Dialog)
+        self.widgetMainScreen.setGeometry(QtCore.QRect(0, 0, 1000, 800))
+        self.widgetMainScreen.setMinimumSize(QtCore.QSize(800, 800))
+        self.widgetMainScreen.setMaximumSize(QtCore.QSize(1000, 800))
+        self.widgetMainScreen.setBaseSize(QtCore.QSize(500, 500))
+        self.widgetMainScreen.setStyleSheet("#widgetMainScreen{\n"
+"background-image: url(\"C:/Users/marah/Desktop/Licenta-GUI/bg.jpg\");\n"
+"background-repeat: no-repeat; \n"
+"background-position: center; \n"
+"}")
+        self.widgetMainScreen.setObjectName("widgetMainScreen")
+        self.gridLayoutWidget = QtWidgets.QWidget(self.widgetMainScreen)
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(0, 320, 1001, 271))
+        self.gridLayoutWidget.setObjectName("gridLayoutWidget")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.gridLayoutWidget)
+        self.gridLayout_2.setContentsMargins(150, 0, 150, 0)
+        self.gridLayout_2.setVerticalSpacing(0)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.oCameraCalibrBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oCameraCalibrBtn.setMinimumSize(QtCore.QSize(250, 0))
+        self.oCameraCalibrBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oCameraCalibrBtn.setFont(font)
+        self.oCameraCalibrBtn.setStyleSheet("#oCameraCalibrBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oCameraCalibrBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oCameraCalibrBtn.setObjectName("oCameraCalibrBtn")
+        self.gridLayout_2.addWidget(self.oCameraCalibrBtn, 0, 0, 1, 1)
+        self.oStereoReconstrBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oStereoReconstrBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oStereoReconstrBtn.setFont(font)
+        self.oStereoReconstrBtn.setStyleSheet("#oStereoReconstrBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oStereoReconstrBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oStereoReconstrBtn.setObjectName("oStereoReconstrBtn")
+        self.gridLayout_2.addWidget(self.oStereoReconstrBtn, 2, 0, 1, 1)
+        self.oStereoCalibrBtn = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.oStereoCalibrBtn.setMinimumSize(QtCore.QSize(250, 0))
+        self.oStereoCalibrBtn.setMaximumSize(QtCore.QSize(500, 50))
+        font = QtGui.QFont()
+        font.setFamily("Century Gothic")
+        font.setPointSize(16)
+        self.oStereoCalibrBtn.setFont(font)
+        self.oStereoCalibrBtn.setStyleSheet("#oStereoCalibrBtn {\n"
+"border-radius:20px;\n"
+"background-color:rgba(255, 255, 255, 0.5);\n"
+"border: 2px solid rgb(77, 59, 45);\n"
+"}\n"
+"#oStereoCalibrBtn:hover{\n"
+"    background-color: rgba(0, 0, 0, 0.3);\n"
+"    color: rgb(255, 255, 255);\n"
+"    border: 2px solid rgb(0, 0, 0);\n"
+"}\n"
+"")
+        self.oStereoCalibrBtn.setObjectName("oStereoCalibrBtn")
+        self.gridLayout_2.addWidget(self.oStereoCalibrBtn, 1, 0, 1, 1)
+        self.oStereoReconstrBtn.raise_()
+        self.oCameraCalibrBtn.raise_()
+        self.oStereoCalibrBtn.raise_()
+        self.label = QtWidgets.QLabel(self.widgetMainScreen)
+        self.label.setGeometry(QtCore.QRect(180, 140, 621, 151))
+        self.label.setStyleSheet("#label{\n"
+"background-image : url(\'C:/Users/marah/Desktop/Licenta-GUI/logo.png\');\n"
+"}")
+        self.label.setText("")
+        self.label.setObjectName("label")
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.oCameraCalibrBtn.setText(_translate("Dialog", "Single Camera Calibration"))
+        self.oStereoReconstrBtn.setText(_translate("Dialog", "Stereo Reconstruction"))
+        self.oStereoCalibrBtn.setText(_translate("Dialog", "Stereo Camera Calibration"))